@@ -12,15 +12,20 @@ from typing import Dict, Optional, Sequence
 from .messages import Message
 from .memory import Memory
 from .llm import LLM, DummyLLM
+from .llm_engine import ENGINE, NORMAL, LLMEngine
 from .tools import Tool
 
 class Agent:
-    def __init__(self, name: str, system_prompt: str, llm: Optional[LLM] = None, tools: Optional[Sequence[Tool]] = None, memory: Optional[Memory] = None):
+    def __init__(self, name: str, system_prompt: str, llm: Optional[LLM] = None, tools: Optional[Sequence[Tool]] = None, memory: Optional[Memory] = None,
+                 engine: Optional[LLMEngine] = None, priority: int = NORMAL):
         self.name = name
         self.system_prompt = system_prompt
         self.llm = llm or DummyLLM()
         self.tools: Dict[str, Tool] = {t.name: t for t in (tools or [])}
         self.memory = memory or Memory()
+        # Calls go through a shared engine (concurrency limit, coalescing, priorities)
+        self.engine = engine or ENGINE
+        self.priority = priority
 
     def add_tool(self, t: Tool) -> None:
         self.tools[t.name] = t
@@ -31,9 +36,9 @@ class Agent:
         toollist = "\nTools: " + ", ".join(self.tools) if self.tools else ""
         return header + body + toollist + "\nAssistant:"
 
-    async def act(self, messages: Sequence[Message]) -> Message:
+    async def act(self, messages: Sequence[Message], priority: Optional[int] = None) -> Message:
         prompt = self.prompt_from(messages)
-        out = await self.llm.acomplete(prompt)
+        out = await self.engine.complete(self.llm, prompt, priority=self.priority if priority is None else priority)
         msg = Message(role=self.name, content=out)
         self.memory.add(msg)
         return msg
\ No newline at end of file
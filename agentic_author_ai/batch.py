@@ -0,0 +1,272 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+# -------------------------------
+# Batch Authoring
+# -------------------------------
+
+"""
+Many demo prompts in one process (demo.py --batch).
+
+Prompts come from a JSONL file: one object per line with "prompt" and
+optionally "id", "session", "tone", "length", "format", "force_external",
+"no_external", "max_sources", "deadline_s" and "ctx_tokens" (a bare JSON
+string is a prompt). They run on a pool of `concurrency` workers, so the index and
+API clients are loaded once, and at most that many model calls are in
+flight.
+
+Prompts on overlapping topics share their RAG and research results through a
+TopicMemo: a retrieval or search whose weighted term overlap with an earlier
+one (Jaccard, terms weighted by IDF over the batch, so boilerplate shared by
+every prompt doesn't count) reaches `similarity` reuses that result instead of
+running again. Similar prompts that arrive at the same time wait for the first.
+Only calls with the same arguments (k, filters, max_sources, ...) share a result,
+and research cut short by a deadline budget is neither shared nor reused.
+
+Each finished prompt is appended to the output JSONL straight away. Rerunning
+the same batch skips ids that already have a successful record, so a failed or
+interrupted batch resumes where it stopped. Failed prompts are written with an
+"error" key and retried on the next run; readers take the last record per id.
+
+Usage:
+    python -m agentic_author_ai.demo --batch prompts.jsonl --out drafts.jsonl --concurrency 8
+"""
+
+from __future__ import annotations
+import json
+import math
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Iterable, List, Optional, Set, Tuple
+
+from .context_pack import terms
+
+SHARE_SIMILARITY = 0.6   # weighted Jaccard at which two prompts share RAG / research results
+
+PROMPT_KEYS = ("session", "tone", "length", "format", "force_external", "no_external", "max_sources",
+               "deadline_s", "ctx_tokens")
+
+class TopicMemo:
+    """
+    Results keyed by (scope, term set); a lookup reuses the first entry in the same
+    scope whose IDF-weighted Jaccard similarity is >= threshold. Thread-safe, and
+    concurrent lookups of the same topic run `compute` once.
+    """
+
+    def __init__(self, threshold: float = SHARE_SIMILARITY, corpus: Iterable[str] = ()):
+        self.threshold = threshold
+        self._df: Dict[str, int] = {}
+        self._n = 0
+        self._entries: List[Tuple[Hashable, FrozenSet[str], Future]] = []
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        for text in corpus:
+            self._n += 1
+            for t in set(terms(text)):
+                self._df[t] = self._df.get(t, 0) + 1
+
+    def weight(self, term: str) -> float:
+        # Smoothed IDF over the fitted texts: 0 for terms in all of them, 1 without a corpus
+        if not self._n:
+            return 1.0
+        return math.log((1 + self._n) / (1 + self._df.get(term, 0)))
+
+    def similarity(self, a: Set[str], b: Set[str]) -> float:
+        union = sum(self.weight(t) for t in a | b)
+        if union <= 0:
+            return 1.0 if a == b else 0.0
+        return sum(self.weight(t) for t in a & b) / union
+
+    def get(self, scope: Hashable, text: str, compute: Callable[[], Any]) -> Any:
+        key = frozenset(terms(text))
+        with self._lock:
+            shared = next((f for s, k, f in self._entries
+                           if s == scope and self.similarity(k, key) >= self.threshold), None)
+            if shared is not None:
+                self.hits += 1
+            else:
+                fut: Future = Future()
+                fut.set_running_or_notify_cancel()
+                self._entries.append((scope, key, fut))
+                self.misses += 1
+        if shared is not None:
+            return shared.result()
+        try:
+            result = compute()
+        except BaseException as e:
+            with self._lock:   # don't share failures with later prompts
+                self._entries = [x for x in self._entries if x[2] is not fut]
+            fut.set_exception(e)
+            raise
+        fut.set_result(result)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0}
+
+
+@dataclass
+class BatchStats:
+    total: int = 0
+    done: int = 0
+    failed: int = 0
+    skipped: int = 0          # already done in an earlier run (resume)
+    wall_s: float = 0.0
+    drafts_per_min: float = 0.0
+    retrieval_shared: int = 0
+    research_shared: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def load_prompts(path: Path) -> List[Dict[str, Any]]:
+    """Prompt records from a JSONL file; records without an id get "line-N"."""
+    items = []
+    with Path(path).open("r", encoding="utf-8") as f:
+        for n, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            obj = json.loads(line)
+            if isinstance(obj, str):
+                obj = {"prompt": obj}
+            if not obj.get("prompt"):
+                raise ValueError(f"{path}:{n}: missing 'prompt'")
+            obj.setdefault("id", f"line-{n}")
+            obj["id"] = str(obj["id"])
+            items.append(obj)
+    return items
+
+def completed_ids(path: Path) -> Set[str]:
+    """Ids with a successful record in an earlier run's output (a torn last line is ignored)."""
+    done: Set[str] = set()
+    if not Path(path).exists():
+        return done
+    with Path(path).open("r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(rec, dict) and "id" in rec:
+                if rec.get("error"):
+                    done.discard(str(rec["id"]))
+                else:
+                    done.add(str(rec["id"]))
+    return done
+
+class _Writer:
+    """Appends one JSON line per finished prompt, flushed, under a lock."""
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.f = path.open("a+b")
+        self.f.seek(0, 2)
+        if self.f.tell():   # complete a line torn by a crash so the next record starts cleanly
+            self.f.seek(-1, 2)
+            if self.f.read(1) != b"\n":
+                self.f.write(b"\n")
+        self._lock = threading.Lock()
+
+    def write(self, rec: Dict[str, Any]) -> None:
+        data = (json.dumps(rec, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._lock:
+            self.f.write(data)
+            self.f.flush()
+
+    def close(self) -> None:
+        self.f.close()
+
+
+def run_batch(
+    items: List[Dict[str, Any]],
+    out_path: Path,
+    *,
+    concurrency: int = 4,
+    resume: bool = True,
+    share: bool = True,
+    similarity: float = SHARE_SIMILARITY,
+    defaults: Optional[Dict[str, Any]] = None,
+    pipeline: Optional[Callable[..., Dict[str, Any]]] = None,
+    progress: bool = False,
+) -> BatchStats:
+    """Run every prompt not already in out_path through the pipeline; see the module docstring."""
+    if pipeline is None:
+        from .demo import run_pipeline as pipeline
+    from . import query as rag_query
+    from .researcher import gather_sources
+
+    out_path = Path(out_path)
+    stats = BatchStats(total=len(items))
+    done = completed_ids(out_path) if resume else set()
+    todo = [it for it in items if it["id"] not in done]
+    stats.skipped = len(items) - len(todo)
+
+    rag_memo = TopicMemo(similarity, (it["prompt"] for it in items))
+    web_memo = TopicMemo(similarity, (it["prompt"] for it in items))
+
+    # A result is only shared between calls with the same arguments (k, filters, mmr_lambda, ...)
+    def retrieve(query: str, k: int = 8, include: Optional[Dict[str, List[str]]] = None, **kw: Any):
+        scope = json.dumps([k, include or {}, kw], sort_keys=True, default=str)
+        return rag_memo.get(scope, query, lambda: rag_query.retrieve(query, k=k, include=include, **kw))
+
+    def research(query: str, max_sources: int = 4, budget_s: Optional[float] = None, **kw: Any):
+        if budget_s is not None:   # cut short by a deadline: neither reuse nor share the result
+            return gather_sources(query, max_sources=max_sources, budget_s=budget_s, **kw)
+        scope = json.dumps([max_sources, kw], sort_keys=True, default=str)
+        return web_memo.get(scope, query, lambda: gather_sources(query, max_sources=max_sources, **kw))
+
+    def one(item: Dict[str, Any]) -> Dict[str, Any]:
+        opts = {**(defaults or {}), **{k: item[k] for k in PROMPT_KEYS if k in item}}
+        t0 = time.perf_counter()
+        res = pipeline(
+            item["prompt"], opts.get("session"),
+            force_external=bool(opts.get("force_external")), no_external=bool(opts.get("no_external")),
+            max_sources=int(opts.get("max_sources") or 4),
+            tone=opts.get("tone"), length=opts.get("length"), fmt=opts.get("format"),
+            deadline_s=opts.get("deadline_s"),
+            retrieve_fn=retrieve if share else None, research_fn=research if share else None,
+            **({"ctx_tokens": int(opts["ctx_tokens"])} if opts.get("ctx_tokens") is not None else {}),
+        )
+        return {
+            "id": item["id"], "prompt": item["prompt"], "session": opts.get("session"),
+            "final_text": res["final_text"], "plan": res["plan"],
+            "rag_chunk_ids": [c.get("id") for c in res["rag_chunks"] or []],
+            "web_sources": [asdict(s) for s in res["web_sources"] or []],
+            "degradations": res.get("degradations", []),
+            "elapsed_s": round(time.perf_counter() - t0, 3),
+        }
+
+    writer = _Writer(out_path)
+    t0 = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="agentic-batch") as pool:
+            futures = {pool.submit(one, it): it for it in todo}
+            for fut in as_completed(futures):
+                item = futures[fut]
+                try:
+                    writer.write(fut.result())
+                    stats.done += 1
+                except Exception as e:
+                    writer.write({"id": item["id"], "prompt": item["prompt"], "error": f"{type(e).__name__}: {e}"})
+                    stats.failed += 1
+                if progress:
+                    print(f"[batch] {stats.done + stats.failed}/{len(todo)} {item['id']}"
+                          f"{' FAILED' if fut.exception() else ''}", file=sys.stderr)
+    finally:
+        writer.close()
+    stats.wall_s = round(time.perf_counter() - t0, 3)
+    stats.drafts_per_min = round(stats.done / stats.wall_s * 60.0, 2) if stats.wall_s else 0.0
+    stats.retrieval_shared = rag_memo.hits
+    stats.research_shared = web_memo.hits
+    return stats
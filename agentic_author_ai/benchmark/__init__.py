@@ -0,0 +1,36 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+# -------------------------------
+# Benchmark
+# -------------------------------
+
+"""
+Offline end-to-end benchmarks for the pipeline.
+
+Starts the stub servers from stubs.py (chat, embeddings, search, pages), generates
+a synthetic corpus in a scratch data dir, and times each scenario against the real
+pipeline code. Results (latency percentiles, throughput, per-stage trace summary)
+are written as JSON so runs from different versions can be compared.
+
+Shared helpers live in common.py, the command line in runner.py and each
+scenario in scenarios/<name>.py (registered with @scenario).
+
+Usage:
+    python -m agentic_author_ai.benchmark --out bench.json
+    python -m agentic_author_ai.benchmark --scenarios retrieval demo --chat-latency-ms 200 --error-rate 0.02
+    python -m agentic_author_ai.benchmark --out new.json --compare bench.json
+"""
+
+from .common import (SCENARIOS, BenchContext, chunk_records, ensure_index, make_corpus, make_docx,
+                     make_pdf, make_queries, no_result_cache, run_timed, scenario, summarize)
+from .runner import compare, main
+from . import scenarios  # noqa: F401  (registers every scenario)
+
+__all__ = [
+    "SCENARIOS", "BenchContext", "chunk_records", "compare", "ensure_index", "main",
+    "make_corpus", "make_docx", "make_pdf", "make_queries", "no_result_cache", "run_timed",
+    "scenario", "summarize",
+]
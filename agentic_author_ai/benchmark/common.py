@@ -0,0 +1,233 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+# -------------------------------
+# Benchmark common
+# -------------------------------
+
+"""
+Shared pieces of the benchmark scenarios: the scenario registry, the synthetic
+corpus (docs, queries, PDF/DOCX files), BenchContext and the timing helpers.
+
+Usage:
+    from .common import BenchContext, run_timed, scenario
+
+    @scenario("name")
+    def bench_name(ctx: BenchContext) -> Dict[str, Any]:
+        return run_timed(work, ctx.queries * ctx.args.repeat)
+"""
+
+from __future__ import annotations
+import argparse
+import contextlib
+import io
+import json
+import random
+import sys
+import time
+import zipfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from ..tracing import percentile
+
+SCENARIOS: Dict[str, Callable[["BenchContext"], Dict[str, Any]]] = {}
+
+def scenario(name: str) -> Callable:
+    """Register a benchmark scenario (run in registration order)."""
+    def decorator(func: Callable[["BenchContext"], Dict[str, Any]]):
+        SCENARIOS[name] = func
+        return func
+    return decorator
+
+
+# -------------------------------
+# Synthetic corpus
+# -------------------------------
+
+TOPICS: Dict[str, List[str]] = {
+    "payments": ["payments", "settlement", "clearing", "ledger", "fraud", "card", "merchant", "latency"],
+    "regulation": ["regulation", "compliance", "policy", "supervisor", "capital", "disclosure", "audit", "risk"],
+    "ai": ["model", "agent", "training", "inference", "evaluation", "retrieval", "prompt", "safety"],
+    "markets": ["market", "equity", "liquidity", "trading", "volatility", "pricing", "exchange", "index"],
+    "strategy": ["growth", "customer", "platform", "partnership", "revenue", "talent", "culture", "roadmap"],
+}
+FILLER = ["the", "a", "of", "and", "to", "in", "for", "with", "on", "we", "our", "is", "are", "this", "that"]
+
+def make_corpus(n_docs: int, words_per_doc: int, n_sessions: int, seed: int = 7) -> List[Dict[str, Any]]:
+    """Documents mixing one dominant topic with filler and a little cross-topic noise."""
+    rng = random.Random(seed)
+    names = list(TOPICS)
+    docs = []
+    for i in range(n_docs):
+        topic = names[i % len(names)]
+        words = []
+        for _ in range(words_per_doc):
+            r = rng.random()
+            if r < 0.45:
+                words.append(rng.choice(TOPICS[topic]))
+            elif r < 0.55:
+                words.append(rng.choice(TOPICS[rng.choice(names)]))
+            else:
+                words.append(rng.choice(FILLER))
+            if rng.random() < 0.06:
+                words[-1] += "."
+        docs.append({
+            "name": f"ks-session-{i % n_sessions}-doc-{i}.docx",
+            "session": f"Session {i % n_sessions}",
+            "topic": topic,
+            "text": " ".join(words),
+        })
+    return docs
+
+def make_queries(n: int, seed: int = 11) -> List[str]:
+    rng = random.Random(seed)
+    names = list(TOPICS)
+    out = []
+    for i in range(n):
+        topic = names[i % len(names)]
+        out.append("What do the notes say about " + " and ".join(rng.sample(TOPICS[topic], 3)) + "?")
+    return out
+
+def make_pdf(pages: List[str], line_chars: int = 95) -> bytes:
+    """Minimal uncompressed PDF (Helvetica, one content stream per page) for extraction benchmarks."""
+    def esc(t: str) -> str:
+        return t.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+    objs = ["<< /Type /Catalog /Pages 2 0 R >>", "",
+            "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"]
+    kids = []
+    for text in pages:
+        lines, cur = [], ""
+        for w in text.split():
+            if cur and len(cur) + 1 + len(w) > line_chars:
+                lines.append(cur)
+                cur = w
+            else:
+                cur = f"{cur} {w}" if cur else w
+        lines.append(cur)
+        stream = "BT /F1 9 Tf 11 TL 36 806 Td\n" + "".join(f"({esc(l)}) Tj T*\n" for l in lines) + "ET"
+        objs.append(f"<< /Length {len(stream.encode('latin-1'))} >>\nstream\n{stream}\nendstream")
+        objs.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                    f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objs)} 0 R >>")
+        kids.append(f"{len(objs)} 0 R")
+    objs[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+    out, offsets = bytearray(b"%PDF-1.4\n"), []
+    for i, body in enumerate(objs, 1):
+        offsets.append(len(out))
+        out += f"{i} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objs) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    out += "".join(f"{o:010d} 00000 n \n" for o in offsets).encode("latin-1")
+    out += f"trailer\n<< /Size {len(objs) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    return bytes(out)
+
+
+def make_docx(blocks: List[str], table_every: int = 20) -> bytes:
+    """Minimal DOCX (word/document.xml only): one paragraph per block, a 3x4 table every few blocks."""
+    from xml.sax.saxutils import escape
+    def para(t: str) -> str:
+        return f'<w:p><w:r><w:t xml:space="preserve">{escape(t)}</w:t></w:r></w:p>'
+    body = []
+    for i, b in enumerate(blocks):
+        body.append(para(b))
+        if table_every and i % table_every == table_every - 1:
+            words = b.split()
+            rows = "".join("<w:tr>" + "".join(f"<w:tc>{para(' '.join(words[r * 4 + c: r * 4 + c + 3]))}</w:tc>"
+                                              for c in range(4)) + "</w:tr>" for r in range(3))
+            body.append(f"<w:tbl>{rows}</w:tbl>")
+    xml = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+           '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+           f'<w:body>{"".join(body)}<w:sectPr/></w:body></w:document>')
+    parts = {
+        "[Content_Types].xml": '<?xml version="1.0" encoding="UTF-8"?><Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/></Types>',
+        "_rels/.rels": '<?xml version="1.0" encoding="UTF-8"?><Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/></Relationships>',
+        "word/document.xml": xml,
+    }
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as z:
+        for name, data in parts.items():
+            z.writestr(name, data)
+    return buf.getvalue()
+
+
+# -------------------------------
+# Context + helpers
+# -------------------------------
+
+@dataclass
+class BenchContext:
+    args: argparse.Namespace
+    data_dir: Path
+    docs: List[Dict[str, Any]]
+    queries: List[str]
+    state: Dict[str, Any] = field(default_factory=dict)
+
+def summarize(samples_s: List[float], errors: int = 0) -> Dict[str, Any]:
+    ms = [s * 1000.0 for s in samples_s]
+    return {
+        "n": len(ms),
+        "errors": errors,
+        "mean_ms": round(sum(ms) / len(ms), 3) if ms else 0.0,
+        "p50_ms": round(percentile(ms, 50), 3),
+        "p95_ms": round(percentile(ms, 95), 3),
+        "p99_ms": round(percentile(ms, 99), 3),
+        "min_ms": round(min(ms), 3) if ms else 0.0,
+        "max_ms": round(max(ms), 3) if ms else 0.0,
+    }
+
+def run_timed(func: Callable[[Any], Any], items: List[Any]) -> Dict[str, Any]:
+    """Time func(item) for every item; exceptions count as errors and are not timed."""
+    samples, errors = [], 0
+    for item in items:
+        t0 = time.perf_counter()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                func(item)
+        except Exception as e:
+            errors += 1
+            print(f"  ! {type(e).__name__}: {e}", file=sys.stderr)
+            continue
+        samples.append(time.perf_counter() - t0)
+    return summarize(samples, errors)
+
+def chunk_records(docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Chunk synthetic docs into the same schema chunking.py writes."""
+    from ..chunking import chunk_words
+    out = []
+    for d in docs:
+        for j, ch in enumerate(chunk_words(d["text"])):
+            out.append({
+                "id": f"{d['name']}#{j}",
+                "text": ch,
+                "meta": {"source": d["name"], "type": "docx", "section": "",
+                         "session": d["session"], "speaker": None},
+            })
+    return out
+
+def ensure_index(ctx: BenchContext) -> None:
+    if ctx.state.get("indexed"):
+        return
+    from .. import index
+    from ..rag_config import CHUNKS_JSON
+    Path(CHUNKS_JSON).write_text(json.dumps(chunk_records(ctx.docs), ensure_ascii=False), encoding="utf-8")
+    with contextlib.redirect_stdout(io.StringIO()):
+        index.main([])
+    ctx.state["indexed"] = True
+
+@contextlib.contextmanager
+def no_result_cache():
+    """Time the full retrieval path: disable query.RESULT_CACHE (context manager or decorator)."""
+    from .. import query
+    saved = query.RESULT_CACHE.max_entries
+    query.RESULT_CACHE.max_entries = 0
+    try:
+        yield
+    finally:
+        query.RESULT_CACHE.max_entries = saved
@@ -0,0 +1,162 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+# -------------------------------
+# Benchmark runner
+# -------------------------------
+
+"""
+Command line entry of the benchmarks: starts the stub server, re-runs itself in a
+child process pointed at it and a scratch data dir, runs the selected scenarios
+there and writes the results JSON.
+
+Usage:
+    python -m agentic_author_ai.benchmark --out bench.json
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..tracing import clear_trace, stage_summary
+from .common import SCENARIOS, BenchContext, make_corpus, make_queries
+
+def _git_rev() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=Path(__file__).parent, timeout=5).stdout.strip() or None
+    except Exception:
+        return None
+
+def _run_child(args: argparse.Namespace) -> Dict[str, Any]:
+    """Runs inside the child process whose env already points at the stub + scratch data dir."""
+    data_dir = Path(os.environ["AGENTIC_DATA_DIR"])
+    ctx = BenchContext(
+        args=args, data_dir=data_dir,
+        docs=make_corpus(args.docs, args.words_per_doc, args.sessions, seed=args.seed),
+        queries=make_queries(args.queries, seed=args.seed + 1),
+    )
+    names = list(SCENARIOS) if "all" in args.scenarios else args.scenarios
+    results: Dict[str, Any] = {}
+    for name in names:
+        if name not in SCENARIOS:
+            print(f"Skip unknown scenario: {name}", file=sys.stderr)
+            continue
+        print(f"[bench] {name} ...", file=sys.stderr)
+        clear_trace()
+        t0 = time.perf_counter()
+        res = SCENARIOS[name](ctx)
+        res["wall_s"] = round(time.perf_counter() - t0, 3)
+        res["stages"] = stage_summary()
+        results[name] = res
+    return results
+
+def _stub_config(args: argparse.Namespace):
+    from ..stubs import StubConfig
+    return StubConfig(
+        embed_dim=args.embed_dim, chat_latency_ms=args.chat_latency_ms,
+        chat_ms_per_prompt_token=args.chat_ms_per_prompt_token,
+        embed_latency_ms=args.embed_latency_ms, search_latency_ms=args.search_latency_ms,
+        page_latency_ms=args.page_latency_ms, error_rate=args.error_rate, seed=args.seed,
+        slow_rate=args.slow_rate, slow_ms=args.slow_ms,
+    )
+
+def _launch(args: argparse.Namespace, argv: List[str]) -> Dict[str, Any]:
+    """Start the stub server, then re-run this module in a child with the env pointed at it."""
+    from ..stubs import start_stub_server
+    cfg = _stub_config(args)
+    srv = start_stub_server(cfg)
+    with tempfile.TemporaryDirectory(prefix="agentic-bench-") as tmp:
+        out_tmp = Path(tmp) / "child.json"
+        env = {**os.environ, **srv.env(), "AGENTIC_DATA_DIR": str(Path(tmp) / "data"),
+               "AGENTIC_BENCH_CHILD": "1", "AGENTIC_BENCH_OUT": str(out_tmp)}
+        t0 = time.perf_counter()
+        proc = subprocess.run([sys.executable, "-m", "agentic_author_ai.benchmark", *argv], env=env)
+        wall = time.perf_counter() - t0
+        if proc.returncode != 0 or not out_tmp.exists():
+            raise SystemExit(f"benchmark child failed (exit {proc.returncode})")
+        scenarios = json.loads(out_tmp.read_text())
+    srv.shutdown()
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "git_rev": _git_rev(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": {k: v for k, v in vars(args).items() if k not in ("out", "compare")},
+            "stub_requests": dict(cfg.counters),
+            "wall_s": round(wall, 3),
+        },
+        "scenarios": scenarios,
+    }
+
+def compare(new: Dict[str, Any], old: Dict[str, Any], metric: str = "p50_ms") -> str:
+    rows = [f"{'scenario':<12} {'old ' + metric:>14} {'new ' + metric:>14} {'delta':>8}"]
+    for name, res in new.get("scenarios", {}).items():
+        prev = old.get("scenarios", {}).get(name)
+        if not prev or not prev.get(metric):
+            rows.append(f"{name:<12} {'-':>14} {res.get(metric, 0):>14.1f} {'new':>8}")
+            continue
+        delta = (res.get(metric, 0) - prev[metric]) / prev[metric] * 100.0
+        rows.append(f"{name:<12} {prev[metric]:>14.1f} {res.get(metric, 0):>14.1f} {delta:>+7.1f}%")
+    return "\n".join(rows)
+
+def _parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(prog="python -m agentic_author_ai.benchmark",
+                                 description="Offline pipeline benchmarks against local stub servers")
+    ap.add_argument("--scenarios", nargs="+", default=["all"], help=f"Any of: all {' '.join(SCENARIOS)}")
+    ap.add_argument("--out", default="bench_results.json", help="Where to write the results JSON")
+    ap.add_argument("--compare", default=None, help="Previous results JSON to diff against")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--docs", type=int, default=40)
+    ap.add_argument("--words-per-doc", type=int, default=2500)
+    ap.add_argument("--sessions", type=int, default=4)
+    ap.add_argument("--queries", type=int, default=20)
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--embed-dim", type=int, default=3072)
+    ap.add_argument("--chat-latency-ms", type=float, default=50.0)
+    ap.add_argument("--chat-ms-per-prompt-token", type=float, default=0.05,
+                    help="Stub prefill cost; makes time-to-first-token grow with prompt size")
+    ap.add_argument("--embed-latency-ms", type=float, default=20.0)
+    ap.add_argument("--search-latency-ms", type=float, default=30.0)
+    ap.add_argument("--page-latency-ms", type=float, default=40.0)
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    ap.add_argument("--slow-rate", type=float, default=0.0,
+                    help="Fraction of stub chat/page requests that take --slow-ms longer (tail latency)")
+    ap.add_argument("--slow-ms", type=float, default=0.0)
+    ap.add_argument("--deadline-s", type=float, default=None,
+                    help="Budget for the deadline scenario (default: 2x its unbounded p50)")
+    return ap
+
+def main(argv: Optional[List[str]] = None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    args = _parser().parse_args(argv)
+
+    if os.environ.get("AGENTIC_BENCH_CHILD") == "1":
+        results = _run_child(args)
+        Path(os.environ["AGENTIC_BENCH_OUT"]).write_text(json.dumps(results, indent=2), encoding="utf-8")
+        return
+
+    report = _launch(args, argv)
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    print(f"{'scenario':<12} {'n':>5} {'err':>4} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10}")
+    for name, res in report["scenarios"].items():
+        print(f"{name:<12} {res['n']:>5} {res['errors']:>4} {res['p50_ms']:>10.1f} "
+              f"{res['p95_ms']:>10.1f} {res['p99_ms']:>10.1f}")
+    print(f"\nWrote {out}")
+
+    if args.compare:
+        print("\n" + compare(report, json.loads(Path(args.compare).read_text())))
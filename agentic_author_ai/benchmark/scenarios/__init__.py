@@ -0,0 +1,22 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+# -------------------------------
+# Benchmark scenarios
+# -------------------------------
+
+"""
+One module per scenario. Importing this package registers them all in
+SCENARIOS; the import order below is the order `--scenarios all` runs them in.
+
+Usage:
+    python -m agentic_author_ai.benchmark --scenarios all
+"""
+
+from . import (  # noqa: F401
+    chunking, pdf_extract, docx_extract, indexing, retrieval, result_cache, rerank, mmr,
+    context_pack, research, demo, deadline, batch, policy, memory_resume, llm_engine, service,
+    storage, async_tool, shards, mmap, snapshots, dedup,
+)
@@ -0,0 +1,68 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+# -------------------------------
+# Benchmark: async tool
+# -------------------------------
+
+"""
+Event-loop responsiveness while many retrieve-tool calls run concurrently.
+
+Usage:
+    python -m agentic_author_ai.benchmark --scenarios async_tool
+"""
+
+from __future__ import annotations
+import time
+from typing import Any, Dict, List
+
+from ...tracing import percentile
+from ..common import BenchContext, ensure_index, no_result_cache, scenario, summarize
+
+@scenario("async_tool")
+@no_result_cache()
+def bench_async_tool(ctx: BenchContext) -> Dict[str, Any]:
+    """
+    Event-loop responsiveness while many retrieve-tool calls run concurrently: a 1 ms
+    heartbeat records how late it wakes up. Compares the async tool (aretrieve) with
+    the old pattern of calling blocking retrieve() inside the coroutine.
+    """
+    import asyncio
+    from ... import query
+    from ...tools import Tool
+    ensure_index(ctx)
+    query.get_index_meta()
+
+    async def blocking_tool(query_text: str) -> int:
+        return len(query.retrieve(query_text))
+
+    async def run(tool_call, n_calls: int) -> Dict[str, Any]:
+        lags: List[float] = []
+        stop = asyncio.Event()
+
+        async def heartbeat() -> None:
+            while not stop.is_set():
+                t0 = time.perf_counter()
+                await asyncio.sleep(0.001)
+                lags.append(time.perf_counter() - t0 - 0.001)
+
+        await tool_call(ctx.queries[0])  # warm-up: per-loop client, connection pool
+        hb = asyncio.create_task(heartbeat())
+        t0 = time.perf_counter()
+        await asyncio.gather(*(tool_call(ctx.queries[i % len(ctx.queries)]) for i in range(n_calls)))
+        wall = time.perf_counter() - t0
+        stop.set()
+        await hb
+        ms = [x * 1000.0 for x in lags]
+        return {"wall_ms": round(wall * 1000.0, 2), "loop_lag_p50_ms": round(percentile(ms, 50), 3),
+                "loop_lag_p99_ms": round(percentile(ms, 99), 3), "loop_lag_max_ms": round(max(ms or [0.0]), 3)}
+
+    tool = query.make_retrieve_tool(Tool)
+    n_calls = 16 * ctx.args.repeat
+    blocking = asyncio.run(run(blocking_tool, n_calls))
+    native = asyncio.run(run(lambda q: tool(query=q), n_calls))
+    res = summarize([native["wall_ms"] / 1000.0])
+    res.update({"calls": n_calls, "async": native, "blocking": blocking})
+    return res
@@ -0,0 +1,57 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+# -------------------------------
+# Benchmark: batch
+# -------------------------------
+
+"""
+Batch authoring vs a serial loop, and resuming a half-written batch.
+
+Usage:
+    python -m agentic_author_ai.benchmark --scenarios batch
+"""
+
+from __future__ import annotations
+import json
+from typing import Any, Dict
+
+from ..common import BenchContext, ensure_index, no_result_cache, run_timed, scenario, summarize
+
+@scenario("batch")
+def bench_batch(ctx: BenchContext) -> Dict[str, Any]:
+    """
+    Bulk authoring: the prompts run one after another through run_pipeline (like a
+    loop over `make demo`, minus process start-up), then as one --batch with
+    shared retrieval/research. Reports drafts/min of both, and checks that a
+    rerun after losing the second half of the output only redoes that half.
+    """
+    from ... import demo
+    from ...batch import run_batch
+    ensure_index(ctx)
+    session = sorted({d["session"] for d in ctx.docs})[0]
+    prompts = [f"Write a short brief with your own research. {q}" for q in ctx.queries] * ctx.args.repeat
+    items = [{"id": str(i), "prompt": p, "session": session, "max_sources": 2} for i, p in enumerate(prompts)]
+    out = ctx.data_dir / "batch_drafts.jsonl"
+    out.unlink(missing_ok=True)
+    with no_result_cache():
+        serial = run_timed(lambda p: demo.run_pipeline(p, session=session, max_sources=2), prompts)
+        serial_wall = serial["mean_ms"] * serial["n"] / 1000.0
+        stats = run_batch(items, out, concurrency=8)
+        lines = out.read_text(encoding="utf-8").splitlines(keepends=True)
+        per_draft = [json.loads(l).get("elapsed_s", 0.0) for l in lines]
+        out.write_text("".join(lines[: len(lines) // 2]) + lines[len(lines) // 2][:20], encoding="utf-8")
+        resumed = run_batch(items, out, concurrency=8)
+    res = summarize(per_draft, stats.failed)   # per-draft latency inside the batch
+    res.update({
+        "serial_drafts_per_min": round(serial["n"] / serial_wall * 60.0, 2) if serial_wall else 0.0,
+        "drafts_per_min": stats.drafts_per_min,
+        "retrieval_shared": stats.retrieval_shared,
+        "research_shared": stats.research_shared,
+        "resume_skipped": resumed.skipped,
+        "resume_redone": resumed.done,
+        "resume_ok": resumed.skipped + resumed.done == len(items) and resumed.skipped == len(lines) // 2,
+    })
+    return res
@@ -0,0 +1,30 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+# -------------------------------
+# Benchmark: chunking
+# -------------------------------
+
+"""
+Words/s of chunk_words() on the synthetic corpus.
+
+Usage:
+    python -m agentic_author_ai.benchmark --scenarios chunking
+"""
+
+from __future__ import annotations
+from typing import Any, Dict
+
+from ..common import BenchContext, run_timed, scenario
+
+@scenario("chunking")
+def bench_chunking(ctx: BenchContext) -> Dict[str, Any]:
+    from ...chunking import chunk_words
+    docs = ctx.docs * ctx.args.repeat
+    res = run_timed(lambda d: chunk_words(d["text"]), docs)
+    words = sum(len(d["text"].split()) for d in docs)
+    total_s = res["mean_ms"] * res["n"] / 1000.0
+    res["words_per_s"] = round(words / total_s, 1) if total_s else 0.0
+    return res
@@ -0,0 +1,75 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+# -------------------------------
+# Benchmark: context pack
+# -------------------------------
+
+"""
+Author prompt tokens and time-to-first-token, whole chunks vs packed context.
+
+Usage:
+    python -m agentic_author_ai.benchmark --scenarios context_pack
+"""
+
+from __future__ import annotations
+import time
+from typing import Any, Dict, List
+
+from ..common import BenchContext, ensure_index, run_timed, scenario
+
+@scenario("context_pack")
+def bench_context_pack(ctx: BenchContext) -> Dict[str, Any]:
+    """
+    Author prompt with whole chunks vs packed to CONTEXT_TOKENS: prompt tokens and
+    time-to-first-token of a streamed chat call (the stub's TTFT grows with prompt
+    size via --chat-ms-per-prompt-token). Timed samples are the packed TTFTs.
+    """
+    from ... import demo, query
+    from ...rag_config import CONTEXT_TOKENS
+    from ...researcher import gather_sources
+    from ...stubs import count_tokens
+    ensure_index(ctx)
+    plan = {"allow_external": True, "rationale": "", "research_focus": [], "steps": ["Outline", "Draft"]}
+    cases = []
+    for q in ctx.queries[: max(1, len(ctx.queries) // 2)]:
+        chunks = query.retrieve(q, k=6)
+        sources = gather_sources(q, max_sources=2, sleep_sec=0.0)
+        cases.append((q, chunks, sources))
+
+    def ttft(messages: List[Dict[str, str]]) -> float:
+        t0 = time.perf_counter()
+        stream = query._client().chat.completions.create(model="gpt-4o-mini", messages=messages, stream=True)
+        first = None
+        for ev in stream:
+            if first is None and ev.choices and ev.choices[0].delta.content:
+                first = time.perf_counter() - t0
+        return first if first is not None else time.perf_counter() - t0
+
+    full_tok, packed_tok, full_ttft, pack_ms, reductions = [], [], [], [], []
+    for q, chunks, sources in cases:
+        full, _ = demo.author_messages(q, plan, None, chunks, sources, ctx_tokens=0)
+        full_tok.append(sum(count_tokens(m["content"]) for m in full))
+        full_ttft.append(ttft(full))
+        t0 = time.perf_counter()
+        packed, stats = demo.author_messages(q, plan, None, chunks, sources, ctx_tokens=CONTEXT_TOKENS)
+        pack_ms.append((time.perf_counter() - t0) * 1000.0)
+        packed_tok.append(sum(count_tokens(m["content"]) for m in packed))
+        reductions.append(stats.reduction)
+
+    res = run_timed(lambda c: ttft(demo.author_messages(c[0], plan, None, c[1], c[2])[0]),
+                    cases * ctx.args.repeat)
+    mean = lambda xs: sum(xs) / len(xs) if xs else 0.0
+    res.update({
+        "ctx_tokens": CONTEXT_TOKENS,
+        "prompt_tokens_full": round(mean(full_tok), 1),
+        "prompt_tokens_packed": round(mean(packed_tok), 1),
+        "prompt_token_reduction": round(1.0 - mean(packed_tok) / mean(full_tok), 4) if full_tok else 0.0,
+        "context_token_reduction": round(mean(reductions), 4),
+        "ttft_full_ms": round(mean(full_ttft) * 1000.0, 3),
+        "ttft_packed_ms": res["mean_ms"],
+        "pack_mean_ms": round(mean(pack_ms), 3),
+    })
+    return res
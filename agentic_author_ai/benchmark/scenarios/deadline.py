@@ -0,0 +1,73 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+# -------------------------------
+# Benchmark: deadline
+# -------------------------------
+
+"""
+The demo under heavy-tail stub latency, without and with a deadline.
+
+Usage:
+    python -m agentic_author_ai.benchmark --scenarios deadline
+"""
+
+from __future__ import annotations
+from typing import Any, Callable, Dict, List, Optional
+
+from ..common import BenchContext, ensure_index, no_result_cache, run_timed, scenario
+
+@scenario("deadline")
+def bench_deadline(ctx: BenchContext) -> Dict[str, Any]:
+    """
+    Full demo against a stub with heavy-tail chat/page latency (--slow-rate of calls
+    take --slow-ms longer), without and with a deadline (--deadline-s, default 2x
+    the unbounded p50). Reports p50/p99 and SLO attainment of both, and how often
+    each degradation was applied.
+    """
+    from openai import OpenAI
+    from ... import demo, editor, researcher
+    from ...stubs import StubConfig, start_stub_server
+    ensure_index(ctx)
+    tail = start_stub_server(StubConfig(
+        chat_latency_ms=ctx.args.chat_latency_ms, chat_ms_per_prompt_token=ctx.args.chat_ms_per_prompt_token,
+        search_latency_ms=ctx.args.search_latency_ms, page_latency_ms=ctx.args.page_latency_ms,
+        slow_rate=ctx.args.slow_rate or 0.1, slow_ms=ctx.args.slow_ms or 1500.0, seed=ctx.args.seed))
+    saved = demo.client, editor.client, researcher.SEARCH_URL
+    demo.client = editor.client = OpenAI(base_url=tail.base_url + "/v1", api_key="stub")
+    researcher.SEARCH_URL = tail.base_url + "/search"
+    prompts = [f"Write a short brief with your own research. {q}" for q in ctx.queries] * ctx.args.repeat
+    session = sorted({d["session"] for d in ctx.docs})[0]
+    runs: List[Dict[str, Any]] = []
+
+    def one(deadline_s: Optional[float]) -> Callable[[str], None]:
+        def run(p: str) -> None:
+            runs.append(demo.run_pipeline(p, session=session, max_sources=2, deadline_s=deadline_s)["deadline"])
+        return run
+
+    try:
+        with no_result_cache():
+            base = run_timed(one(None), prompts)
+            budget = ctx.args.deadline_s or round(2 * base["p50_ms"] / 1000.0, 3)
+            base_runs, runs = list(runs), []
+            res = run_timed(one(budget), prompts)
+    finally:
+        demo.client, editor.client, researcher.SEARCH_URL = saved
+        tail.shutdown()
+    shed: Dict[str, int] = {}
+    for r in runs:
+        for d in r["degradations"]:
+            key = f"{d['stage']}:{d['action']}"
+            shed[key] = shed.get(key, 0) + 1
+    res.update({
+        "deadline_s": budget,
+        "baseline_p50_ms": base["p50_ms"], "baseline_p99_ms": base["p99_ms"],
+        "baseline_slo_met": round(sum(1 for r in base_runs if r["elapsed_s"] <= budget) / len(base_runs), 4)
+                            if base_runs else 0.0,
+        "slo_met": round(sum(1 for r in runs if r["met"]) / len(runs), 4) if runs else 0.0,
+        "degraded_runs": sum(1 for r in runs if r["degradations"]),
+        "degradations": shed,
+    })
+    return res
@@ -0,0 +1,48 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+# -------------------------------
+# Benchmark: dedup
+# -------------------------------
+
+"""
+MinHash/LSH near-duplicate removal: throughput and savings.
+
+Usage:
+    python -m agentic_author_ai.benchmark --scenarios dedup
+"""
+
+from __future__ import annotations
+import random
+import time
+from typing import Any, Dict
+
+from ..common import BenchContext, FILLER, chunk_records, scenario, summarize
+
+@scenario("dedup")
+def bench_dedup(ctx: BenchContext) -> Dict[str, Any]:
+    """MinHash/LSH throughput and savings on the corpus plus lightly edited copies in other sessions."""
+    from ...dedup import dedup_chunks, vector_bytes
+    rng = random.Random(ctx.args.seed)
+    copies = []
+    for d in ctx.docs[: max(1, len(ctx.docs) // 3)]:
+        words = d["text"].split()
+        for _ in range(max(1, len(words) // 100)):  # ~1% of words edited
+            words[rng.randrange(len(words))] = rng.choice(FILLER)
+        copies.append({**d, "name": "copy-" + d["name"], "session": d["session"] + " (copy)",
+                       "text": " ".join(words)})
+    records = chunk_records(ctx.docs + copies)
+    injected = len(chunk_records(copies))
+    samples, stats = [], None
+    for _ in range(ctx.args.repeat):
+        t0 = time.perf_counter()
+        _, stats = dedup_chunks([dict(r, meta=dict(r["meta"])) for r in records])
+        samples.append(time.perf_counter() - t0)
+        stats.bytes_per_vector = vector_bytes(ctx.args.embed_dim)
+    res = summarize(samples)
+    res.update(stats.to_dict() if stats else {})
+    res["injected_duplicates"] = injected
+    res["chunks_per_s"] = round(len(records) / (sum(samples) / len(samples)), 1) if samples else 0.0
+    return res
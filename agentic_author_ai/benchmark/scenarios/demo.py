@@ -0,0 +1,28 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+# -------------------------------
+# Benchmark: demo
+# -------------------------------
+
+"""
+The full demo pipeline (plan, retrieve, research, author, edit).
+
+Usage:
+    python -m agentic_author_ai.benchmark --scenarios demo
+"""
+
+from __future__ import annotations
+from typing import Any, Dict
+
+from ..common import BenchContext, ensure_index, run_timed, scenario
+
+@scenario("demo")
+def bench_demo(ctx: BenchContext) -> Dict[str, Any]:
+    from ... import demo
+    ensure_index(ctx)
+    prompts = [f"Write a short brief with your own research. {q}" for q in ctx.queries[:3]] * ctx.args.repeat
+    sessions = sorted({d["session"] for d in ctx.docs})
+    return run_timed(lambda p: demo.run_pipeline(p, session=sessions[0], max_sources=2), prompts)
@@ -0,0 +1,33 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+# -------------------------------
+# Benchmark: indexing
+# -------------------------------
+
+"""
+Full index build (index.main) over the synthetic chunks.
+
+Usage:
+    python -m agentic_author_ai.benchmark --scenarios indexing
+"""
+
+from __future__ import annotations
+import json
+from pathlib import Path
+from typing import Any, Dict
+
+from ..common import BenchContext, chunk_records, run_timed, scenario
+
+@scenario("indexing")
+def bench_indexing(ctx: BenchContext) -> Dict[str, Any]:
+    from ... import index
+    from ...rag_config import CHUNKS_JSON
+    records = chunk_records(ctx.docs)
+    Path(CHUNKS_JSON).write_text(json.dumps(records, ensure_ascii=False), encoding="utf-8")
+    res = run_timed(lambda _: index.main([]), list(range(ctx.args.repeat)))
+    ctx.state["indexed"] = res["n"] > 0
+    res["chunks"] = len(records)
+    return res
@@ -0,0 +1,91 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+# -------------------------------
+# Benchmark: llm engine
+# -------------------------------
+
+"""
+Agent.act under load: the async LLM engine vs per-call executor threads.
+
+Usage:
+    python -m agentic_author_ai.benchmark --scenarios llm_engine
+"""
+
+from __future__ import annotations
+import random
+import time
+from typing import Any, Dict, List, Tuple
+
+from ...tracing import percentile
+from ..common import BenchContext, make_queries, scenario, summarize
+
+@scenario("llm_engine")
+def bench_llm_engine(ctx: BenchContext) -> Dict[str, Any]:
+    """
+    Agent.act under load: 400 concurrent calls (40 distinct prompts, 3 in 4 from
+    background agents) on a sync-only LatencyLLM (50 ms). Baseline is the old path,
+    LLM.acomplete on the loop's default executor; the engine run uses concurrency 32
+    with coalescing. Reports wall time, model calls made and wait by priority, and
+    p99 per priority with 8 slots and no coalescing (contended_*).
+    """
+    import asyncio
+    from ...agent import Agent
+    from ...llm import LatencyLLM
+    from ...llm_engine import BACKGROUND, INTERACTIVE, LLMEngine
+    from ...messages import Message
+    rng = random.Random(ctx.args.seed)
+    topics = make_queries(40, seed=ctx.args.seed + 2)
+    jobs = [(rng.choice(topics), INTERACTIVE if i % 4 == 0 else BACKGROUND) for i in range(400)]
+
+    async def baseline(llm: LatencyLLM) -> List[float]:
+        agent = Agent("writer", "Draft.", llm=llm)
+        async def one(q: str) -> float:
+            t0 = time.perf_counter()
+            await llm.acomplete(agent.prompt_from([Message("user", q)]))
+            return time.perf_counter() - t0
+        return await asyncio.gather(*(one(q) for q, _ in jobs))
+
+    async def engine_run(llm: LatencyLLM, engine: LLMEngine) -> List[Tuple[int, float]]:
+        author = Agent("writer", "Draft.", llm=llm, engine=engine, priority=INTERACTIVE)
+        ranker = Agent("writer", "Draft.", llm=llm, engine=engine, priority=BACKGROUND)
+        async def one(q: str, prio: int) -> Tuple[int, float]:
+            t0 = time.perf_counter()
+            await (author if prio == INTERACTIVE else ranker).act([Message("user", q)])
+            return prio, time.perf_counter() - t0
+        return await asyncio.gather(*(one(q, p) for q, p in jobs))
+
+    res: Dict[str, Any] = {}
+    base_llm = LatencyLLM(latency_s=0.05, native_async=False, seed=ctx.args.seed)
+    t0 = time.perf_counter()
+    base = asyncio.run(baseline(base_llm))
+    res.update({"baseline_wall_s": round(time.perf_counter() - t0, 3), "baseline_calls": base_llm.calls,
+                "baseline_p99_ms": round(percentile([x * 1000.0 for x in base], 99), 3)})
+
+    llm = LatencyLLM(latency_s=0.05, native_async=False, seed=ctx.args.seed)
+    engine = LLMEngine(concurrency=32)
+    t0 = time.perf_counter()
+    out = asyncio.run(engine_run(llm, engine))
+    wall = time.perf_counter() - t0
+    stats = engine.stats()
+    by_prio = {p: [x * 1000.0 for q, x in out if q == p] for p in (INTERACTIVE, BACKGROUND)}
+    res = {**summarize([x for _, x in out]), **res}
+    res.update({
+        "engine_wall_s": round(wall, 3), "engine_calls": llm.calls, "coalesced": stats["coalesced"],
+        "max_queue_depth": stats["max_queue_depth"],
+        "interactive_p99_ms": round(percentile(by_prio[INTERACTIVE], 99), 3),
+        "background_p99_ms": round(percentile(by_prio[BACKGROUND], 99), 3),
+        "wait": stats["wait"],
+    })
+
+    # Priorities under contention: no coalescing, 8 slots for all 400 calls
+    llm = LatencyLLM(latency_s=0.05, native_async=False, seed=ctx.args.seed)
+    out = asyncio.run(engine_run(llm, LLMEngine(concurrency=8, coalesce=False)))
+    by_prio = {p: [x * 1000.0 for q, x in out if q == p] for p in (INTERACTIVE, BACKGROUND)}
+    res.update({
+        "contended_interactive_p99_ms": round(percentile(by_prio[INTERACTIVE], 99), 3),
+        "contended_background_p99_ms": round(percentile(by_prio[BACKGROUND], 99), 3),
+    })
+    return res
@@ -0,0 +1,68 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+# -------------------------------
+# Benchmark: memory resume
+# -------------------------------
+
+"""
+Reopening persisted Memory sessions with 10k and 100k+ messages.
+
+Usage:
+    python -m agentic_author_ai.benchmark --scenarios memory_resume
+"""
+
+from __future__ import annotations
+import json
+import random
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from ...tracing import percentile
+from ..common import BenchContext, TOPICS, FILLER, scenario, summarize
+
+@scenario("memory_resume")
+def bench_memory_resume(ctx: BenchContext) -> Dict[str, Any]:
+    """
+    Reopening a persisted Memory session with 10k and 100k+ messages: the last 50
+    messages via the session store's offset index, vs replaying the whole JSONL
+    (the only way to resume before). Also reports the per-message append cost.
+    """
+    from ...memory import Memory
+    from ...messages import Message
+    rng = random.Random(ctx.args.seed)
+    words = [w for ws in TOPICS.values() for w in ws] + FILLER
+    res: Dict[str, Any] = {}
+    samples: List[float] = []
+    for n in (10_000, 120_000):
+        path = ctx.data_dir / "sessions" / f"bench-{n}.jsonl"
+        for suffix in ("", ".idx", ".snap.json"):
+            Path(str(path) + suffix).unlink(missing_ok=True)
+        mem = Memory(path, max_scratch=50)
+        t0 = time.perf_counter()
+        for i in range(n):
+            mem.add(Message(role="user" if i % 2 else "writer",
+                            content=" ".join(rng.choice(words) for _ in range(40)), meta={"turn": i}))
+        append_s = time.perf_counter() - t0
+        mem.close()
+
+        resume = []
+        for _ in range(max(3, ctx.args.repeat)):
+            t0 = time.perf_counter()
+            m = Memory(path, max_scratch=50)
+            tail = m.last(50)
+            resume.append(time.perf_counter() - t0)
+            m.close()
+        t0 = time.perf_counter()
+        with path.open("r", encoding="utf-8") as f:
+            replay = [Message.from_dict(json.loads(line)) for line in f][-50:]
+        replay_s = time.perf_counter() - t0
+        assert [x.content for x in replay] == [x.content for x in tail]
+        samples += resume
+        res[f"resume_{n // 1000}k_ms"] = round(percentile(resume, 50) * 1000.0, 3)
+        res[f"replay_{n // 1000}k_ms"] = round(replay_s * 1000.0, 3)
+        res[f"append_{n // 1000}k_us"] = round(append_s / n * 1e6, 2)
+    return {**summarize(samples), **res}
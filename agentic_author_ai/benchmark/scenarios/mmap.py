@@ -0,0 +1,105 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+# -------------------------------
+# Benchmark: mmap
+# -------------------------------
+
+"""
+Per-worker memory and startup: private index reads vs memory-mapped ones.
+
+Usage:
+    python -m agentic_author_ai.benchmark --scenarios mmap
+"""
+
+from __future__ import annotations
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+from ..common import BenchContext, ensure_index, run_timed, scenario
+
+def _smaps() -> Dict[str, int]:
+    """Rss / Pss / private / anonymous kB of this process (Linux smaps_rollup)."""
+    out: Dict[str, int] = {}
+    try:
+        for line in open("/proc/self/smaps_rollup"):
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(":") and parts[1].isdigit():
+                out[parts[0][:-1]] = int(parts[1])
+    except OSError:
+        pass
+    return {"rss_kb": out.get("Rss", 0), "pss_kb": out.get("Pss", 0),
+            "private_kb": out.get("Private_Clean", 0) + out.get("Private_Dirty", 0),
+            "anon_kb": out.get("Anonymous", 0)}
+
+def _mem_probe(mode: str, index_path: str, dim: int, barrier: Any, out_q: Any) -> None:
+    """One worker: load the index, search, then report memory once all workers are up."""
+    import numpy as np
+    from ...vectors import load_stored_index
+    t0 = time.perf_counter()
+    before = _smaps()
+    index = load_stored_index(Path(index_path), Path(index_path + ".json"), mmap=(mode != "private"))
+    Q = np.random.default_rng(os.getpid()).standard_normal((8, dim)).astype("float32")
+    index.search(Q, 8)                      # flat search touches every vector
+    ready_ms = (time.perf_counter() - t0) * 1000.0
+    barrier.wait()
+    after = _smaps()
+    out_q.put({"mode": mode, "ready_ms": ready_ms, **after,
+               "index_private_kb": after["private_kb"] - before["private_kb"]})
+    barrier.wait()                          # stay alive until every worker has measured
+
+@scenario("mmap")
+def bench_mmap(ctx: BenchContext) -> Dict[str, Any]:
+    """
+    Per-worker memory and startup with WORKERS processes on one host, for a synthetic
+    flat index: private read, memory-mapped read (spawned workers), and memory-mapped
+    read in forkserver workers after the parent opened the index (answer_many). No
+    mode forks this process: it runs the stub server threads. Pss splits shared
+    pages between the processes using them. Timed samples are the monolithic
+    load_index_meta() on the benchmark corpus.
+    """
+    import multiprocessing as mp
+    import numpy as np
+    from ... import query
+    from ...vectors import build_index, load_stored_index, write_index, write_manifest
+    ensure_index(ctx)
+    workers, n, dim = 4, 8000, ctx.args.embed_dim
+    path = ctx.data_dir / "mmap_probe.faiss"
+    X = np.random.default_rng(3).standard_normal((n, dim)).astype("float32")
+    write_index(build_index(X), path)
+    write_manifest(Path(str(path) + ".json"), storage="float32", dim=dim, ntotal=n)
+    del X
+
+    modes: Dict[str, Any] = {}
+    for mode in ("private", "mmap", "forkserver_mmap"):
+        mctx = mp.get_context("forkserver" if mode == "forkserver_mmap" else "spawn")
+        if mode == "forkserver_mmap":   # parent opens it first, as answer_many does
+            warm = load_stored_index(path, Path(str(path) + ".json"), mmap=True)
+            warm.search(np.zeros((1, dim), dtype="float32"), 1)
+        barrier, out_q = mctx.Barrier(workers), mctx.Queue()
+        procs = [mctx.Process(target=_mem_probe, args=(mode, str(path), dim, barrier, out_q))
+                 for _ in range(workers)]
+        t0 = time.perf_counter()
+        for p in procs:
+            p.start()
+        rows = [out_q.get(timeout=300) for _ in procs]
+        for p in procs:
+            p.join(timeout=60)
+        wall = time.perf_counter() - t0
+        mean = lambda key: round(sum(r[key] for r in rows) / len(rows), 1)
+        modes[mode] = {"ready_ms": mean("ready_ms"), "rss_kb": mean("rss_kb"), "pss_kb": mean("pss_kb"),
+                       "private_kb": mean("private_kb"), "index_private_kb": mean("index_private_kb"),
+                       "all_workers_ready_s": round(wall, 3)}
+    path.unlink(missing_ok=True)
+
+    def load_once(_):
+        query.clear_index_cache()
+        query.load_index_meta()
+    res = run_timed(load_once, list(range(5 * ctx.args.repeat)))
+    res.update({"workers": workers, "probe_vectors": n, "probe_index_mb": round(n * dim * 4 / 1e6, 1),
+                "index_mmap": query.INDEX_MMAP, "modes": modes})
+    return res
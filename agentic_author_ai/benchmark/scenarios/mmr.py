@@ -0,0 +1,68 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+# -------------------------------
+# Benchmark: mmr
+# -------------------------------
+
+"""
+MMR diversity selection vs plain top-k on the same search hits.
+
+Usage:
+    python -m agentic_author_ai.benchmark --scenarios mmr
+"""
+
+from __future__ import annotations
+import time
+from typing import Any, Dict, List, Tuple
+
+from ..common import BenchContext, ensure_index, run_timed, scenario
+
+@scenario("mmr")
+def bench_mmr(ctx: BenchContext) -> Dict[str, Any]:
+    """
+    MMR diversity selection vs plain top-k on the same search hits: selection time
+    (timed samples are the MMR picks), distinct sources, and mean pairwise similarity
+    inside the result list. Also reports the LLM rerank calls MMR mode avoids.
+    """
+    import numpy as np
+    from ... import query
+    ensure_index(ctx)
+    index, meta = query.get_index_meta()
+    k = query.TOP_K
+    V = query.embed_queries(ctx.queries)
+    _, I = query.search_vectors(index, V, k * 8)
+    id_of = {c.get("id"): i for i, c in enumerate(meta)}
+
+    def stats(chunks: List[Dict[str, Any]]) -> Tuple[int, float]:
+        rows = [id_of[c.get("id")] for c in chunks]
+        C = index.reconstruct_batch(np.asarray(rows, dtype="int64"))
+        C /= np.maximum(np.linalg.norm(C, axis=1, keepdims=True), 1e-12)
+        S = C @ C.T
+        n = len(rows)
+        ils = float((S.sum() - np.trace(S)) / (n * (n - 1))) if n > 1 else 0.0
+        return len({c.get("meta", {}).get("source") for c in chunks}), ils
+
+    plain, mmr, plain_ms = [], [], []
+    for r in range(len(ctx.queries)):
+        t0 = time.perf_counter()
+        base = query.select_candidates(meta, I[r], k, mmr_lambda=1.0)
+        plain_ms.append(time.perf_counter() - t0)
+        plain.append(stats(base))
+    res = run_timed(lambda r: query.select_candidates(meta, I[r], k, index=index, qv=V[r]),
+                    list(range(len(ctx.queries))) * ctx.args.repeat)
+    for r in range(len(ctx.queries)):
+        mmr.append(stats(query.select_candidates(meta, I[r], k, index=index, qv=V[r])))
+
+    res.update({
+        "mmr_lambda": query.MMR_LAMBDA,
+        "topk_select_mean_ms": round(sum(plain_ms) / len(plain_ms) * 1000.0, 4),
+        "topk_distinct_sources": round(float(np.mean([p[0] for p in plain])), 2),
+        "mmr_distinct_sources": round(float(np.mean([m[0] for m in mmr])), 2),
+        "topk_intra_list_sim": round(float(np.mean([p[1] for p in plain])), 4),
+        "mmr_intra_list_sim": round(float(np.mean([m[1] for m in mmr])), 4),
+        "llm_rerank_calls_avoided_per_answer": k,
+    })
+    return res
@@ -0,0 +1,94 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+# -------------------------------
+# Benchmark: policy
+# -------------------------------
+
+"""
+Local planner policy vs the LLM planner: calls avoided, agreement, latency.
+
+Usage:
+    python -m agentic_author_ai.benchmark --scenarios policy
+"""
+
+from __future__ import annotations
+import random
+import time
+from typing import Any, Callable, Dict, List
+
+from ...tracing import clear_trace
+from ..common import BenchContext, TOPICS, ensure_index, no_result_cache, run_timed, scenario
+
+POLICY_TEMPLATES = [
+    "Write a brief on {a} and {b}.",
+    "Summarize the session takeaways on {a} and {b}.",
+    "Draft a memo about {a} for the team.",
+    "Write a market view on {a} and {b}.",
+    "Assess the policy outlook for {a} and {b}.",
+    "Compare our {a} approach with industry peers and cite data.",
+    "Explain {a} to a new analyst, using only my notes.",
+]
+
+def make_policy_prompts(n: int, seed: int) -> List[str]:
+    rng = random.Random(seed)
+    words = [w for ws in TOPICS.values() for w in ws]
+    return [rng.choice(POLICY_TEMPLATES).format(a=rng.choice(words), b=rng.choice(words)) for _ in range(n)]
+
+@scenario("policy")
+def bench_policy(ctx: BenchContext) -> Dict[str, Any]:
+    """
+    Local planner policy: trains the classifier on LLM planner decisions for one
+    set of prompts, then runs the demo on fresh prompts with PLANNER_POLICY="llm"
+    and "auto". Reports the share of planner calls avoided, agreement of the local
+    decisions with the LLM planner, speculative research used/wasted (PLANNER_SPECULATE)
+    and latency.
+    """
+    from ... import demo, policy
+    from ...tracing import TRACE_LOG
+    ensure_index(ctx)
+    session = sorted({d["session"] for d in ctx.docs})[0]
+    for p in make_policy_prompts(80, ctx.args.seed):
+        demo._plan_with_policy(p)
+    model = policy.train()
+    t0 = time.perf_counter()
+    test = make_policy_prompts(40 * ctx.args.repeat, ctx.args.seed + 1)
+    for p in test:
+        policy.decide(p)
+    decide_us = (time.perf_counter() - t0) / len(test) * 1e6
+
+    runs: Dict[str, List[Dict[str, Any]]] = {"llm": [], "auto": []}
+
+    def one(mode: str) -> Callable[[str], None]:
+        def run(p: str) -> None:
+            res = demo.run_pipeline(p, session=session, max_sources=2)
+            runs[mode].append({"allow": res["plan"]["allow_external"], **res["planner"]})
+        return run
+
+    saved = demo.PLANNER_POLICY
+    try:
+        with no_result_cache():
+            demo.PLANNER_POLICY = "llm"
+            clear_trace()
+            base = run_timed(one("llm"), test)
+            planner_ms = [e.meta["duration_s"] * 1000.0 for e in TRACE_LOG if e.name == "planner"]
+            demo.PLANNER_POLICY = "auto"
+            res = run_timed(one("auto"), test)
+    finally:
+        demo.PLANNER_POLICY = saved
+    local = [(a, b) for a, b in zip(runs["llm"], runs["auto"]) if b["source"] != "llm"]
+    spec = [r["speculative"] for r in runs["auto"] if r["speculative"]]
+    res.update({
+        "train_decisions": model.n, "cv_accuracy": round(model.accuracy, 4),
+        "decide_us": round(decide_us, 2),
+        "planner_calls_avoided": round(len(local) / len(test), 4) if test else 0.0,
+        "local_agreement": round(sum(1 for a, b in local if a["allow"] == b["allow"]) / len(local), 4)
+                           if local else 0.0,
+        "speculative_used": spec.count("used"), "speculative_wasted": spec.count("wasted"),
+        "llm_planner_p50_ms": base["p50_ms"],
+        "latency_saved_mean_ms": round(base["mean_ms"] - res["mean_ms"], 3),
+        "planner_call_ms": round(sum(planner_ms) / len(planner_ms), 3) if planner_ms else 0.0,
+    })
+    return res
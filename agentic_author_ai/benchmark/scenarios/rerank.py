@@ -0,0 +1,27 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+# -------------------------------
+# Benchmark: rerank
+# -------------------------------
+
+"""
+LLM rerank of the retrieved candidates.
+
+Usage:
+    python -m agentic_author_ai.benchmark --scenarios rerank
+"""
+
+from __future__ import annotations
+from typing import Any, Dict
+
+from ..common import BenchContext, ensure_index, run_timed, scenario
+
+@scenario("rerank")
+def bench_rerank(ctx: BenchContext) -> Dict[str, Any]:
+    from ... import query
+    ensure_index(ctx)
+    pairs = [(q, query.retrieve(q, k=query.TOP_K)) for q in ctx.queries[: max(1, len(ctx.queries) // 4)]]
+    return run_timed(lambda p: query.rerank(p[0], p[1]), pairs * ctx.args.repeat)
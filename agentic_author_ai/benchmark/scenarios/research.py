@@ -0,0 +1,51 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+# -------------------------------
+# Benchmark: research
+# -------------------------------
+
+"""
+gather_sources() against the stub search/page servers.
+
+Usage:
+    python -m agentic_author_ai.benchmark --scenarios research
+"""
+
+from __future__ import annotations
+from typing import Any, Dict, List
+
+from ...tracing import clear_trace
+from ..common import BenchContext, run_timed, scenario
+
+@scenario("research")
+def bench_research(ctx: BenchContext) -> Dict[str, Any]:
+    """
+    gather_sources() against the stub search/page servers (concurrent fetches,
+    pooled parsing). Also reports bytes downloaded per page and the share of
+    query terms found in the chosen excerpts.
+    """
+    from ...context_pack import terms
+    from ...researcher import _parse_pool, gather_sources, parse_excerpt
+    from ...tracing import TRACE_LOG
+    qs = ctx.queries[: max(1, len(ctx.queries) // 4)] * ctx.args.repeat
+    if _parse_pool() is not None:    # start the parse workers (and their imports) outside the timing
+        _parse_pool().submit(parse_excerpt, "", "text/plain", "").result()
+    clear_trace()
+    coverage: List[float] = []
+
+    def one(q: str) -> None:
+        for src in gather_sources(q, max_sources=3, sleep_sec=0.0):
+            want = set(terms(q))
+            coverage.append(len(want & set(terms(src.excerpt))) / len(want) if want else 0.0)
+
+    res = run_timed(one, qs)
+    fetches = [e.meta for e in TRACE_LOG if e.name == "research.fetch"]
+    res.update({
+        "pages_fetched": len(fetches),
+        "bytes_per_page": round(sum(m.get("bytes", 0) for m in fetches) / len(fetches)) if fetches else 0,
+        "query_term_coverage": round(sum(coverage) / len(coverage), 4) if coverage else 0.0,
+    })
+    return res
@@ -0,0 +1,82 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+# -------------------------------
+# Benchmark: result cache
+# -------------------------------
+
+"""
+retrieve() through the result cache: hits vs misses, invalidation on publish.
+
+Usage:
+    python -m agentic_author_ai.benchmark --scenarios result_cache
+"""
+
+from __future__ import annotations
+import contextlib
+import io
+import time
+from typing import Any, Dict
+
+from ...tracing import clear_trace, percentile
+from ..common import BenchContext, ensure_index, scenario, summarize
+
+@scenario("result_cache")
+def bench_result_cache(ctx: BenchContext) -> Dict[str, Any]:
+    """
+    retrieve() through the result cache: the first pass over the queries misses,
+    later passes (with different whitespace/case and filter order) hit. Timed
+    samples are hits; embed calls are counted from the trace. Ends by publishing
+    a new snapshot and checking that the next lookup misses.
+    """
+    from ... import index, query, snapshots
+    from ...rag_config import INDEX_ROOT
+    from ...tracing import TRACE_LOG
+    ensure_index(ctx)
+    query.clear_index_cache()
+    query.active_index()
+    cache = query.RESULT_CACHE
+    cache.clear()
+    h0, m0, i0 = cache.hits, cache.misses, cache.invalidations
+    filters = [None, {"session": ["Session 0", "Session 1"]}]
+
+    clear_trace()
+    misses = []
+    for q in ctx.queries:
+        for f in filters:
+            t0 = time.perf_counter()
+            query.retrieve(q, include=f)
+            misses.append(time.perf_counter() - t0)
+    embeds_cold = sum(1 for e in TRACE_LOG if e.name == "embed")
+
+    clear_trace()
+    hits = []
+    for r in range(ctx.args.repeat * 3):
+        for q in ctx.queries:
+            for f in filters:
+                variant = ("  " + q.upper()) if r % 2 else q
+                f = {"session": ["Session 1", "Session 0"]} if f else None
+                t0 = time.perf_counter()
+                query.retrieve(variant, include=f)
+                hits.append(time.perf_counter() - t0)
+    embeds_warm = sum(1 for e in TRACE_LOG if e.name == "embed")
+
+    # A new snapshot invalidates everything cached for the old one
+    with contextlib.redirect_stdout(io.StringIO()):
+        index.main([])
+    query.refresh_index(wait=True)
+    query.retrieve(ctx.queries[0])
+    res = summarize(hits)
+    res.update({
+        "p50_us": round(percentile([s * 1e6 for s in hits], 50), 1),
+        "miss_p50_ms": summarize(misses)["p50_ms"],
+        "speedup_p50": round(percentile(misses, 50) / max(percentile(hits, 50), 1e-9), 1),
+        "hit_rate": round((cache.hits - h0) / max(1, cache.hits - h0 + cache.misses - m0), 4),
+        "embeds_cold": embeds_cold, "embeds_warm": embeds_warm,
+        "invalidated_on_publish": cache.invalidations - i0 == 1,
+        "snapshot": (snapshots.read_pointer(INDEX_ROOT) or {}).get("snapshot"),
+        **{f"cache_{k}": v for k, v in cache.stats().items() if k in ("entries", "evictions")},
+    })
+    return res
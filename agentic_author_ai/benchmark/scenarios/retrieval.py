@@ -0,0 +1,27 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+# -------------------------------
+# Benchmark: retrieval
+# -------------------------------
+
+"""
+retrieve() latency with the result cache disabled.
+
+Usage:
+    python -m agentic_author_ai.benchmark --scenarios retrieval
+"""
+
+from __future__ import annotations
+from typing import Any, Dict
+
+from ..common import BenchContext, ensure_index, no_result_cache, run_timed, scenario
+
+@scenario("retrieval")
+@no_result_cache()
+def bench_retrieval(ctx: BenchContext) -> Dict[str, Any]:
+    from ... import query
+    ensure_index(ctx)
+    return run_timed(lambda q: query.retrieve(q, k=query.TOP_K), ctx.queries * ctx.args.repeat)
@@ -0,0 +1,56 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+# -------------------------------
+# Benchmark: service
+# -------------------------------
+
+"""
+The warm server under concurrent /retrieve load, with and without the result cache.
+
+Usage:
+    python -m agentic_author_ai.benchmark --scenarios service
+"""
+
+from __future__ import annotations
+from typing import Any, Dict
+
+from ..common import BenchContext, ensure_index, no_result_cache, scenario
+
+@scenario("service")
+def bench_service(ctx: BenchContext) -> Dict[str, Any]:
+    """
+    Warm server with micro-batching under concurrent /retrieve load (result cache
+    off); cached_* repeats the load with the cache on, hit ratio read from /metrics.
+    """
+    import urllib.request
+    from ... import query
+    from ...loadtest import run_load
+    from ...server import AuthorService, start_server
+    ensure_index(ctx)
+    service = AuthorService(enable_author=False)
+    service.warm()
+    srv = start_server(service)
+    n = len(ctx.queries) * 10 * ctx.args.repeat
+    try:
+        with no_result_cache():
+            run_load(srv.base_url, "retrieve", ctx.queries, concurrency=16, requests=32)  # warm-up
+            load = run_load(srv.base_url, "retrieve", ctx.queries, concurrency=16, requests=n)
+        query.RESULT_CACHE.clear()
+        cached = run_load(srv.base_url, "retrieve", ctx.queries, concurrency=16, requests=n)
+        with urllib.request.urlopen(srv.base_url + "/metrics", timeout=10) as r:
+            metrics = dict(line.rsplit(" ", 1) for line in r.read().decode("utf-8").splitlines())
+    finally:
+        srv.shutdown()
+    batches = service.metrics.counters.get(("agentic_batches_total", ""), 0)
+    queries = service.metrics.counters.get(("agentic_batched_queries_total", ""), 0)
+    return {
+        "n": load["ok"], "errors": load["errors"] + load["rejected_503"] + cached["errors"],
+        "mean_ms": load["p50_ms"], "p50_ms": load["p50_ms"], "p95_ms": load["p95_ms"],
+        "p99_ms": load["p99_ms"], "max_ms": load["max_ms"],
+        "qps": load["qps"], "avg_batch_size": round(queries / batches, 2) if batches else 0.0,
+        "cached_p50_ms": cached["p50_ms"], "cached_qps": cached["qps"],
+        "cache_hit_ratio": float(metrics.get("agentic_retrieval_cache_hit_ratio", 0.0)),
+    }
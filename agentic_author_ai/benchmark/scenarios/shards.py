@@ -0,0 +1,68 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+# -------------------------------
+# Benchmark: shards
+# -------------------------------
+
+"""
+Session-filtered retrieval on the monolithic index vs per-session shards.
+
+Usage:
+    python -m agentic_author_ai.benchmark --scenarios shards
+"""
+
+from __future__ import annotations
+import contextlib
+import io
+import time
+from typing import Any, Dict
+
+from ..common import BenchContext, ensure_index, no_result_cache, run_timed, scenario
+
+@scenario("shards")
+@no_result_cache()
+def bench_shards(ctx: BenchContext) -> Dict[str, Any]:
+    """
+    Session-filtered retrieval on the monolithic index vs per-session shards: latency,
+    cold shard load, and resident index bytes for a one-session working set. Timed
+    samples are warm filtered queries on the shards; the monolithic index is rebuilt after.
+    """
+    from ... import index, query
+    ensure_index(ctx)
+    sessions = sorted({d["session"] for d in ctx.docs})
+    work = [(q, {"session": [sessions[0]]}) for q in ctx.queries] * ctx.args.repeat
+
+    query.clear_index_cache()
+    mono_index, mono_meta = query.get_index_meta()
+    mono_meta_path = query.current_snapshot().path(query.FAISS_METADATA.name)
+    mono_bytes = int(getattr(mono_index.index, "code_size", 0)) * mono_index.ntotal + mono_meta_path.stat().st_size
+    mono = run_timed(lambda w: query.retrieve(w[0], include=w[1]), work)
+
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            index.main(["--shard-by", "session"])
+        query.clear_index_cache()
+        sharded = query.get_sharded_index()
+        t0 = time.perf_counter()
+        query.retrieve(work[0][0], include=work[0][1])
+        cold_ms = (time.perf_counter() - t0) * 1000.0
+        res = run_timed(lambda w: query.retrieve(w[0], include=w[1]), work)
+        working_set = sharded.resident_bytes()
+        loaded = len(sharded.loaded())
+        scatter = run_timed(lambda q: query.retrieve(q), ctx.queries)
+        res.update({
+            "shards": len(sharded.values), "shards_loaded_filtered": loaded,
+            "cold_first_query_ms": round(cold_ms, 3),
+            "monolithic_p50_ms": mono["p50_ms"], "monolithic_p95_ms": mono["p95_ms"],
+            "monolithic_resident_bytes": mono_bytes, "working_set_bytes": working_set,
+            "scatter_gather_p50_ms": scatter["p50_ms"], "scatter_gather_p95_ms": scatter["p95_ms"],
+            "resident_bytes_all_shards": sharded.resident_bytes(),
+        })
+    finally:
+        with contextlib.redirect_stdout(io.StringIO()):
+            index.main([])
+        query.clear_index_cache()
+    return res
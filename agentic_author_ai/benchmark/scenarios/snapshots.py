@@ -0,0 +1,117 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+# -------------------------------
+# Benchmark: snapshots
+# -------------------------------
+
+"""
+Retrieval while index.py keeps publishing new snapshots.
+
+Usage:
+    python -m agentic_author_ai.benchmark --scenarios snapshots
+"""
+
+from __future__ import annotations
+import contextlib
+import io
+import json
+import random
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from ..common import BenchContext, chunk_records, ensure_index, no_result_cache, scenario, summarize
+
+@scenario("snapshots")
+@no_result_cache()
+def bench_snapshots(ctx: BenchContext) -> Dict[str, Any]:
+    """
+    Retrieval while index.py keeps publishing new snapshots: reader threads query
+    continuously and must never fail or see index/metadata from different builds.
+    Each rebuild shuffles the chunk order, so a mismatched pair would be detectable.
+    Timed samples are queries during re-indexing; swap lag is publish -> first
+    query served from the new snapshot.
+    """
+    import threading
+    from ... import index, query, snapshots
+    from ...rag_config import CHUNKS_JSON, INDEX_ROOT
+    ensure_index(ctx)
+    records = chunk_records(ctx.docs)
+    query.clear_index_cache()
+    query.active_index()
+    saved = (query.INDEX_POLL_S, index.INDEX_GC_GRACE_S)
+    query.INDEX_POLL_S, index.INDEX_GC_GRACE_S = 0.1, 0.0
+
+    stop = threading.Event()
+    lock = threading.Lock()
+    samples: List[float] = []
+    errors = [0, 0]                      # exceptions, inconsistent snapshots
+    served: Dict[str, int] = {}
+
+    def reader(i: int) -> None:
+        j = i
+        while not stop.is_set():
+            q = ctx.queries[j % len(ctx.queries)]
+            j += 1
+            t0 = time.perf_counter()
+            try:
+                active = query.active_index()
+                query.retrieve(q)
+                ok = active.index.ntotal == len(active.meta)
+            except Exception:
+                with lock:
+                    errors[0] += 1
+                continue
+            with lock:
+                samples.append(time.perf_counter() - t0)
+                errors[1] += 0 if ok else 1
+                served[active.snapshot] = served.get(active.snapshot, 0) + 1
+
+    def run_readers(seconds: float, rebuilds: int = 0) -> List[float]:
+        samples.clear()
+        served.clear()
+        threads = [threading.Thread(target=reader, args=(i,), daemon=True) for i in range(4)]
+        for t in threads:
+            t.start()
+        lags = []
+        t_end = time.perf_counter() + seconds
+        rng = random.Random(5)
+        for _ in range(rebuilds):
+            shuffled = records[:]
+            rng.shuffle(shuffled)
+            Path(CHUNKS_JSON).write_text(json.dumps(shuffled, ensure_ascii=False), encoding="utf-8")
+            with contextlib.redirect_stdout(io.StringIO()):
+                index.main([])
+            sid = snapshots.read_pointer(INDEX_ROOT)["snapshot"]
+            t_pub = time.perf_counter()
+            while query.active_index().snapshot != sid and time.perf_counter() - t_pub < 30:
+                time.sleep(0.005)
+            lags.append(time.perf_counter() - t_pub)
+        while time.perf_counter() < t_end:
+            time.sleep(0.05)
+        stop.set()
+        for t in threads:
+            t.join()
+        stop.clear()
+        return lags
+
+    try:
+        run_readers(2.0)
+        base = summarize(list(samples))
+        lags = run_readers(1.0, rebuilds=3 * ctx.args.repeat)
+        res = summarize(list(samples), errors[0])
+    finally:
+        query.INDEX_POLL_S, index.INDEX_GC_GRACE_S = saved
+        Path(CHUNKS_JSON).write_text(json.dumps(records, ensure_ascii=False), encoding="utf-8")
+    res.update({
+        "baseline_p50_ms": base["p50_ms"], "baseline_p95_ms": base["p95_ms"],
+        "publishes": len(lags), "snapshots_served": len(served),
+        "inconsistent": errors[1],
+        "swap_lag_mean_ms": round(sum(lags) / len(lags) * 1000.0, 1) if lags else 0.0,
+        "swap_lag_max_ms": round(max(lags) * 1000.0, 1) if lags else 0.0,
+        "snapshots_on_disk": len(snapshots.list_snapshots(INDEX_ROOT)),
+    })
+    return res
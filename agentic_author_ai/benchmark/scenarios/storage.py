@@ -0,0 +1,36 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+# -------------------------------
+# Benchmark: storage
+# -------------------------------
+
+"""
+Vector storage options (float32, float16, int8, truncated dims): memory, latency, recall@k.
+
+Usage:
+    python -m agentic_author_ai.benchmark --scenarios storage
+"""
+
+from __future__ import annotations
+from typing import Any, Dict
+
+from ..common import BenchContext, ensure_index, scenario, summarize
+
+@scenario("storage")
+def bench_storage(ctx: BenchContext) -> Dict[str, Any]:
+    """float32 vs float16 vs int8 vs truncated dims: memory, build time, latency, recall@k."""
+    import faiss
+    from ... import query
+    from ...vectors import storage_report
+    ensure_index(ctx)
+    flat = faiss.read_index(str(query.current_snapshot().path(query.FAISS_INDEX.name)))
+    X = flat.reconstruct_n(0, flat.ntotal)
+    Q = query.embed_queries(ctx.queries)
+    rows = storage_report(X, Q, k=query.TOP_K)
+    lat = [r["query_ms"] / 1000.0 for r in rows]
+    res = summarize(lat)
+    res["options"] = rows
+    return res
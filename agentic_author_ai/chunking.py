@@ -11,34 +11,46 @@
 Step 1: Extract, normalize, and chunk documents into JSON / JSONL.
 You already have chunks.json/chunks.jsonl; re-run this only when adding new docs.
 
+PDF text comes from the fastest installed backend (extractors.py), page-parallel
+for long documents, and is cached per file hash so re-chunking skips parsing.
+DOCX files are streamed (iterparse) into the chunker paragraph by paragraph.
+
 Usage:
     python -m chunking --in ks-*.pdf ks-*.docx --out data/chunks.json --jsonl
+    python -m chunking --in report.pdf --pdf-backend pdfium --workers 8
 """
 
 import argparse, json, re, uuid, zipfile
 from pathlib import Path
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 
-from .rag_config import DATA_DIR, CHUNKS_JSON, CHUNKS_JSONL
-
-# Optional dependencies
-try:
-    import PyPDF2
-    HAVE_PYPDF2 = True
-except Exception:
-    HAVE_PYPDF2 = False
+from .rag_config import (
+    DATA_DIR, CHUNKS_JSON, CHUNKS_JSONL, EXTRACT_CACHE_DIR, PDF_BACKEND, EXTRACT_WORKERS,
+    PDF_PARALLEL_MIN_PAGES, DOCX_BACKEND, INDEX_ROOT, INDEX_MANIFEST
+)
+from .dedup import dedup_chunks, vector_bytes
+from . import snapshots
+from .extractors import extract_pdf_pages, iter_docx_blocks
 
+# Optional dependencies (PDF backends are handled in extractors.py)
 try:
     import docx  # python-docx
     HAVE_DOCX = True
 except Exception:
     HAVE_DOCX = False
 
+_SPACES = re.compile(r"[ \t]+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
 def clean_text(s: str) -> str:
     s = s.replace("\u00A0", " ")
-    s = re.sub(r"[ \t]+", " ", s)
-    s = re.sub(r"\r", "\n", s)
-    s = re.sub(r"\n{3,}", "\n\n", s)
+    # Most paragraphs need none of the rewrites below (called once per DOCX block)
+    if "  " in s or "\t" in s:
+        s = _SPACES.sub(" ", s)
+    if "\r" in s:
+        s = s.replace("\r", "\n")
+    if "\n\n\n" in s:
+        s = _BLANK_LINES.sub("\n\n", s)
     return s.strip()
 
 def chunk_words(text: str, target_words: int = 800, overlap_words: int = 100) -> List[str]:
@@ -54,31 +66,49 @@ def chunk_words(text: str, target_words: int = 800, overlap_words: int = 100) ->
         i = max(j - overlap_words, i + 1)
     return chunks
 
+def chunk_word_stream(blocks: Iterable[str], target_words: int = 800,
+                      overlap_words: int = 100) -> Iterator[str]:
+    """chunk_words("\\n\\n".join(blocks)) without building the text: holds at most one chunk of words."""
+    buf: List[str] = []
+    step = max(target_words - overlap_words, 1)
+    for block in blocks:
+        buf.extend(re.findall(r"\S+", block))
+        while len(buf) > target_words:
+            yield " ".join(buf[:target_words])
+            del buf[:step]
+    if buf:
+        yield " ".join(buf)
+
 def infer_session_from_filename(name: str) -> str:
     stem = Path(name).stem
     if stem.startswith("ks-"):
         stem = stem[3:]
     return stem.replace("-", " ").title()
 
-def extract_pdf(path: Path, max_pages: int | None = None) -> List[Tuple[int, str]]:
-    pages = []
-    if HAVE_PYPDF2:
-        with open(path, "rb") as f:
-            reader = PyPDF2.PdfReader(f)
-            total = len(reader.pages)
-            lim = min(total, max_pages) if max_pages else total
-            for i in range(lim):
-                t = (reader.pages[i].extract_text() or "")
-                pages.append((i + 1, clean_text(t)))
-    else:
-        # best-effort fallback: read bytes and try a naive decode
-        t = path.read_bytes().decode("latin-1", errors="ignore")
-        pages = [(1, clean_text(t[:8000]))]
-    return pages
-
-def extract_docx(path: Path) -> List[str]:
+def extract_pdf(path: Path, max_pages: int | None = None, backend: str = PDF_BACKEND,
+                workers: int = EXTRACT_WORKERS,
+                cache_dir: Optional[Path] = EXTRACT_CACHE_DIR) -> List[Tuple[int, str]]:
+    # Raw page text comes from the extraction cache when this file was seen before;
+    # cache_dir=None always re-parses.
+    texts = extract_pdf_pages(path, max_pages=max_pages, backend=backend, workers=workers,
+                              parallel_min_pages=PDF_PARALLEL_MIN_PAGES, cache_dir=cache_dir)
+    return [(i + 1, clean_text(t)) for i, t in enumerate(texts)]
+
+def iter_docx(path: Path, backend: str = DOCX_BACKEND) -> Iterator[str]:
+    """Cleaned, non-empty blocks: "stream" (iterparse, constant memory) or the older full-tree readers."""
+    if backend != "stream":
+        yield from extract_docx(path, backend)
+        return
+    for block in iter_docx_blocks(path):
+        txt = clean_text(block)
+        if txt:
+            yield txt
+
+def extract_docx(path: Path, backend: str = DOCX_BACKEND) -> List[str]:
+    if backend == "stream":
+        return list(iter_docx(path, backend))
     blocks: List[str] = []
-    if HAVE_DOCX:
+    if HAVE_DOCX and backend != "regex":
         d = docx.Document(str(path))
         for p in d.paragraphs:
             txt = clean_text(p.text)
@@ -101,8 +131,8 @@ def extract_docx(path: Path) -> List[str]:
                 blocks.append(line)
     return blocks
 
-def make_chunks_for_pdf(path: Path) -> List[Dict[str, Any]]:
-    pages = extract_pdf(path)
+def make_chunks_for_pdf(path: Path, **extract_kwargs: Any) -> List[Dict[str, Any]]:
+    pages = extract_pdf(path, **extract_kwargs)
     text = "\n\n".join(f"[Page {p}]\n{t}" for p, t in pages if t)
     out = []
     for ch in chunk_words(text):
@@ -121,11 +151,9 @@ def make_chunks_for_pdf(path: Path) -> List[Dict[str, Any]]:
         })
     return out
 
-def make_chunks_for_docx(path: Path) -> List[Dict[str, Any]]:
-    blocks = extract_docx(path)
-    text = "\n\n".join(blocks)
+def make_chunks_for_docx(path: Path, backend: str = DOCX_BACKEND) -> List[Dict[str, Any]]:
     out = []
-    for ch in chunk_words(text):
+    for ch in chunk_word_stream(iter_docx(path, backend)):
         out.append({
             "id": str(uuid.uuid4()),
             "text": ch,
@@ -144,7 +172,15 @@ def main():
     ap.add_argument("--in", dest="inputs", nargs="+", required=True, help="Input files (pdf/docx)")
     ap.add_argument("--out", default=str(CHUNKS_JSON), help="Output JSON path (array)")
     ap.add_argument("--jsonl", action="store_true", help="Also write JSONL alongside JSON")
+    ap.add_argument("--dedup", action="store_true", help="Collapse near-duplicate chunks (MinHash/LSH)")
+    ap.add_argument("--dedup-threshold", type=float, default=0.8, help="Estimated Jaccard for --dedup")
+    ap.add_argument("--pdf-backend", default=PDF_BACKEND, help="auto | pdfium | pypdf | pypdf2 | pdfminer | raw")
+    ap.add_argument("--workers", type=int, default=EXTRACT_WORKERS, help="Processes for page-parallel PDF extraction")
+    ap.add_argument("--no-extract-cache", action="store_true", help="Re-parse PDFs instead of using cached page text")
+    ap.add_argument("--docx-backend", default=DOCX_BACKEND, help="stream | python-docx | regex")
     args = ap.parse_args()
+    pdf_kwargs = {"backend": args.pdf_backend, "workers": args.workers,
+                  "cache_dir": None if args.no_extract_cache else EXTRACT_CACHE_DIR}
 
     files = [Path(p) for p in args.inputs]
     chunks: List[Dict[str, Any]] = []
@@ -153,12 +189,21 @@ def main():
             print(f"Skip missing: {p}")
             continue
         if p.suffix.lower() == ".pdf":
-            chunks.extend(make_chunks_for_pdf(p))
+            chunks.extend(make_chunks_for_pdf(p, **pdf_kwargs))
         elif p.suffix.lower() == ".docx":
-            chunks.extend(make_chunks_for_docx(p))
+            chunks.extend(make_chunks_for_docx(p, backend=args.docx_backend))
         else:
             print(f"Skip unsupported: {p}")
 
+    if args.dedup:
+        chunks, stats = dedup_chunks(chunks, threshold=args.dedup_threshold)
+        # Nothing is embedded yet: size the saving by the published index, if there is one
+        manifest_path = snapshots.current(INDEX_ROOT, legacy_dir=DATA_DIR).path(INDEX_MANIFEST.name)
+        if manifest_path.exists():
+            manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+            stats.bytes_per_vector = vector_bytes(manifest.get("dim", 0), manifest.get("storage", "float32"))
+        print(stats.report())
+
     out_json = Path(args.out)
     out_json.parent.mkdir(parents=True, exist_ok=True)
     out_json.write_text(json.dumps(chunks, ensure_ascii=False, indent=2), encoding="utf-8")
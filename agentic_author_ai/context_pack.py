@@ -0,0 +1,236 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+# -------------------------------
+# Context Packing
+# -------------------------------
+
+"""
+Token-budgeted context packing (extractive compression) for prompts.
+
+Instead of pasting whole chunks and cutting at a character limit, the context is
+rebuilt from the sentences that matter most for the query:
+
+  1. Chunks with the same citation label whose word windows overlap (chunking.py
+     overlaps consecutive windows by 100 words) are merged, so shared text is
+     only considered once.
+  2. Windows are split into sentences; each sentence is scored against the query
+     with BM25 (plus a small prior for higher-ranked chunks).
+  3. The best sentences are kept until the token budget is spent, then written
+     back in their original order under their original citation label, with
+     " … " marking skipped text.
+
+Usage:
+    from .context_pack import pack_blocks, render_blocks, blocks_from_chunks
+    blocks, stats = pack_blocks(query, blocks_from_chunks(chunks), max_tokens=CONTEXT_TOKENS)
+    ctx = render_blocks(blocks)
+"""
+
+from __future__ import annotations
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .tokens import estimate_tokens
+
+_WORD = re.compile(r"\w+")
+_SENT_SPLIT = re.compile(r"(?<=[.!?])[\"')\]]*\s+|\n\s*\n")
+
+# Very common words carry no signal for sentence selection
+STOPWORDS = frozenset("""
+a an and are as at be but by for from has have how in is it its of on or that the this to was
+were what when where which who why will with about into than then there these those their our
+your you we they he she them do does did not no so if can could should would may might also
+""".split())
+
+MAX_SENTENCE_WORDS = 60     # PDF text often lacks punctuation; longer runs are cut into pieces
+MIN_OVERLAP_WORDS = 8       # shortest shared run that counts as overlapping windows
+
+def terms(text: str) -> List[str]:
+    return [w for w in (t.lower() for t in _WORD.findall(text)) if w not in STOPWORDS]
+
+def split_sentences(text: str, max_words: int = MAX_SENTENCE_WORDS) -> List[str]:
+    out: List[str] = []
+    for s in _SENT_SPLIT.split(text or ""):
+        words = s.split()
+        for i in range(0, len(words), max_words):
+            piece = " ".join(words[i:i + max_words])
+            if piece:
+                out.append(piece)
+    return out
+
+def bm25_scores(query: str, passages: Sequence[str], k1: float = 1.2, b: float = 0.75) -> List[float]:
+    """BM25 of each passage for the query, with IDF computed over the passages themselves."""
+    q = set(terms(query))
+    if not q or not passages:
+        return [0.0] * len(passages)
+    docs = [Counter(terms(p)) for p in passages]
+    n = len(docs)
+    avgdl = sum(sum(d.values()) for d in docs) / n or 1.0
+    df = Counter(t for d in docs for t in q if t in d)
+    idf = {t: math.log(1.0 + (n - df[t] + 0.5) / (df[t] + 0.5)) for t in q}
+    scores = []
+    for d in docs:
+        dl = sum(d.values())
+        s = 0.0
+        for t in q:
+            tf = d.get(t, 0)
+            if tf:
+                s += idf[t] * tf * (k1 + 1) / (tf + k1 * (1 - b + b * dl / avgdl))
+        scores.append(s)
+    return scores
+
+
+@dataclass
+class Block:
+    """A citable piece of context: the label line(s) are emitted verbatim above the text."""
+    label: str
+    text: str
+    kind: str = "rag"               # "rag" | "web"; callers render kinds into separate sections
+    rank: int = 0                   # retrieval order (lower = better)
+    sentences: List[str] = field(default_factory=list)   # filled by pack_blocks (kept sentences)
+    gaps: List[bool] = field(default_factory=list)       # gaps[i]: text was skipped before sentences[i]
+    truncated: bool = False                              # text was skipped after the last kept sentence
+
+@dataclass
+class PackStats:
+    tokens_in: int = 0
+    tokens_out: int = 0
+    blocks_in: int = 0
+    blocks_out: int = 0
+    merged: int = 0
+    sentences_in: int = 0
+    sentences_out: int = 0
+
+    @property
+    def reduction(self) -> float:
+        return 1.0 - self.tokens_out / self.tokens_in if self.tokens_in else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "tokens_in": self.tokens_in, "tokens_out": self.tokens_out,
+            "reduction": round(self.reduction, 4), "blocks_in": self.blocks_in,
+            "blocks_out": self.blocks_out, "merged": self.merged,
+            "sentences_in": self.sentences_in, "sentences_out": self.sentences_out,
+        }
+
+
+def citation_label(meta: Dict[str, Any]) -> str:
+    """[source:pp.start-end §section] label used in prompts and citations."""
+    label = meta.get("source") or meta.get("session") or "source"
+    pstart, pend = meta.get("page_start"), meta.get("page_end")
+    if pstart and pend:
+        label += f":pp.{pstart}-{pend}"
+    section = meta.get("section")
+    if section:
+        label += f" §{section}"
+    return label
+
+def blocks_from_chunks(chunks: Iterable[Dict[str, Any]], kind: str = "rag") -> List[Block]:
+    blocks = []
+    for i, c in enumerate(chunks):
+        text = (c.get("content") or c.get("text") or "").strip()
+        if text:
+            blocks.append(Block(label=f"[{citation_label(c.get('meta', {}))}]", text=text, kind=kind, rank=i))
+    return blocks
+
+def _join_overlap(a: List[str], b: List[str]) -> Optional[List[str]]:
+    """a followed by b if a's tail equals b's head (at least MIN_OVERLAP_WORDS words), else None."""
+    if len(a) < MIN_OVERLAP_WORDS or len(b) < MIN_OVERLAP_WORDS:
+        return None
+    head = b[:MIN_OVERLAP_WORDS]
+    start = max(0, len(a) - len(b))
+    for i in range(start, len(a) - MIN_OVERLAP_WORDS + 1):
+        if a[i:i + MIN_OVERLAP_WORDS] == head and a[i:] == b[: len(a) - i]:
+            return a + b[len(a) - i:]
+    return None
+
+def merge_overlapping(blocks: List[Block]) -> Tuple[List[Block], int]:
+    """Merge same-label blocks whose word windows overlap; returns (blocks, merges)."""
+    out: List[Block] = []
+    merges = 0
+    for blk in blocks:
+        words = blk.text.split()
+        for prev in out:
+            if prev.label != blk.label or prev.kind != blk.kind:
+                continue
+            pw = prev.text.split()
+            joined = _join_overlap(pw, words) or _join_overlap(words, pw)
+            if joined is None and " ".join(words) in prev.text:
+                joined = pw
+            if joined is not None:
+                prev.text = " ".join(joined)
+                prev.rank = min(prev.rank, blk.rank)
+                merges += 1
+                break
+        else:
+            out.append(Block(label=blk.label, text=blk.text, kind=blk.kind, rank=blk.rank))
+    return out, merges
+
+def pack_blocks(query: str, blocks: List[Block], max_tokens: int,
+                rank_prior: float = 0.1) -> Tuple[List[Block], PackStats]:
+    """
+    Keep the highest-scoring sentences of `blocks` within max_tokens (label lines
+    included). Returned blocks keep input order; blocks with nothing kept are dropped.
+    """
+    stats = PackStats(blocks_in=len(blocks))
+    stats.tokens_in = sum(estimate_tokens(b.label) + estimate_tokens(b.text) for b in blocks)
+    merged, stats.merged = merge_overlapping(blocks)
+
+    sents: List[Tuple[int, int, str]] = []      # (block, position, sentence)
+    n_sents: List[int] = []
+    seen = set()
+    for bi, blk in enumerate(merged):
+        split = split_sentences(blk.text)
+        n_sents.append(len(split))
+        for si, s in enumerate(split):
+            key = " ".join(terms(s)) or s
+            if key in seen:
+                continue
+            seen.add(key)
+            sents.append((bi, si, s))
+    stats.sentences_in = len(sents)
+
+    scores = bm25_scores(query, [s for _, _, s in sents])
+    top = max(scores, default=0.0) or 1.0
+    ranked = sorted(range(len(sents)), key=lambda j: -(scores[j] / top + rank_prior / (1 + merged[sents[j][0]].rank)))
+
+    budget = max_tokens
+    kept: Dict[int, List[Tuple[int, str]]] = {}
+    for j in ranked:
+        bi, si, s = sents[j]
+        cost = estimate_tokens(s) + (0 if bi in kept else estimate_tokens(merged[bi].label) + 1)
+        if cost > budget:
+            continue
+        budget -= cost
+        kept.setdefault(bi, []).append((si, s))
+        if budget < 8:
+            break
+
+    out: List[Block] = []
+    for bi, blk in enumerate(merged):
+        if bi not in kept:
+            continue
+        picked = sorted(kept[bi])
+        blk.sentences = [s for _, s in picked]
+        blk.gaps = [(si != prev + 1) for (si, _), prev in zip(picked, [-1] + [p for p, _ in picked[:-1]])]
+        blk.truncated = picked[-1][0] != n_sents[bi] - 1
+        out.append(blk)
+        stats.sentences_out += len(picked)
+    stats.blocks_out = len(out)
+    stats.tokens_out = sum(estimate_tokens(b.label) + estimate_tokens(" ".join(b.sentences)) for b in out)
+    return out, stats
+
+def block_text(blk: Block) -> str:
+    """Kept sentences in order, with " … " wherever text was skipped."""
+    if not blk.sentences:
+        return blk.text
+    text = " ".join(("… " if gap else "") + s for s, gap in zip(blk.sentences, blk.gaps))
+    return text + (" …" if blk.truncated else "")
+
+def render_blocks(blocks: List[Block], sep: str = "\n\n---\n\n") -> str:
+    return sep.join(f"{b.label}\n{block_text(b)}" for b in blocks)
@@ -0,0 +1,163 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+# -------------------------------
+# Deadline Scheduler
+# -------------------------------
+
+"""
+End-to-end latency budget for one pipeline run (demo.py --deadline).
+
+A Deadline hands each stage its time budget: what is left of the run minus a
+reserve for the required stages still to come (retrieve, author), estimated
+from recent runs by a LatencyModel (p90 of the last observations per stage,
+STAGE_ESTIMATES_S in rag_config.py until there are enough; stages that timed out
+count with the time they ran). The pipeline asks fits(stage) before optional
+work and sheds it when the run is behind, and passes timeout(stage) to model
+calls so one slow call can't eat the budget.
+Every shed step is recorded as a Degradation and returned with the result.
+
+Without a budget (budget_s=None) nothing is ever shed and timeouts are None,
+so the pipeline behaves exactly as before.
+
+Usage:
+    dl = Deadline(20.0)
+    if dl.fits("editor"):
+        with dl.stage("editor"):
+            text = edit_text(draft, timeout=dl.timeout("editor"))
+    else:
+        dl.degrade("editor", "skipped")
+    dl.report()   # {"budget_s", "elapsed_s", "met", "degradations", "stages"}
+"""
+
+from __future__ import annotations
+import contextlib
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Sequence
+
+from .rag_config import MIN_CALL_TIMEOUT_S, STAGE_ESTIMATES_S
+from .tracing import current_span, percentile
+
+STAGES = ("planner", "retrieve", "research", "author", "editor")
+REQUIRED = ("retrieve", "author")   # never shed; optional stages are
+
+class LatencyModel:
+    """Per-stage latency estimate: p90 of the last `window` runs, the prior until min_samples."""
+
+    def __init__(self, priors: Optional[Dict[str, float]] = None, window: int = 50,
+                 min_samples: int = 5, quantile: float = 90.0):
+        self.priors = dict(STAGE_ESTIMATES_S if priors is None else priors)
+        self.window = window
+        self.min_samples = min_samples
+        self.quantile = quantile
+        self._obs: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self._obs.setdefault(stage, deque(maxlen=self.window)).append(seconds)
+
+    def estimate(self, stage: str) -> float:
+        with self._lock:
+            obs = list(self._obs.get(stage, ()))
+        if len(obs) < self.min_samples:
+            return self.priors.get(stage, 0.0)
+        return percentile(obs, self.quantile)
+
+LATENCY = LatencyModel()
+
+@dataclass
+class Degradation:
+    stage: str
+    action: str        # "skipped" | "truncated" | "timeout" | "capped" ...
+    detail: str = ""
+    at_s: float = 0.0  # elapsed time when it was applied
+
+def timed_client(client: Any, timeout: Optional[float]) -> Any:
+    """An OpenAI client for one call under a deadline: per-call timeout, no retries (None: client as is)."""
+    return client if timeout is None else client.with_options(timeout=timeout, max_retries=0)
+
+class Deadline:
+    """Time budget for one run; see the module docstring."""
+
+    def __init__(self, budget_s: Optional[float] = None, model: LatencyModel = LATENCY,
+                 clock: Callable[[], float] = time.monotonic):
+        self.budget_s = budget_s if budget_s and budget_s > 0 else None
+        self.model = model
+        self.clock = clock
+        self.start = clock()
+        self.degradations: List[Degradation] = []
+        self.stages: Dict[str, float] = {}
+
+    @property
+    def unlimited(self) -> bool:
+        return self.budget_s is None
+
+    def elapsed(self) -> float:
+        return self.clock() - self.start
+
+    def remaining(self) -> float:
+        return float("inf") if self.budget_s is None else self.budget_s - self.elapsed()
+
+    def estimate(self, stage: str) -> float:
+        return self.model.estimate(stage)
+
+    def reserve(self, stage: str, after: Sequence[str] = ()) -> float:
+        """Estimated time of the required stages after `stage`, plus the stages in `after`."""
+        later = STAGES[STAGES.index(stage) + 1:] if stage in STAGES else ()
+        return sum(self.estimate(s) for s in later if s in REQUIRED) + sum(self.estimate(s) for s in after)
+
+    def slack(self, stage: str, after: Sequence[str] = ()) -> float:
+        """
+        Time `stage` may take without putting the required stages after it at risk.
+        `after` reserves time for more stages that still have to run first, e.g. the
+        planner and retrieve when research is started speculatively before them.
+        """
+        return self.remaining() - self.reserve(stage, after)
+
+    def fits(self, stage: str, fraction: float = 1.0) -> bool:
+        """True if `fraction` of the stage's estimated latency fits in its slack."""
+        return self.unlimited or self.slack(stage) >= fraction * self.estimate(stage)
+
+    def timeout(self, stage: str) -> Optional[float]:
+        """Timeout for the stage's model call (None without a budget)."""
+        if self.unlimited:
+            return None
+        return max(MIN_CALL_TIMEOUT_S, self.slack(stage))
+
+    def degrade(self, stage: str, action: str, detail: str = "") -> None:
+        d = Degradation(stage, action, detail, round(self.elapsed(), 3))
+        self.degradations.append(d)
+        span = current_span()
+        if span is not None:
+            span.set(degraded=f"{stage}:{action}")
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator["Deadline"]:
+        """
+        Time a stage and feed the latency model. A stage degraded while running (timed
+        out, cut short) is recorded too, as the time it ran: a lower bound of its real
+        latency (censored), but leaving it out would keep slow calls out of the p90.
+        """
+        t0 = self.clock()
+        try:
+            yield self
+        finally:
+            dur = self.clock() - t0
+            self.stages[name] = round(dur, 4)
+            self.model.observe(name, dur)
+
+    def report(self) -> Dict[str, Any]:
+        elapsed = self.elapsed()
+        return {
+            "budget_s": self.budget_s,
+            "elapsed_s": round(elapsed, 4),
+            "met": self.budget_s is None or elapsed <= self.budget_s,
+            "degradations": [asdict(d) for d in self.degradations],
+            "stages": dict(self.stages),
+        }
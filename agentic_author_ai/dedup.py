@@ -0,0 +1,333 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+# -------------------------------
+# Near-duplicate Detection
+# -------------------------------
+
+"""
+MinHash + LSH near-duplicate detection for chunks (numpy only).
+
+Each chunk is reduced to a MinHash signature of its word 5-shingles; signatures
+are split into LSH bands so likely duplicates land in the same bucket, and
+candidates are confirmed by estimated Jaccard similarity. A duplicate is
+collapsed into the first chunk seen (its representative), which records the
+duplicate's source/session/pages under meta["provenance"] so filters and
+citations still see every source.
+
+Memory is bounded: the index keeps only ids and signatures (plus band keys) of
+at most `max_reps` representatives; beyond that the oldest are evicted, so very
+large corpora are deduped within a sliding window of recent unique chunks.
+iter_dedup() passes chunks straight through and dedup_file() streams them to
+disk, so besides the window only the provenance of actual duplicates is held.
+
+Usage (also wired into chunking.py / index.py via --dedup):
+    python -m agentic_author_ai.dedup --in data/chunks.json --out data/chunks.dedup.json
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import re
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .tokens import estimate_tokens
+
+_WORD = re.compile(r"\w+")
+
+# Provenance fields copied from a collapsed duplicate's meta
+PROVENANCE_KEYS = ("source", "session", "type", "page_start", "page_end", "section", "speaker")
+
+# text-embedding-3-large list price per 1M input tokens (USD), for savings estimates
+EMBED_PRICE_PER_M = 0.13
+
+STORAGE_BYTES = {"float32": 4, "float16": 2, "int8": 1}   # per vector component (vectors.py storage types)
+
+def vector_bytes(dim: int, storage: str = "float32") -> int:
+    """Index bytes per vector for an embedding width and storage type."""
+    return int(dim) * STORAGE_BYTES.get(storage, 4)
+
+# Odd 64-bit multipliers used to combine word hashes into shingle hashes
+_SHINGLE_MIX = np.array([0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9,
+                         0xD6E8FEB86659FD93, 0xFF51AFD7ED558CCD, 0xC4CEB9FE1A85EC53,
+                         0x94D049BB133111EB, 0xBF58476D1CE4E5B9], dtype=np.uint64)
+
+def _shingle_hashes(text: str, k: int) -> np.ndarray:
+    """Unique 32-bit hashes of word k-shingles (word hashes mixed in numpy, no string joins)."""
+    words = _WORD.findall(text.lower())
+    if not words:
+        return np.zeros(1, dtype=np.uint64)
+    wh = np.fromiter((zlib.crc32(w.encode("utf-8")) for w in words), dtype=np.uint64, count=len(words))
+    k = max(1, min(k, len(words), len(_SHINGLE_MIX)))
+    n = len(words) - k + 1
+    acc = np.zeros(n, dtype=np.uint64)
+    with np.errstate(over="ignore"):  # wrap-around multiplication is intended
+        for j in range(k):
+            acc ^= wh[j:j + n] * _SHINGLE_MIX[j]
+    return np.unique(acc >> np.uint64(32))
+
+def _pick_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """(bands, rows) with bands*rows == num_perm whose S-curve midpoint is closest to threshold."""
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        if abs((1.0 / bands) ** (1.0 / rows) - threshold) < abs((1.0 / best[0]) ** (1.0 / best[1]) - threshold):
+            best = (bands, rows)
+    return best
+
+
+@dataclass
+class DedupStats:
+    chunks_in: int = 0
+    chunks_out: int = 0
+    duplicates: int = 0
+    tokens_saved: int = 0
+    meta_bytes_saved: int = 0
+    evicted: int = 0
+    groups: int = 0               # representatives that absorbed at least one duplicate
+    bytes_per_vector: int = 0     # index bytes per vector, once the embedding width is known (vector_bytes)
+
+    @property
+    def embed_cost_saved(self) -> float:
+        return self.tokens_saved / 1e6 * EMBED_PRICE_PER_M
+
+    @property
+    def index_bytes_saved(self) -> int:
+        return self.duplicates * self.bytes_per_vector
+
+    def report(self) -> str:
+        pct = (self.duplicates / self.chunks_in * 100.0) if self.chunks_in else 0.0
+        return (
+            f"Dedup: {self.chunks_in} chunks in → {self.chunks_out} kept, {self.duplicates} near-duplicates "
+            f"collapsed ({pct:.1f}%) into {self.groups} groups\n"
+            f"  embedding spend saved: ~{self.tokens_saved:,} tokens (~${self.embed_cost_saved:.4f})\n"
+            + (f"  index size saved: ~{self.index_bytes_saved / 1e6:.2f} MB vectors + "
+               if self.bytes_per_vector else "  index size saved: ")
+            + f"{self.meta_bytes_saved / 1e6:.2f} MB metadata"
+            + (f"\n  (window full: {self.evicted} representatives evicted)" if self.evicted else "")
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "chunks_in": self.chunks_in, "chunks_out": self.chunks_out, "duplicates": self.duplicates,
+            "groups": self.groups, "tokens_saved": self.tokens_saved,
+            "embed_cost_saved_usd": round(self.embed_cost_saved, 6),
+            "index_bytes_saved": self.index_bytes_saved, "meta_bytes_saved": self.meta_bytes_saved,
+            "evicted": self.evicted,
+        }
+
+
+class NearDuplicateIndex:
+    """Streaming MinHash/LSH index over chunk texts."""
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 128, shingle: int = 5,
+                 max_reps: int = 1_000_000, seed: int = 1):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle = shingle
+        self.max_reps = max_reps
+        self.bands, self.rows = _pick_bands(num_perm, threshold)
+        rng = np.random.default_rng(seed)
+        # Multiply-shift hash family: odd 64-bit a, any b, keep the high 32 bits.
+        self._a = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._b = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+        # Per band: bucket key -> id of the representative in it, or a list once several share it
+        self._tables: List[Dict[int, Union[str, List[str]]]] = [dict() for _ in range(self.bands)]
+        self._sigs: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self.evicted = 0
+
+    def signature(self, text: str) -> np.ndarray:
+        h = _shingle_hashes(text, self.shingle)
+        with np.errstate(over="ignore"):  # mod-2^64 arithmetic is the point
+            perm = (self._a[:, None] * h[None, :] + self._b[:, None]) >> np.uint64(32)
+        return perm.min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, sig: np.ndarray) -> List[int]:
+        r = self.rows
+        return [hash(sig[i * r:(i + 1) * r].tobytes()) for i in range(self.bands)]
+
+    def query(self, sig: np.ndarray) -> Optional[str]:
+        """Id of an indexed representative with estimated Jaccard >= threshold, if any."""
+        seen = set()
+        for table, key in zip(self._tables, self._band_keys(sig)):
+            bucket = table.get(key)
+            for rep in ((bucket,) if isinstance(bucket, str) else bucket or ()):
+                if rep in seen:
+                    continue
+                seen.add(rep)
+                if float(np.mean(self._sigs[rep] == sig)) >= self.threshold:
+                    return rep
+        return None
+
+    def insert(self, rep_id: str, sig: np.ndarray) -> None:
+        self._sigs[rep_id] = sig
+        for table, key in zip(self._tables, self._band_keys(sig)):
+            bucket = table.get(key)
+            if bucket is None:
+                table[key] = rep_id
+            elif isinstance(bucket, str):
+                table[key] = [bucket, rep_id]
+            else:
+                bucket.append(rep_id)
+        while len(self._sigs) > self.max_reps:
+            old_id, old_sig = self._sigs.popitem(last=False)
+            for table, key in zip(self._tables, self._band_keys(old_sig)):
+                bucket = table.get(key)
+                if bucket == old_id:
+                    del table[key]
+                elif isinstance(bucket, list) and old_id in bucket:
+                    bucket.remove(old_id)   # oldest first, so normally bucket[0]
+                    if len(bucket) == 1:
+                        table[key] = bucket[0]
+            self.evicted += 1
+
+    def __len__(self) -> int:
+        return len(self._sigs)
+
+    def __contains__(self, rep_id: object) -> bool:
+        return rep_id in self._sigs
+
+
+def _provenance(chunk: Dict[str, Any]) -> Dict[str, Any]:
+    m = chunk.get("meta", {})
+    out = {"id": chunk.get("id")}
+    out.update({k: m.get(k) for k in PROVENANCE_KEYS if m.get(k) is not None})
+    return out
+
+def iter_dedup(chunks: Iterable[Dict[str, Any]], stats: Optional[DedupStats] = None,
+               index: Optional[NearDuplicateIndex] = None,
+               **kwargs: Any) -> Iterator[Tuple[Dict[str, Any], Optional[str]]]:
+    """
+    Yield (chunk, rep_id) for every chunk, in input order: rep_id is None for a
+    representative and the id of the representative it duplicates otherwise.
+    Only ids and signatures are kept; callers fold duplicates into provenance
+    (dedup_chunks in memory, dedup_file on disk).
+    """
+    stats = stats if stats is not None else DedupStats()
+    index = index or NearDuplicateIndex(**kwargs)
+    grouped = set()
+    for c in chunks:
+        stats.chunks_in += 1
+        sig = index.signature(c.get("text", ""))
+        rep_id = index.query(sig)
+        if rep_id is not None:
+            if rep_id not in grouped:
+                grouped.add(rep_id)
+                stats.groups += 1
+            stats.duplicates += 1
+            stats.tokens_saved += estimate_tokens(c.get("text", ""))
+            stats.meta_bytes_saved += len(json.dumps(c, ensure_ascii=False).encode("utf-8"))
+            yield c, rep_id
+            continue
+        index.insert(str(c.get("id") or stats.chunks_in), sig)
+        if len(grouped) > index.max_reps:   # as bounded as the LSH window
+            grouped = {r for r in grouped if r in index}
+        stats.chunks_out += 1
+        yield c, None
+    stats.evicted = index.evicted
+
+def _chunk_id(c: Dict[str, Any], n: int) -> str:
+    return str(c.get("id") or n)
+
+def dedup_chunks(chunks: Iterable[Dict[str, Any]], threshold: float = 0.8,
+                 **kwargs: Any) -> Tuple[List[Dict[str, Any]], DedupStats]:
+    """In-memory dedup for callers that already hold the chunk list (chunking.py, index.py)."""
+    stats = DedupStats()
+    kept: List[Dict[str, Any]] = []
+    by_id: Dict[str, Dict[str, Any]] = {}
+    for c, rep_id in iter_dedup(chunks, stats=stats, threshold=threshold, **kwargs):
+        if rep_id is None:
+            kept.append(c)
+            by_id[_chunk_id(c, stats.chunks_in)] = c
+        else:
+            by_id[rep_id].setdefault("meta", {}).setdefault("provenance", []).append(_provenance(c))
+    return kept, stats
+
+def _iter_chunks(path: Path) -> Iterator[Dict[str, Any]]:
+    """Chunks from a .jsonl file, or a JSON array read one element at a time."""
+    with open(path, "r", encoding="utf-8") as f:
+        if path.suffix == ".jsonl":
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+            return
+        dec, buf, pos = json.JSONDecoder(), f.read(1 << 16), 0
+        pos = buf.index("[") + 1
+        while True:
+            while True:
+                while pos < len(buf) and buf[pos] in " \t\r\n,":
+                    pos += 1
+                if pos < len(buf) and buf[pos] == "]":
+                    return
+                try:
+                    obj, end = dec.raw_decode(buf, pos)
+                    break
+                except json.JSONDecodeError:
+                    more = f.read(1 << 16)
+                    if not more:
+                        raise
+                    buf, pos = buf[pos:] + more, 0
+            yield obj
+            buf, pos = buf[end:], 0
+
+def dedup_file(inp: Path, out: Path, threshold: float = 0.8, **kwargs: Any) -> DedupStats:
+    """
+    Stream chunks from inp to out (.json array or .jsonl), collapsing near-duplicates.
+    Representatives go to a scratch JSONL as they arrive; a second pass writes them
+    to out with the provenance gathered for them, so no chunk list is ever held.
+    """
+    stats = DedupStats()
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_name(out.name + ".reps.tmp")
+    provenance: Dict[str, List[Dict[str, Any]]] = {}
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            for c, rep_id in iter_dedup(_iter_chunks(inp), stats=stats, threshold=threshold, **kwargs):
+                if rep_id is None:
+                    f.write(json.dumps([_chunk_id(c, stats.chunks_in), c], ensure_ascii=False) + "\n")
+                else:
+                    provenance.setdefault(rep_id, []).append(_provenance(c))
+        array = out.suffix != ".jsonl"
+        with open(tmp, "r", encoding="utf-8") as src, open(out, "w", encoding="utf-8") as dst:
+            dst.write("[\n" if array else "")
+            for n, line in enumerate(src):
+                cid, c = json.loads(line)
+                if cid in provenance:
+                    c.setdefault("meta", {}).setdefault("provenance", []).extend(provenance.pop(cid))
+                if array:
+                    dst.write((",\n" if n else "") + json.dumps(c, ensure_ascii=False))
+                else:
+                    dst.write(json.dumps(c, ensure_ascii=False) + "\n")
+            dst.write("\n]\n" if array else "")
+    finally:
+        tmp.unlink(missing_ok=True)
+    return stats
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Collapse near-duplicate chunks (MinHash/LSH)")
+    ap.add_argument("--in", dest="inp", required=True, help="chunks.json (array) or .jsonl")
+    ap.add_argument("--out", required=True, help="Output path (.json array or .jsonl)")
+    ap.add_argument("--threshold", type=float, default=0.8, help="Estimated Jaccard to treat as duplicate")
+    ap.add_argument("--num-perm", type=int, default=128)
+    ap.add_argument("--max-reps", type=int, default=1_000_000, help="Bound on remembered unique chunks")
+    args = ap.parse_args()
+
+    out = Path(args.out)
+    stats = dedup_file(Path(args.inp), out, threshold=args.threshold, num_perm=args.num_perm,
+                       max_reps=args.max_reps)
+    print(stats.report())
+    print(f"Wrote {out}")
+
+if __name__ == "__main__":
+    main()
@@ -9,12 +9,14 @@
 
 from __future__ import annotations
 import argparse
+import contextvars
 import json
 import os
 import sys
-from typing import List, Optional, Dict, Any
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, List, Optional, Dict, Any, Tuple
 
-from openai import OpenAI
+from openai import APIConnectionError, OpenAI
 
 # Internal RAG (your existing module)
 from . import query as rag_query
@@ -22,6 +24,11 @@ from . import query as rag_query
 from .researcher import gather_sources, SourceItem
 # Light-touch editor (from editor.py you added)
 from .editor import edit_text
+from .tracing import trace_span, format_summary, export_trace
+from .context_pack import Block, PackStats, blocks_from_chunks, pack_blocks, render_blocks
+from .rag_config import CONTEXT_TOKENS, PLANNER_POLICY, PLANNER_SPECULATE, POLICY_CONFIDENCE
+from .deadline import Deadline, timed_client
+from .policy import PolicyDecision, decide, log_decision, may_speculate
 
 # ------------- Setup -------------
 def _require_api_key() -> str:
@@ -33,9 +40,22 @@ def _require_api_key() -> str:
 
 client = OpenAI(api_key=_require_api_key())
 
+def _chat(timeout: Optional[float] = None) -> OpenAI:
+    """The client, with a per-call timeout and no retries when the run has a deadline."""
+    return timed_client(client, timeout)
+
 
 # ------------- Planner -------------
-def _plan_with_policy(prompt: str) -> Dict[str, Any]:
+def _default_plan(rationale: str) -> Dict[str, Any]:
+    # Conservative fallback: avoid web calls; still provide usable steps.
+    return {
+        "allow_external": False,
+        "rationale": rationale,
+        "research_focus": [],
+        "steps": ["Outline key sections", "Draft arguments", "Incorporate internal notes", "Revise", "Proofread"]
+    }
+
+def _plan_with_policy(prompt: str, timeout: Optional[float] = None) -> Dict[str, Any]:
     """
     Ask the Planner to decide whether external sources are allowed and return steps.
     Output MUST be JSON (no prose).
@@ -59,14 +79,16 @@ def _plan_with_policy(prompt: str) -> Dict[str, Any]:
         "- Output valid JSON only (double quotes, no Markdown, no commentary)."
     )
 
-    r = client.chat.completions.create(
-        model="gpt-4o-mini",
-        temperature=0.2,
-        messages=[
-            {"role": "system", "content": system},
-            {"role": "user", "content": f"PROMPT:\n{prompt}\n\nReturn JSON ONLY."},
-        ],
-    )
+    with trace_span("planner", model="gpt-4o-mini") as span:
+        r = _chat(timeout).chat.completions.create(
+            model="gpt-4o-mini",
+            temperature=0.2,
+            messages=[
+                {"role": "system", "content": system},
+                {"role": "user", "content": f"PROMPT:\n{prompt}\n\nReturn JSON ONLY."},
+            ],
+        )
+        span.record_usage(r)
     raw = (r.choices[0].message.content or "").strip()
     try:
         data = json.loads(raw)
@@ -76,32 +98,29 @@ def _plan_with_policy(prompt: str) -> Dict[str, Any]:
             if required not in data:
                 raise ValueError(f"Missing key: {required}")
         data["allow_external"] = bool(data["allow_external"])
+        log_decision(prompt, data["allow_external"])   # training data for the local policy
         if "rationale" not in data:
             data["rationale"] = ""
         if "research_focus" not in data or not isinstance(data["research_focus"], list):
             data["research_focus"] = []
         return data
     except Exception:
-        # Conservative fallback: avoid web calls; still provide usable steps.
-        return {
-            "allow_external": False,
-            "rationale": "Fallback (could not parse planner JSON).",
-            "research_focus": [],
-            "steps": ["Outline key sections", "Draft arguments", "Incorporate internal notes", "Revise", "Proofread"]
-        }
+        return _default_plan("Fallback (could not parse planner JSON).")
 
 
 # ------------- Internal RAG -------------
-def _rag_retrieve(prompt: str, session: Optional[str] = None, k: int = 6) -> List[Dict[str, Any]]:
+def _rag_retrieve(prompt: str, session: Optional[str] = None, k: int = 6,
+                  retrieve_fn: Optional[Callable[..., List[Dict[str, Any]]]] = None) -> List[Dict[str, Any]]:
     """
-    Calls your existing FAISS retriever.
+    Calls your existing FAISS retriever (or retrieve_fn with the same signature, e.g. the
+    server's batched retriever).
     Returns a list of chunks, each a dict with at least 'content' (adjust if your schema differs).
     """
     filters = {}
     if session:
-        filters["session"] = session
+        filters["session"] = [session]   # a list of values, as query._matches and shard routing expect
     try:
-        chunks = rag_query.retrieve(prompt, k=k, include=filters)
+        chunks = (retrieve_fn or rag_query.retrieve)(prompt, k=k, include=filters)
         return chunks or []
     except Exception as e:
         print(f"RAG retrieval failed: {e}", file=sys.stderr)
@@ -109,24 +128,37 @@ def _rag_retrieve(prompt: str, session: Optional[str] = None, k: int = 6) -> Lis
 
 
 # ------------- Author -------------
-def _author(
+AUTHOR_SYSTEM = (
+    "You are an excellent academic writer. Use INTERNAL NOTES faithfully (primary source). "
+    "If EXTERNAL SOURCES are provided, integrate carefully, use short inline citations like [Site] or [Org, Year], "
+    "and add a final 'Sources' section listing title and URL. Do not invent citations or facts."
+)
+
+def _context_sections(
     prompt: str,
     plan: Dict[str, Any],
-    session: Optional[str],
     rag_chunks: Optional[List[Dict[str, Any]]],
     web_sources: Optional[List[SourceItem]],
-) -> str:
+    ctx_tokens: int,
+) -> Tuple[str, str, Optional[PackStats]]:
     """
-    Compose final draft using INTERNAL NOTES (RAG) and optional EXTERNAL SOURCES (web).
+    INTERNAL NOTES / EXTERNAL SOURCES text for the author prompt. With a token budget,
+    both are packed together to the sentences most relevant to the prompt and research
+    focus (context_pack.py); with ctx_tokens=0, whole chunks and 300-char excerpts are pasted.
     """
-    system = (
-        "You are an excellent academic writer. Use INTERNAL NOTES faithfully (primary source). "
-        "If EXTERNAL SOURCES are provided, integrate carefully, use short inline citations like [Site] or [Org, Year], "
-        "and add a final 'Sources' section listing title and URL. Do not invent citations or facts."
-    )
-
-    # Plan text
-    plan_text = "\n".join(f"- {s}" for s in plan.get("steps", []))
+    if ctx_tokens:
+        blocks = blocks_from_chunks((rag_chunks or [])[:12])
+        for i, s in enumerate(web_sources or [], 1):
+            blocks.append(Block(label=f"[{i}] {s.title}\n{s.url}", text=s.excerpt, kind="web", rank=i - 1))
+        focus = " ".join(plan.get("research_focus", []))
+        with trace_span("context.pack", blocks=len(blocks), max_tokens=ctx_tokens) as span:
+            packed, stats = pack_blocks(f"{prompt} {focus}", blocks, max_tokens=ctx_tokens)
+            span.set(**stats.to_dict())
+        rag = [b for b in packed if b.kind == "rag"]
+        web = [b for b in packed if b.kind == "web"]
+        rag_text = ("\n\nINTERNAL NOTES (RAG):\n" + render_blocks(rag, sep="\n\n")) if rag else ""
+        src_text = ("\n\nEXTERNAL SOURCES (web):\n" + render_blocks(web, sep="\n\n")) if web else ""
+        return rag_text, src_text, stats
 
     # Internal notes
     rag_text = ""
@@ -147,7 +179,19 @@ def _author(
         for i, s in enumerate(web_sources, 1):
             lines.append(f"[{i}] {s.title}\n{s.url}\nExcerpt: {s.excerpt[:300]}...")
         src_text = "\n\nEXTERNAL SOURCES (web):\n" + "\n\n".join(lines)
+    return rag_text, src_text, None
 
+def author_messages(
+    prompt: str,
+    plan: Dict[str, Any],
+    session: Optional[str],
+    rag_chunks: Optional[List[Dict[str, Any]]],
+    web_sources: Optional[List[SourceItem]],
+    ctx_tokens: int = CONTEXT_TOKENS,
+) -> Tuple[List[Dict[str, str]], Optional[PackStats]]:
+    """Chat messages for the Author call (also used by the benchmarks to size prompts)."""
+    plan_text = "\n".join(f"- {s}" for s in plan.get("steps", []))
+    rag_text, src_text, stats = _context_sections(prompt, plan, rag_chunks, web_sources, ctx_tokens)
     user = (
         f"SESSION: {session or 'N/A'}\n"
         f"PLANNER: allow_external={plan.get('allow_external')} | reason: {plan.get('rationale','')}\n"
@@ -157,20 +201,212 @@ def _author(
         f"{rag_text}"
         f"{src_text}"
     )
+    return [{"role": "system", "content": AUTHOR_SYSTEM}, {"role": "user", "content": user}], stats
 
-    r = client.chat.completions.create(
-        model="gpt-4o-mini",
-        temperature=0.5,
-        messages=[
-            {"role": "system", "content": system},
-            {"role": "user", "content": user},
-        ],
-    )
+def _author(
+    prompt: str,
+    plan: Dict[str, Any],
+    session: Optional[str],
+    rag_chunks: Optional[List[Dict[str, Any]]],
+    web_sources: Optional[List[SourceItem]],
+    ctx_tokens: int = CONTEXT_TOKENS,
+    timeout: Optional[float] = None,
+) -> str:
+    """
+    Compose final draft using INTERNAL NOTES (RAG) and optional EXTERNAL SOURCES (web).
+    """
+    messages, stats = author_messages(prompt, plan, session, rag_chunks, web_sources, ctx_tokens)
+    with trace_span("author", model="gpt-4o-mini", prompt_chars=len(messages[1]["content"])) as span:
+        if stats is not None:
+            span.set(ctx_tokens_in=stats.tokens_in, ctx_tokens_out=stats.tokens_out)
+        r = _chat(timeout).chat.completions.create(
+            model="gpt-4o-mini",
+            temperature=0.5,
+            messages=messages,
+        )
+        span.record_usage(r)
     return (r.choices[0].message.content or "").strip()
 
+def _notes_draft(rag_chunks: Optional[List[Dict[str, Any]]], web_sources: Optional[List[SourceItem]],
+                 n: int = 4, chars: int = 600) -> str:
+    """Extractive stand-in when the Author call runs out of time: the top notes and sources, cited."""
+    blocks = blocks_from_chunks((rag_chunks or [])[:n])
+    for i, s in enumerate(web_sources or [], 1):
+        blocks.append(Block(label=f"[{i}] {s.title}\n{s.url}", text=s.excerpt, kind="web", rank=i - 1))
+    for b in blocks:
+        b.text = b.text[:chars]
+    return render_blocks(blocks, sep="\n\n")
+
+
+# ------------- Pipeline -------------
+# Speculative research runs here while the LLM planner decides whether it's needed
+_SPECULATE = ThreadPoolExecutor(max_workers=4, thread_name_prefix="agentic-speculate")
+
+def _research(q: str, n: int, budget: Optional[float],
+              research_fn: Optional[Callable[..., List[SourceItem]]] = None) -> Optional[List[SourceItem]]:
+    try:
+        return (research_fn or gather_sources)(q, max_sources=n, budget_s=budget)
+    except Exception as e:
+        print(f"External research failed: {e}", file=sys.stderr)
+        return None
+
+def run_pipeline(
+    prompt: str,
+    session: Optional[str] = None,
+    *,
+    force_external: bool = False,
+    no_external: bool = False,
+    max_sources: int = 4,
+    tone: Optional[str] = None,
+    length: Optional[str] = None,
+    fmt: Optional[str] = None,
+    retrieve_fn: Optional[Callable[..., List[Dict[str, Any]]]] = None,
+    ctx_tokens: int = CONTEXT_TOKENS,
+    deadline_s: Optional[float] = None,
+    research_fn: Optional[Callable[..., List[SourceItem]]] = None,
+) -> Dict[str, Any]:
+    """
+    Planner -> RAG -> (Researcher) -> Author -> Editor for one prompt.
+    Returns {"plan", "rag_chunks", "web_sources", "final_text", "degradations", "deadline", "planner"}.
+
+    The allow_external decision is made locally (policy.py) when the rules or the
+    trained classifier are confident, or when --force-external / --no-external
+    settle it; only the rest go to the LLM planner. With PLANNER_SPECULATE, research
+    starts alongside it for prompts policy.may_speculate() clears ("planner" says
+    which happened).
+
+    With deadline_s, stages run against an end-to-end budget (deadline.py). When the
+    run falls behind, optional work is shed in this order: planner (default plan),
+    research (fewer sources, then none), RAG chunks and context size, editor. Model
+    calls get the stage's remaining time as timeout; an Author timeout falls back to
+    the cited notes. Everything shed is listed in "degradations".
+
+    research_fn replaces gather_sources (same signature), e.g. to share research
+    between prompts of a batch (batch.py).
+    """
+    dl = Deadline(deadline_s)
+    with trace_span("demo", session=session or "", deadline_s=dl.budget_s or 0) as span:
+        # 1) Planner decides policy + steps: locally when the policy is sure (policy.py), else the LLM
+        q = (prompt[:160] + "...") if len(prompt) > 160 else prompt   # web query (prompt as baseline)
+        if force_external or no_external:
+            decision = PolicyDecision(bool(force_external), 1.0, "override", "CLI override")
+        else:
+            decision = decide(prompt) if PLANNER_POLICY != "llm" else None
+        local = decision is not None and (PLANNER_POLICY == "local" or decision.confidence >= POLICY_CONFIDENCE)
+        speculative: Optional[Future] = None
+        spec_budget: Optional[float] = None
+        research_end = 0.0
+        if local:
+            with trace_span("planner.local", source=decision.source, confidence=round(decision.confidence, 3)):
+                plan = decision.plan(prompt)
+        elif dl.fits("planner"):
+            if PLANNER_SPECULATE and may_speculate(prompt):
+                # Unsure: research alongside the planner call, used only if the planner allows it.
+                # Never for prompts about the user's notes: those wait for the planner.
+                # Its budget leaves time for the planner and retrieve too, as if it ran after them;
+                # without enough of it the research stage decides once the plan is in.
+                spec_budget = None if dl.unlimited else dl.slack("research", after=("planner", "retrieve"))
+                if spec_budget is None or spec_budget >= 0.5 * dl.estimate("research"):
+                    research_end = dl.elapsed() + (spec_budget or 0.0)
+                    speculative = _SPECULATE.submit(contextvars.copy_context().run, _research,
+                                                    q, max(1, max_sources), spec_budget, research_fn)
+            with dl.stage("planner"):
+                try:
+                    plan = _plan_with_policy(prompt, timeout=dl.timeout("planner"))
+                except APIConnectionError:
+                    if dl.unlimited:
+                        raise
+                    dl.degrade("planner", "timeout", "default plan")
+                    plan = _default_plan("Fallback (planner timed out).")
+        else:
+            dl.degrade("planner", "skipped", "default plan")
+            plan = _default_plan("Fallback (planner skipped, over deadline).")
+        planner = {"source": decision.source if local else "llm",
+                   "confidence": round(decision.confidence, 3) if decision else None, "speculative": None}
+        span.set(planner=planner["source"])
+
+        # 2) Apply CLI overrides (if any)
+        if force_external:
+            plan["allow_external"] = True
+        if no_external:
+            plan["allow_external"] = False
+
+        # 3) Always retrieve INTERNAL notes (RAG); fewer chunks when behind
+        k = 6
+        if not dl.fits("retrieve", 2.0):
+            k = 3
+            dl.degrade("retrieve", "capped", f"k={k}")
+        with dl.stage("retrieve"):
+            rag_chunks = _rag_retrieve(prompt, session=session, k=k, retrieve_fn=retrieve_fn)
+
+        # 4) Conditionally do EXTERNAL research
+        web_sources: Optional[List[SourceItem]] = None
+        if speculative is not None:
+            planner["speculative"] = "used" if plan.get("allow_external", False) else "wasted"
+            span.set(speculative=planner["speculative"])
+        if plan.get("allow_external", False):
+            n = max(1, max_sources)
+            if speculative is None:
+                if not dl.fits("research", 0.5):
+                    n = 0
+                    dl.degrade("research", "skipped")
+                elif not dl.fits("research"):
+                    n = 1
+                    dl.degrade("research", "truncated", f"max_sources={n}")
+            if n:
+                with dl.stage("research"):
+                    if speculative is not None:
+                        web_sources = speculative.result()
+                        budget = spec_budget
+                    else:
+                        budget = None if dl.unlimited else dl.slack("research")
+                        research_end = dl.elapsed() + (budget or 0.0)
+                        web_sources = _research(q, n, budget, research_fn)
+                    cut = sum(1 for s in web_sources or [] if not s.fetched)
+                    if cut and budget is not None and dl.elapsed() >= research_end - 0.05 * (budget or 1.0):
+                        # Budget ran out with pages still downloading
+                        dl.degrade("research", "truncated", f"{cut} of {len(web_sources)} sources from snippets")
+
+        # 5) Author composes with both; a smaller context when behind
+        if ctx_tokens and not dl.fits("author"):
+            ctx_tokens //= 2
+            dl.degrade("author", "capped", f"ctx_tokens={ctx_tokens}")
+        notes_only = False
+        with dl.stage("author"):
+            try:
+                draft = _author(prompt, plan, session=session, rag_chunks=rag_chunks, web_sources=web_sources,
+                                ctx_tokens=ctx_tokens, timeout=dl.timeout("author"))
+            except APIConnectionError:
+                if dl.unlimited:
+                    raise
+                dl.degrade("author", "timeout", "notes-only draft")
+                draft, notes_only = _notes_draft(rag_chunks, web_sources), True
+
+        # 6) Editor finalizes (optional under a deadline)
+        final_text = draft
+        if notes_only:
+            dl.degrade("editor", "skipped", "no draft to edit")
+        elif dl.fits("editor"):
+            with dl.stage("editor"):
+                try:
+                    final_text = edit_text(draft, tone=tone, length_hint=length, format_hint=fmt,
+                                           timeout=dl.timeout("editor"))
+                except APIConnectionError:
+                    if dl.unlimited:
+                        raise
+                    dl.degrade("editor", "timeout", "unedited draft")
+        else:
+            dl.degrade("editor", "skipped", "unedited draft")
+
+        report = dl.report()
+        span.set(deadline_met=report["met"], degradations=len(dl.degradations))
+
+    return {"plan": plan, "rag_chunks": rag_chunks, "web_sources": web_sources, "final_text": final_text,
+            "degradations": report["degradations"], "deadline": report, "planner": planner}
+
 
 # ------------- CLI -------------
-def main():
+def main(argv: Optional[List[str]] = None):
     parser = argparse.ArgumentParser(
         description="Agentic Author Demo (Planner controls external research; RAG always on; Editor finalizes)"
     )
@@ -184,41 +420,62 @@ def main():
     parser.add_argument("--tone", default=None, help="Editor tone (e.g., 'formal', 'executive concise')")
     parser.add_argument("--length", default=None, help="Length hint (e.g., '600-800 words', '2 pages')")
     parser.add_argument("--format", dest="fmt", default=None, help="Format hint (e.g., 'markdown', 'memo')")
-    parser.add_argument("--out", default=None, help="Write final output to this file (e.g., data/out.md)")
-
-    args = parser.parse_args()
-
+    parser.add_argument("--out", default=None,
+                        help="Write final output to this file (e.g., data/out.md); the drafts JSONL with --batch")
+    parser.add_argument("--ctx-tokens", type=int, default=CONTEXT_TOKENS,
+                        help="Token budget for notes + sources in the Author prompt (0 = paste whole chunks)")
+    parser.add_argument("--deadline", type=float, default=None, metavar="SECONDS",
+                        help="End-to-end latency budget; optional work is shed when the run falls behind")
+    # Batch mode
+    parser.add_argument("--batch", default=None, metavar="PROMPTS.jsonl",
+                        help="Run every prompt in this JSONL file; drafts go to --out (JSONL)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Prompts (and model calls) in flight in --batch")
+    parser.add_argument("--no-resume", action="store_true", help="Redo prompts already in the --batch output")
+    parser.add_argument("--no-share", action="store_true",
+                        help="Don't share retrieval/research between similar prompts in --batch")
+    # Tracing
+    parser.add_argument("--trace", action="store_true", help="Print per-stage latency summary (p50/p95/p99)")
+    parser.add_argument("--trace-out", default=None, help="Export spans (.jsonl, or Chrome trace .json)")
+
+    args = parser.parse_args(argv)
+
+    if args.batch:
+        _main_batch(args)
+    else:
+        _main_single(args)
+    if args.trace:
+        print("\n" + format_summary())
+    if args.trace_out:
+        print(f"[trace written to {export_trace(args.trace_out)}]")
+
+def _main_batch(args: argparse.Namespace) -> None:
+    from .batch import load_prompts, run_batch
+    items = load_prompts(args.batch)
+    out = args.out or os.path.splitext(args.batch)[0] + ".drafts.jsonl"
+    defaults = {"session": args.session, "tone": args.tone, "length": args.length, "format": args.fmt,
+                "force_external": args.force_external, "no_external": args.no_external,
+                "max_sources": args.max_sources, "deadline_s": args.deadline, "ctx_tokens": args.ctx_tokens}
+    stats = run_batch(items, out, concurrency=args.concurrency, resume=not args.no_resume,
+                      share=not args.no_share, defaults=defaults, progress=True)
+    print(f"\n=== BATCH: {stats.done} drafted, {stats.failed} failed, {stats.skipped} already done "
+          f"of {stats.total} in {stats.wall_s:.1f}s ({stats.drafts_per_min:.1f} drafts/min) ===")
+    print(f"shared retrievals: {stats.retrieval_shared}, shared research: {stats.research_shared}")
+    print(f"[drafts appended to {out}]")
+    if stats.failed:
+        print("Some prompts failed; rerun the same command to retry them.", file=sys.stderr)
+
+def _main_single(args: argparse.Namespace) -> None:
     prompt = args.prompt or "Write a short example to prove the pipeline works."
     session = args.session
 
-    # 1) Planner decides policy + steps
-    plan = _plan_with_policy(prompt)
-
-    # 2) Apply CLI overrides (if any)
-    if args.force_external:
-        plan["allow_external"] = True
-    if args.no_external:
-        plan["allow_external"] = False
-
-    # 3) Always retrieve INTERNAL notes (RAG)
-    rag_chunks = _rag_retrieve(prompt, session=session, k=6)
-
-    # 4) Conditionally do EXTERNAL research
-    web_sources: Optional[List[SourceItem]] = None
-    if plan.get("allow_external", False):
-        # You can build a tighter web query; using prompt is okay as a baseline.
-        q = (prompt[:160] + "...") if len(prompt) > 160 else prompt
-        try:
-            web_sources = gather_sources(q, max_sources=max(1, args.max_sources))
-        except Exception as e:
-            print(f"External research failed: {e}", file=sys.stderr)
-            web_sources = None
-
-    # 5) Author composes with both
-    draft = _author(prompt, plan, session=session, rag_chunks=rag_chunks, web_sources=web_sources)
-
-    # 6) Editor finalizes
-    final_text = edit_text(draft, tone=args.tone, length_hint=args.length, format_hint=args.fmt)
+    result = run_pipeline(
+        prompt, session,
+        force_external=args.force_external, no_external=args.no_external,
+        max_sources=args.max_sources, tone=args.tone, length=args.length, fmt=args.fmt,
+        ctx_tokens=args.ctx_tokens, deadline_s=args.deadline,
+    )
+    plan, rag_chunks = result["plan"], result["rag_chunks"]
+    web_sources, final_text = result["web_sources"], result["final_text"]
 
     # 7) Console summary + optional save
     print("\n=== PLAN (from Planner) ===")
@@ -232,6 +489,13 @@ def main():
         for i, s in enumerate(web_sources, 1):
             print(f"[{i}] {s.title}\n{s.url}\nExcerpt: {s.excerpt[:200]}...\n")
 
+    if args.deadline:
+        dl = result["deadline"]
+        print(f"\n=== DEADLINE {dl['budget_s']:.1f}s: {'met' if dl['met'] else 'missed'} "
+              f"in {dl['elapsed_s']:.1f}s ===")
+        for d in result["degradations"]:
+            print(f"- {d['stage']}: {d['action']}" + (f" ({d['detail']})" if d["detail"] else ""))
+
     print("\n=== DRAFT (edited) ===\n" + final_text)
 
     if args.out:
@@ -12,12 +12,16 @@ import os
 from typing import Optional
 from openai import OpenAI
 
+from .deadline import timed_client
+from .tracing import trace_span
+
 client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
 
 def edit_text(draft: str,
               tone: Optional[str] = None,
               length_hint: Optional[str] = None,
-              format_hint: Optional[str] = None) -> str:
+              format_hint: Optional[str] = None,
+              timeout: Optional[float] = None) -> str:
     """Light-touch revision: clarity, structure, consistency, citation sanity."""
     system = (
         "You are an expert editor. Improve clarity, flow, and structure. "
@@ -33,9 +37,11 @@ def edit_text(draft: str,
     prefs_txt = " ".join(prefs) or "Default tone and length."
 
     user = f"Editing preferences: {prefs_txt}\n\nDRAFT:\n{draft}"
-    r = client.chat.completions.create(
-        model="gpt-4o-mini",
-        temperature=0.3,
-        messages=[{"role":"system","content":system},{"role":"user","content":user}],
-    )
+    with trace_span("editor", model="gpt-4o-mini", draft_chars=len(draft)) as span:
+        r = timed_client(client, timeout).chat.completions.create(
+            model="gpt-4o-mini",
+            temperature=0.3,
+            messages=[{"role":"system","content":system},{"role":"user","content":user}],
+        )
+        span.record_usage(r)
     return r.choices[0].message.content.strip()
@@ -13,13 +13,21 @@ Step 2: Embed chunks and build FAISS index.
 Usage:
     export OPENAI_API_KEY=sk-...
     pip install openai faiss-cpu numpy
-    python -m index
+    python -m index [--storage float16|int8] [--dim 1024] [--no-full-vectors] [--shard-by session]
 """
 
-import json, numpy as np, faiss
+import argparse, json, numpy as np, faiss
 from pathlib import Path
-from typing import List
-from .rag_config import CHUNKS_JSON, FAISS_INDEX, FAISS_METADATA, EMBED_MODEL
+from typing import List, Optional
+from .rag_config import (
+    CHUNKS_JSON, FAISS_INDEX, FAISS_METADATA, INDEX_MANIFEST, FULL_VECTORS, EMBED_MODEL,
+    INDEX_STORAGE, INDEX_DIM, SHARD_DIR, INDEX_ROOT, INDEX_KEEP_SNAPSHOTS, INDEX_GC_GRACE_S,
+)
+from .tracing import trace_span
+from .vectors import STORAGE_TYPES, build_index, save_vectors, write_index, write_manifest
+from .dedup import dedup_chunks, vector_bytes
+from .shards import write_shards
+from . import snapshots
 
 # OpenAI client
 from openai import OpenAI
@@ -34,24 +42,76 @@ def embed_texts(texts: List[str]) -> np.ndarray:
     out = []
     for i in range(0, len(texts), B):
         batch = texts[i:i+B]
-        r = client.embeddings.create(model=EMBED_MODEL, input=batch)
+        with trace_span("embed", n=len(batch)) as span:
+            r = client.embeddings.create(model=EMBED_MODEL, input=batch)
+            span.record_usage(r)
         out.extend([d.embedding for d in r.data])
     X = np.array(out, dtype="float32")
     faiss.normalize_L2(X)
     return X
 
-def main():
+def main(argv: Optional[List[str]] = None):
+    ap = argparse.ArgumentParser(description="Embed chunks and build the FAISS index")
+    ap.add_argument("--storage", choices=STORAGE_TYPES, default=INDEX_STORAGE,
+                    help="Vector precision in the index (float16/int8 halve/quarter memory)")
+    ap.add_argument("--dim", type=int, default=INDEX_DIM,
+                    help="Keep only the first DIM components (Matryoshka truncation)")
+    ap.add_argument("--no-full-vectors", action="store_true",
+                    help="Do not save full float32 vectors for exact rescoring")
+    ap.add_argument("--dedup", action="store_true", help="Collapse near-duplicate chunks before embedding")
+    ap.add_argument("--dedup-threshold", type=float, default=0.8, help="Estimated Jaccard for --dedup")
+    ap.add_argument("--shard-by", default=None, metavar="KEY",
+                    help="Write one lazily loaded shard per value of meta[KEY] (e.g. session) instead of rag.faiss")
+    args = ap.parse_args(argv)
+
     chunks = load_chunks()
+    stats = None
+    if args.dedup:
+        chunks, stats = dedup_chunks(chunks, threshold=args.dedup_threshold)
     texts = [c["text"] for c in chunks]
     X = embed_texts(texts)
+    if stats is not None:
+        # Width of what the index stores: the embedding model's, unless truncated with --dim
+        width = min(args.dim, X.shape[1]) if args.dim else X.shape[1]
+        stats.bytes_per_vector = vector_bytes(width, args.storage)
+        print(stats.report())
+
+    # Full vectors only pay off when the index itself is lossy.
+    keep_full = not args.no_full_vectors and (args.storage != "float32" or bool(args.dim))
+
+    # Everything goes into a fresh snapshot directory; readers only see it once
+    # CURRENT is swapped to point at it (snapshots.py).
+    sid, snap = snapshots.begin(INDEX_ROOT)
+    if args.shard_by:
+        manifest = write_shards(chunks, X, args.shard_by, snap / SHARD_DIR.name, storage=args.storage,
+                                dim=args.dim, keep_full=keep_full, embed_model=EMBED_MODEL)
+        snapshots.publish(INDEX_ROOT, sid, snap, layout="sharded", chunks=len(chunks))
+        removed = snapshots.gc(INDEX_ROOT, keep=INDEX_KEEP_SNAPSHOTS, grace_s=INDEX_GC_GRACE_S)
+        print(f"Indexed {len(chunks)} chunks ({args.storage}) into {len(manifest['shards'])} "
+              f"'{args.shard_by}' shards → snapshot {sid}" + (f" (gc: {len(removed)} removed)" if removed else ""))
+        return
 
-    index = faiss.IndexFlatIP(X.shape[1])
-    index.add(X)
+    with trace_span("index.build", n=len(chunks), dim=int(X.shape[1]), storage=args.storage):
+        index = build_index(X, storage=args.storage, dim=args.dim)
 
-    faiss.write_index(index, str(FAISS_INDEX))
-    Path(FAISS_METADATA).write_text(json.dumps(chunks, ensure_ascii=False), encoding="utf-8")
+    write_index(index, snap / FAISS_INDEX.name)
+    (snap / FAISS_METADATA.name).write_text(json.dumps(chunks, ensure_ascii=False), encoding="utf-8")
+    if keep_full:
+        save_vectors(snap / FULL_VECTORS.name, X)
+    write_manifest(
+        snap / INDEX_MANIFEST.name,
+        storage=args.storage,
+        dim=int(index.d),
+        full_dim=int(X.shape[1]),
+        ntotal=int(index.ntotal),
+        embed_model=EMBED_MODEL,
+        full_vectors=FULL_VECTORS.name if keep_full else None,
+    )
+    snapshots.publish(INDEX_ROOT, sid, snap, layout="monolithic", chunks=len(chunks))
+    removed = snapshots.gc(INDEX_ROOT, keep=INDEX_KEEP_SNAPSHOTS, grace_s=INDEX_GC_GRACE_S)
 
-    print(f"Indexed {len(chunks)} chunks → {FAISS_INDEX.name}, meta → {FAISS_METADATA.name}")
+    print(f"Indexed {len(chunks)} chunks ({args.storage}, dim={index.d}) → snapshot {sid}"
+          + (f" (gc: {len(removed)} removed)" if removed else ""))
 
 if __name__ == "__main__":
     main()
@@ -11,6 +11,8 @@ from __future__ import annotations
 import asyncio
 import functools
 import random
+import time
+import weakref
 from typing import Any
 
 class LLM:
@@ -37,6 +39,41 @@ class DummyLLM(LLM):
         return "\n".join(["Here are some thoughts:"] + bullets + ["\n(Replace DummyLLM with a real model)"])
 
 
+class LatencyLLM(LLM):
+    """
+    Wraps an LLM (DummyLLM by default) with injected latency for load tests: latency_s
+    +/- jitter per call, plus slow_s more for a slow_rate fraction of calls. With
+    native_async=False, acomplete uses the default thread-pool path like a sync-only model.
+    """
+    def __init__(self, inner: LLM | None = None, latency_s: float = 0.05, jitter: float = 0.1,
+                 slow_rate: float = 0.0, slow_s: float = 0.0, native_async: bool = True, seed: int = 7):
+        self.inner = inner or DummyLLM()
+        self.latency_s = latency_s
+        self.jitter = jitter
+        self.slow_rate = slow_rate
+        self.slow_s = slow_s
+        self.native_async = native_async
+        self.rng = random.Random(seed)
+        self.calls = 0
+
+    def _delay(self) -> float:
+        self.calls += 1
+        d = self.latency_s * (1.0 + self.rng.uniform(-self.jitter, self.jitter))
+        if self.slow_rate and self.rng.random() < self.slow_rate:
+            d += self.slow_s
+        return max(0.0, d)
+
+    def complete(self, prompt: str, **kwargs: Any) -> str:
+        time.sleep(self._delay())
+        return self.inner.complete(prompt, **kwargs)
+
+    async def acomplete(self, prompt: str, **kwargs: Any) -> str:
+        if not self.native_async:
+            return await super().acomplete(prompt, **kwargs)
+        await asyncio.sleep(self._delay())
+        return self.inner.complete(prompt, **kwargs)
+
+
 # -------------------------------
 # OpenAI adapter for SDK 1.12.x (chat.completions)
 # -------------------------------
@@ -55,6 +92,8 @@ class OpenAILLM(LLM):
         self.defaults = defaults
         from openai import OpenAI  # new-style client exists in 1.12.x
         self.client = OpenAI(api_key=api_key or os.getenv("OPENAI_API_KEY"))
+        # One AsyncOpenAI per event loop: its connection pool is bound to the loop it was created on
+        self._aclients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
         if not (api_key or os.getenv("OPENAI_API_KEY")):
             raise RuntimeError("OPENAI_API_KEY not set")
 
@@ -70,3 +109,24 @@ class OpenAILLM(LLM):
         except Exception as e:
             # Surface the real error for fast debugging (auth/model/quota/network)
             raise RuntimeError(f"OpenAI chat.completions failed: {e}") from e
+
+    def _aclient(self) -> Any:
+        loop = asyncio.get_running_loop()
+        client = self._aclients.get(loop)
+        if client is None:
+            from openai import AsyncOpenAI
+            client = self._aclients[loop] = AsyncOpenAI(api_key=self.client.api_key, base_url=self.client.base_url)
+        return client
+
+    async def acomplete(self, prompt: str, **kwargs: Any) -> str:
+        # Native async client: no thread per in-flight call
+        params = {**self.defaults, **kwargs}
+        try:
+            resp = await self._aclient().chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": prompt}],
+                **params,
+            )
+            return resp.choices[0].message.content
+        except Exception as e:
+            raise RuntimeError(f"OpenAI chat.completions failed: {e}") from e
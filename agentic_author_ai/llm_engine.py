@@ -0,0 +1,208 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+# -------------------------------
+# LLM Engine
+# -------------------------------
+
+"""
+Async execution engine for LLM calls made by agents (Agent.act).
+
+  - Concurrency: at most `concurrency` calls run at once. An LLM with a native
+    async acomplete runs on the event loop. A sync-only LLM runs on the
+    engine's own thread pool of that size, not on the loop's default executor.
+  - Coalescing: identical concurrent requests (same LLM, prompt and kwargs)
+    share one call. Later callers await the first caller's result, at the
+    priority the first caller queued with.
+  - Priorities: when all slots are busy, waiting calls are admitted lowest
+    priority value first (INTERACTIVE before NORMAL before BACKGROUND), FIFO
+    within a priority.
+  - Metrics: stats() reports calls, coalesced requests, errors, queue depth
+    (current and max), in-flight calls and p50/p95/max admission wait per priority.
+
+One engine is meant to be shared by every agent of a process (ENGINE is the
+default used by Agent), so the concurrency limit is global. It is thread-safe
+and may be used from several event loops at once (e.g. threads each running
+asyncio.run): slots and the priority queue are shared, a freed slot is handed
+to a waiter on another loop with call_soon_threadsafe, and coalescing happens
+per loop (asyncio tasks can't be awaited from another loop).
+
+Usage:
+    engine = LLMEngine(concurrency=16)
+    text = await engine.complete(llm, prompt, priority=INTERACTIVE)
+    engine.stats()
+"""
+
+from __future__ import annotations
+import asyncio
+import heapq
+import itertools
+import json
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Deque, Dict, Hashable, List, MutableMapping, Tuple
+
+from .llm import LLM
+from .tracing import percentile, trace_span
+
+INTERACTIVE = 0    # e.g. author / user-facing turns
+NORMAL = 5
+BACKGROUND = 10    # e.g. rerank, summaries nobody is waiting on
+
+DEFAULT_CONCURRENCY = 8
+
+class _Waiter:
+    """A call queued for a slot. `granted`/`gone` are only read and written under the engine lock."""
+    __slots__ = ("loop", "fut", "granted", "gone")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.fut = loop.create_future()
+        self.granted = False
+        self.gone = False   # cancelled while queued; skipped by _release
+
+def _wake(fut: asyncio.Future) -> None:
+    if not fut.done():
+        fut.set_result(None)
+
+class LLMEngine:
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY, coalesce: bool = True, wait_window: int = 1000):
+        self.concurrency = max(1, concurrency)
+        self.coalesce = coalesce
+        self.wait_window = wait_window
+        self._pool = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="agentic-llm")
+        # Slots and the wait queue are shared by every thread / event loop using the engine;
+        # in-flight calls (asyncio tasks) can only be shared within their own loop.
+        self._lock = threading.Lock()
+        self._active = 0
+        self._waiters: List[Tuple[int, int, _Waiter]] = []   # heap of (priority, seq, waiter)
+        self._queued = 0
+        self._seq = itertools.count()
+        self._inflight: MutableMapping[asyncio.AbstractEventLoop, Dict[Hashable, asyncio.Task]] = \
+            weakref.WeakKeyDictionary()
+        self._waits: Dict[int, Deque[float]] = {}
+        self.calls = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.max_queue_depth = 0
+
+    # -------- admission --------
+    async def _acquire(self, priority: int) -> float:
+        t0 = time.perf_counter()
+        with self._lock:
+            if self._active < self.concurrency and not self._queued:
+                self._active += 1
+                w = None
+            else:
+                w = _Waiter(asyncio.get_running_loop())
+                heapq.heappush(self._waiters, (priority, next(self._seq), w))
+                self._queued += 1
+                self.max_queue_depth = max(self.max_queue_depth, self._queued)
+        if w is not None:
+            try:
+                await w.fut   # the releasing call hands its slot over
+            except asyncio.CancelledError:
+                with self._lock:
+                    handed = w.granted
+                    if not handed:
+                        w.gone = True
+                        self._queued -= 1
+                if handed:
+                    self._release()   # slot was handed over just before the cancel
+                raise
+        wait = time.perf_counter() - t0
+        with self._lock:
+            self._waits.setdefault(priority, deque(maxlen=self.wait_window)).append(wait)
+        return wait
+
+    def _release(self) -> None:
+        with self._lock:
+            while self._waiters:
+                _, _, w = heapq.heappop(self._waiters)
+                if w.gone:
+                    continue
+                self._queued -= 1
+                try:
+                    w.loop.call_soon_threadsafe(_wake, w.fut)
+                except RuntimeError:   # its loop is closed: nobody is waiting any more
+                    w.gone = True
+                    continue
+                w.granted = True
+                return
+            self._active -= 1
+
+    # -------- calls --------
+    @staticmethod
+    def _key(llm: LLM, prompt: str, kwargs: Dict[str, Any]) -> Hashable:
+        return (id(llm), prompt, json.dumps(kwargs, sort_keys=True, default=str))
+
+    async def _call(self, llm: LLM, prompt: str, kwargs: Dict[str, Any]) -> str:
+        if getattr(llm, "native_async", type(llm).acomplete is not LLM.acomplete):
+            return await llm.acomplete(prompt, **kwargs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, lambda: llm.complete(prompt, **kwargs))
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    async def _run(self, llm: LLM, prompt: str, priority: int, kwargs: Dict[str, Any]) -> str:
+        with trace_span("llm.engine", priority=priority, prompt_chars=len(prompt)) as span:
+            wait = await self._acquire(priority)
+            span.set(wait_ms=round(wait * 1000.0, 3), queue_depth=self._queued)
+            try:
+                self._count("calls")
+                return await self._call(llm, prompt, kwargs)
+            except Exception:
+                self._count("errors")
+                raise
+            finally:
+                self._release()
+
+    async def complete(self, llm: LLM, prompt: str, priority: int = NORMAL, **kwargs: Any) -> str:
+        """llm's completion of prompt, scheduled by priority and shared with identical in-flight calls."""
+        if not self.coalesce:
+            return await self._run(llm, prompt, priority, kwargs)
+        loop = asyncio.get_running_loop()
+        key = self._key(llm, prompt, kwargs)
+        with self._lock:
+            inflight = self._inflight.setdefault(loop, {})
+        shared = inflight.get(key)   # only this loop's thread touches its dict
+        if shared is not None:
+            self._count("coalesced")
+            return await asyncio.shield(shared)
+        task = loop.create_task(self._run(llm, prompt, priority, kwargs))
+        inflight[key] = task
+        task.add_done_callback(lambda _t, k=key: inflight.pop(k, None))
+        return await asyncio.shield(task)
+
+    # -------- metrics --------
+    @property
+    def queue_depth(self) -> int:
+        return self._queued
+
+    @property
+    def in_flight(self) -> int:
+        return self._active
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            samples = {prio: list(w) for prio, w in self._waits.items()}
+            counters = {
+                "concurrency": self.concurrency, "calls": self.calls, "coalesced": self.coalesced,
+                "errors": self.errors, "in_flight": self._active, "queue_depth": self._queued,
+                "max_queue_depth": self.max_queue_depth,
+            }
+        waits = {}
+        for prio, w in sorted(samples.items()):
+            ms = [x * 1000.0 for x in w]
+            waits[str(prio)] = {"n": len(ms), "p50_ms": round(percentile(ms, 50), 3),
+                                "p95_ms": round(percentile(ms, 95), 3), "max_ms": round(max(ms), 3)}
+        return {**counters, "wait": waits}
+
+ENGINE = LLMEngine()
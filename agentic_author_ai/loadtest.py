@@ -0,0 +1,122 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+# -------------------------------
+# Load Test
+# -------------------------------
+
+"""
+Closed-loop load generator for server.py: N concurrent clients send requests back
+to back and we report QPS, latency percentiles, errors and 503 rejections.
+
+Usage:
+    python -m agentic_author_ai.loadtest --url http://127.0.0.1:8000 --endpoint retrieve \\
+        --concurrency 16 --requests 500 [--queries queries.txt] [--session "Lseg Notes"]
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .tracing import percentile
+
+def _post(url: str, body: Dict[str, Any], timeout: float) -> int:
+    req = urllib.request.Request(url, data=json.dumps(body).encode("utf-8"),
+                                 headers={"Content-Type": "application/json"}, method="POST")
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            resp.read()
+            return resp.status
+    except urllib.error.HTTPError as e:
+        e.read()
+        return e.code
+
+def run_load(url: str, endpoint: str, queries: List[str], concurrency: int, requests: int,
+             session: Optional[str] = None, timeout: float = 120.0) -> Dict[str, Any]:
+    target = url.rstrip("/") + "/" + endpoint
+    lock = threading.Lock()
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    counter = iter(range(requests))
+
+    def worker() -> None:
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                return
+            q = queries[i % len(queries)]
+            body: Dict[str, Any] = {"prompt": q} if endpoint == "author" else {"query": q}
+            if session:
+                body["session"] = session
+            t0 = time.perf_counter()
+            try:
+                status = _post(target, body, timeout)
+            except Exception:
+                status = -1
+            dt = time.perf_counter() - t0
+            with lock:
+                statuses[status] = statuses.get(status, 0) + 1
+                if status == 200:
+                    latencies.append(dt)
+
+    t0 = time.perf_counter()
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - t0
+
+    ms = [x * 1000.0 for x in latencies]
+    return {
+        "endpoint": endpoint,
+        "concurrency": concurrency,
+        "requests": requests,
+        "ok": len(latencies),
+        "rejected_503": statuses.get(503, 0),
+        "errors": sum(n for s, n in statuses.items() if s not in (200, 503)),
+        "wall_s": round(wall, 3),
+        "qps": round(len(latencies) / wall, 2) if wall else 0.0,
+        "p50_ms": round(percentile(ms, 50), 2),
+        "p95_ms": round(percentile(ms, 95), 2),
+        "p99_ms": round(percentile(ms, 99), 2),
+        "max_ms": round(max(ms), 2) if ms else 0.0,
+    }
+
+def main():
+    ap = argparse.ArgumentParser(description="Load test the agentic-author service")
+    ap.add_argument("--url", default="http://127.0.0.1:8000")
+    ap.add_argument("--endpoint", choices=["retrieve", "answer", "author"], default="retrieve")
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--requests", type=int, default=500)
+    ap.add_argument("--queries", default=None, help="Text file with one query per line")
+    ap.add_argument("--session", default=None)
+    ap.add_argument("--json", action="store_true", help="Print the result as JSON")
+    args = ap.parse_args()
+
+    if args.queries:
+        queries = [l.strip() for l in Path(args.queries).read_text(encoding="utf-8").splitlines() if l.strip()]
+    else:
+        from .benchmark import make_queries
+        queries = make_queries(50)
+
+    res = run_load(args.url, args.endpoint, queries, args.concurrency, args.requests, session=args.session)
+    if args.json:
+        print(json.dumps(res, indent=2))
+        return
+    print(f"{res['endpoint']}: {res['ok']}/{res['requests']} ok, {res['rejected_503']} rejected, "
+          f"{res['errors']} errors in {res['wall_s']}s")
+    print(f"QPS {res['qps']}  p50 {res['p50_ms']} ms  p95 {res['p95_ms']} ms  p99 {res['p99_ms']} ms  "
+          f"max {res['max_ms']} ms")
+
+if __name__ == "__main__":
+    main()
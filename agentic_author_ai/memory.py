@@ -11,28 +11,54 @@ from __future__ import annotations
 from pathlib import Path
 from typing import List, Optional, Union
 from .messages import Message
-import json
+from .session_store import SessionStore
 
 class Memory:
-    """Very small memory with scratchpad and optional JSONL persistence."""
+    """
+    Very small memory with scratchpad and optional JSONL persistence.
 
-    def __init__(self, persist_path: Optional[Union[str, Path]] = None, max_scratch: int = 50):
-        self.scratch: List[Message] = []
+    With persist_path, messages go to a SessionStore (offset index + snapshots), and
+    reopening the same path resumes the session: the last max_scratch messages are
+    loaded lazily, on first use, in O(max_scratch) regardless of history length.
+    """
+
+    def __init__(self, persist_path: Optional[Union[str, Path]] = None, max_scratch: int = 50,
+                 snapshot_every: int = 1000):
         self.persist_path = Path(persist_path) if persist_path else None
         self.max_scratch = max_scratch
-        if self.persist_path:
-            self.persist_path.parent.mkdir(parents=True, exist_ok=True)
+        self.store = (SessionStore(self.persist_path, window=max_scratch, snapshot_every=snapshot_every)
+                      if self.persist_path else None)
+        self._scratch: Optional[List[Message]] = None if self.store is not None else []
+
+    @property
+    def scratch(self) -> List[Message]:
+        if self._scratch is None:   # resume: tail window of the persisted session
+            self._scratch = [Message.from_dict(d) for d in self.store.tail(self.max_scratch)]
+        return self._scratch
 
     def add(self, msg: Message) -> None:
-        self.scratch.append(msg)
-        if len(self.scratch) > self.max_scratch:
-            self.scratch.pop(0)
-        if self.persist_path:
-            with open(self.persist_path, "a", encoding="utf-8") as f:
-                f.write(json.dumps(msg.to_dict(), ensure_ascii=False) + "\n")
+        scratch = self.scratch
+        scratch.append(msg)
+        if len(scratch) > self.max_scratch:
+            scratch.pop(0)
+        if self.store is not None:
+            self.store.append(msg.to_dict())
 
     def last(self, n: int = 1):
         return self.scratch[-n:]
 
     def all(self):
-        return list(self.scratch)
\ No newline at end of file
+        return list(self.scratch)
+
+    def history(self, start: int = 0, stop: Optional[int] = None) -> List[Message]:
+        """Persisted messages start..stop-1 (the scratchpad without persistence)."""
+        if self.store is None:
+            return self.scratch[start:stop]
+        return [Message.from_dict(d) for d in self.store.read(start, stop)]
+
+    def __len__(self) -> int:
+        return len(self.store) if self.store is not None else len(self.scratch)
+
+    def close(self) -> None:
+        if self.store is not None:
+            self.store.close()
@@ -20,4 +20,8 @@ class Message:
     meta: Dict[str, Any] = field(default_factory=dict)
 
     def to_dict(self) -> Dict[str, Any]:
-        return {"role": self.role, "content": self.content, "meta": self.meta}
\ No newline at end of file
+        return {"role": self.role, "content": self.content, "meta": self.meta}
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "Message":
+        return cls(role=d["role"], content=d.get("content", ""), meta=d.get("meta") or {})
\ No newline at end of file
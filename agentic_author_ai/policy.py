@@ -0,0 +1,284 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+# -------------------------------
+# Planner Policy
+# -------------------------------
+
+"""
+Local allow_external decision, so clear-cut prompts skip the LLM planner.
+
+Two layers, both well under a millisecond:
+  1. Rules: explicit phrasing ("cite sources", "own research", "internal notes
+     only", "do not use the web") decides outright. Internal-only rules win over
+     external ones. Mere hints (a year, "current", "references") are not rules.
+  2. A Naive Bayes classifier over prompt terms, trained from the decisions the
+     LLM planner logged to PLANNER_LOG (demo.py appends one line per parsed
+     plan). It is only used after POLICY_MIN_SAMPLES decisions, and only if its
+     cross-validated accuracy on confident predictions is at least 95%.
+
+decide() returns a PolicyDecision with a confidence. demo.py uses it as the plan
+when confidence >= POLICY_CONFIDENCE and calls the LLM planner otherwise. With
+PLANNER_SPECULATE it starts research alongside that call, but only for prompts
+may_speculate() clears: nothing about notes, internal or session material, and
+no internal-only rule. A prompt the planner may refuse still reaches the search
+engine that way, so speculation is off by default.
+
+Usage:
+    python -m agentic_author_ai.policy train            # fit POLICY_MODEL from PLANNER_LOG
+    python -m agentic_author_ai.policy decide "Write a market update with sources"
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .context_pack import terms
+from .rag_config import PLANNER_LOG, POLICY_CONFIDENCE, POLICY_MIN_SAMPLES, POLICY_MODEL
+
+INTERNAL_RULES: List[Tuple[re.Pattern, str]] = [(re.compile(p, re.I), why) for p, why in [
+    (r"\b(no|without|avoid|don'?t use|do not use|never use|not use)\s+(any\s+|the\s+)?"
+     r"(external|outside|web|online|internet|search)\b", "forbids external sources"),
+    (r"\b(do not|don'?t|never|no need to|without)\s+(search(ing)?|brows(e|ing)|go(ing)?\s+online|googl(e|ing)|"
+     r"look(ing)?\s+(it\s+|things\s+|anything\s+)?up|cite external)\b", "forbids web search"),
+    (r"\b(external|outside|web|online)\s+(sources|research|search)\s+(is\s+|are\s+)?(not\s+(allowed|needed)|off)\b",
+     "forbids external sources"),
+    (r"\b(offline|no\s+internet)\b", "forbids external sources"),
+    (r"\b(only|solely|exclusively)\s+(use\s+|from\s+|on\s+)?(my|our|the|internal)\s+(session\s+)?notes\b",
+     "internal notes only"),
+    (r"\b(internal|session)[\s-]+notes?[\s-]+only\b", "internal notes only"),
+]]
+# Explicit requests only. Topic hints (a year, "current", "references") are left to the
+# classifier / LLM planner: "my notes from 2024" is not a request for web research.
+EXTERNAL_RULES: List[Tuple[re.Pattern, str]] = [(re.compile(p, re.I), why) for p, why in [
+    (r"\b(own|independent|additional|external|outside|web)\s+research\b", "asks for research"),
+    (r"\b(cite|citing|citations?|bibliography)\b", "asks for citations"),
+    (r"\b(with|include|including|add|list)\s+(external\s+|web\s+|reputable\s+)?sources\b", "asks for sources"),
+]]
+# Prompts about the user's own material: never sent to web search before the planner allows it
+INTERNAL_HINT = re.compile(r"\b(notes?|internal|session|private|confidential)\b", re.I)
+
+STEPS = ["Outline key sections", "Draft arguments", "Incorporate internal notes", "Revise", "Proofread"]
+INSTRUCTION_TERMS = frozenset("""
+write draft short brief paper post memo page pages words summary summarize explain describe
+please make create give provide using use notes note research sources source own
+""".split())
+
+@dataclass
+class PolicyDecision:
+    allow_external: bool
+    confidence: float          # 0.5 = no idea, 1.0 = certain
+    source: str                # "rule" | "model" | "none"
+    reason: str = ""
+
+    def plan(self, prompt: str) -> Dict[str, Any]:
+        """A planner-shaped plan for this decision (generic steps, focus from the prompt terms)."""
+        focus: List[str] = []
+        for t in terms(prompt):
+            if t not in INSTRUCTION_TERMS and not t.isdigit() and t not in focus:
+                focus.append(t)
+        return {
+            "allow_external": self.allow_external,
+            "rationale": f"Local policy ({self.source}: {self.reason}, confidence {self.confidence:.2f}).",
+            "research_focus": focus[:4] if self.allow_external else [],
+            "steps": list(STEPS),
+        }
+
+
+# -------------------------------
+# Classifier
+# -------------------------------
+
+class PolicyModel:
+    """Bernoulli-style Naive Bayes over the set of prompt terms (Laplace smoothed)."""
+
+    def __init__(self, log_prior: float = 0.0, weights: Optional[Dict[str, float]] = None,
+                 n: int = 0, accuracy: float = 0.0, coverage: float = 0.0):
+        self.log_prior = log_prior           # log P(ext) - log P(int)
+        self.weights = weights or {}         # per-term log-likelihood ratio
+        self.n = n
+        self.accuracy = accuracy             # cross-validated, on confident predictions
+        self.coverage = coverage             # share of prompts predicted confidently
+
+    @classmethod
+    def fit(cls, prompts: Sequence[str], labels: Sequence[bool], alpha: float = 1.0) -> "PolicyModel":
+        n_ext = sum(1 for y in labels if y)
+        n_int = len(labels) - n_ext
+        counts: Dict[str, List[int]] = {}
+        for p, y in zip(prompts, labels):
+            for t in set(terms(p)):
+                counts.setdefault(t, [0, 0])[0 if y else 1] += 1
+        weights = {t: math.log((c[0] + alpha) / (n_ext + 2 * alpha)) - math.log((c[1] + alpha) / (n_int + 2 * alpha))
+                   for t, c in counts.items() if c[0] + c[1] >= 2}
+        prior = math.log((n_ext + alpha) / (n_int + alpha))
+        return cls(prior, weights, n=len(labels))
+
+    def prob_external(self, prompt: str) -> Tuple[float, int]:
+        """P(allow_external) and the number of known terms it rests on."""
+        z, known = self.log_prior, 0
+        for t in set(terms(prompt)):
+            w = self.weights.get(t)
+            if w is not None:
+                z += w
+                known += 1
+        z = max(-30.0, min(30.0, z))
+        return 1.0 / (1.0 + math.exp(-z)), known
+
+    @classmethod
+    def cross_validate(cls, prompts: Sequence[str], labels: Sequence[bool], threshold: float,
+                       folds: int = 5, seed: int = 7) -> Tuple[float, float]:
+        """(accuracy on confident predictions, share predicted confidently) over k folds."""
+        idx = list(range(len(prompts)))
+        random.Random(seed).shuffle(idx)
+        right = confident = 0
+        for f in range(folds):
+            test = set(idx[f::folds])
+            m = cls.fit([prompts[i] for i in idx if i not in test], [labels[i] for i in idx if i not in test])
+            for i in test:
+                p, known = m.prob_external(prompts[i])
+                if known and max(p, 1 - p) >= threshold:
+                    confident += 1
+                    right += int((p >= 0.5) == labels[i])
+        return (right / confident if confident else 0.0), (confident / len(prompts) if prompts else 0.0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"log_prior": self.log_prior, "weights": self.weights, "n": self.n,
+                "accuracy": self.accuracy, "coverage": self.coverage}
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "PolicyModel":
+        return cls(d.get("log_prior", 0.0), d.get("weights", {}), d.get("n", 0),
+                   d.get("accuracy", 0.0), d.get("coverage", 0.0))
+
+    def save(self, path: Path) -> None:
+        path = Path(path)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(json.dumps(self.to_dict()), encoding="utf-8")
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "PolicyModel":
+        return cls.from_dict(json.loads(Path(path).read_text(encoding="utf-8")))
+
+def train(log_path: Path = PLANNER_LOG, out: Path = POLICY_MODEL,
+          threshold: float = POLICY_CONFIDENCE) -> PolicyModel:
+    prompts, labels = read_log(log_path)
+    model = PolicyModel.fit(prompts, labels)
+    model.accuracy, model.coverage = PolicyModel.cross_validate(prompts, labels, threshold)
+    model.save(out)
+    reset_model()
+    return model
+
+
+# -------------------------------
+# Decision log (training data)
+# -------------------------------
+
+_LOG_LOCK = threading.Lock()
+
+def log_decision(prompt: str, allow_external: bool, path: Path = PLANNER_LOG) -> None:
+    """Append an LLM planner decision; best effort (never fails the run)."""
+    rec = {"ts": round(time.time(), 3), "prompt": prompt, "allow_external": bool(allow_external)}
+    try:
+        with _LOG_LOCK, Path(path).open("a", encoding="utf-8") as f:
+            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+    except OSError:
+        pass
+
+def read_log(path: Path = PLANNER_LOG) -> Tuple[List[str], List[bool]]:
+    """Latest decision per prompt from the log."""
+    latest: Dict[str, bool] = {}
+    if Path(path).exists():
+        for line in Path(path).read_text(encoding="utf-8").splitlines():
+            try:
+                rec = json.loads(line)
+                latest[rec["prompt"]] = bool(rec["allow_external"])
+            except (json.JSONDecodeError, KeyError, TypeError):
+                continue
+    return list(latest), list(latest.values())
+
+
+# -------------------------------
+# Decision
+# -------------------------------
+
+_MODEL: Optional[PolicyModel] = None
+_MODEL_MTIME: Optional[float] = None
+_MODEL_LOCK = threading.Lock()
+
+def reset_model() -> None:
+    global _MODEL, _MODEL_MTIME
+    with _MODEL_LOCK:
+        _MODEL, _MODEL_MTIME = None, None
+
+def get_model(path: Path = POLICY_MODEL) -> Optional[PolicyModel]:
+    """The trained model if it exists, has enough samples and validated well (reloaded when retrained)."""
+    global _MODEL, _MODEL_MTIME
+    try:
+        mtime = Path(path).stat().st_mtime
+    except OSError:
+        return None
+    with _MODEL_LOCK:
+        if _MODEL is None or mtime != _MODEL_MTIME:
+            try:
+                _MODEL, _MODEL_MTIME = PolicyModel.load(path), mtime
+            except (OSError, ValueError):
+                return None
+        model = _MODEL
+    if model.n < POLICY_MIN_SAMPLES or model.accuracy < 0.95:
+        return None
+    return model
+
+def may_speculate(prompt: str) -> bool:
+    """True if the prompt may go to web search before the planner has allowed it (see demo.py)."""
+    return not INTERNAL_HINT.search(prompt) and not any(rx.search(prompt) for rx, _ in INTERNAL_RULES)
+
+def decide(prompt: str, model: Optional[PolicyModel] = None) -> PolicyDecision:
+    for rx, why in INTERNAL_RULES:
+        if rx.search(prompt):
+            return PolicyDecision(False, 0.99, "rule", why)
+    for rx, why in EXTERNAL_RULES:
+        if rx.search(prompt):
+            return PolicyDecision(True, 0.99, "rule", why)
+    model = model or get_model()
+    if model is None:
+        return PolicyDecision(False, 0.5, "none", "no trained model")
+    p, known = model.prob_external(prompt)
+    if not known:
+        return PolicyDecision(p >= 0.5, 0.5, "model", "no known terms")
+    return PolicyDecision(p >= 0.5, max(p, 1.0 - p), "model", f"p_external={p:.2f}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Local planner policy: train the classifier or test a prompt")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    t = sub.add_parser("train", help="Fit the classifier from logged planner decisions")
+    t.add_argument("--log", default=str(PLANNER_LOG))
+    t.add_argument("--out", default=str(POLICY_MODEL))
+    d = sub.add_parser("decide", help="Show the local decision for a prompt")
+    d.add_argument("prompt")
+    args = ap.parse_args()
+    if args.cmd == "train":
+        m = train(Path(args.log), Path(args.out))
+        used = "used" if m.n >= POLICY_MIN_SAMPLES and m.accuracy >= 0.95 else "NOT used (needs more/cleaner data)"
+        print(f"trained on {m.n} decisions: cv accuracy {m.accuracy:.3f} on the {m.coverage:.0%} "
+              f"predicted with confidence >= {POLICY_CONFIDENCE}; model {used}")
+    else:
+        t0 = time.perf_counter()
+        dec = decide(args.prompt)
+        us = (time.perf_counter() - t0) * 1e6
+        print(json.dumps({**asdict(dec), "llm_needed": dec.confidence < POLICY_CONFIDENCE,
+                          "decide_us": round(us, 1)}, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -12,60 +12,272 @@ Step 3 & 4: Retrieval, optional re-ranking, and grounded answering.
 Provides make_retrieve_tool(ToolClass) to integrate with your framework.
 """
 
-import argparse, json, re, numpy as np, faiss, os
+import argparse, asyncio, contextvars, functools, json, re, sys, threading, time, weakref, numpy as np, faiss, os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from .rag_config import (
-    FAISS_INDEX, FAISS_METADATA, CHAT_MODEL, EMBED_MODEL,
-    TOP_K, RERANK_TOPN, MAX_CTX_CHARS
+    DATA_DIR, FAISS_INDEX, FAISS_METADATA, INDEX_MANIFEST, CHAT_MODEL, EMBED_MODEL,
+    TOP_K, RERANK_TOPN, MAX_CTX_CHARS, RESCORE_CANDIDATES, SEARCH_THREADS,
+    MMR_LAMBDA, RERANK_MODE, CONTEXT_TOKENS, SHARD_DIR, SHARD_MANIFEST, SHARD_CACHE_BYTES,
+    INDEX_MMAP, INDEX_ROOT, INDEX_POLL_S, RETRIEVAL_CACHE_SIZE
 )
 
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
-def load_index_meta():
-    index = faiss.read_index(str(FAISS_INDEX))
-    meta  = json.loads(Path(FAISS_METADATA).read_text())
+from .tracing import (TRACE_LOG, clear_trace, current_span, trace_span, traced, format_summary, export_trace,
+                      merge_events)
+from .vectors import load_stored_index
+from .shards import ShardedIndex
+from . import snapshots
+from .snapshots import Snapshot
+from .context_pack import blocks_from_chunks, citation_label, pack_blocks, render_blocks
+from .result_cache import ResultCache
+
+def current_snapshot() -> Snapshot:
+    """The published index snapshot (snapshots.py), or the pre-snapshot files in DATA_DIR."""
+    return snapshots.current(INDEX_ROOT, legacy_dir=DATA_DIR)
+
+def load_index_meta(snap: Optional[Snapshot] = None):
+    # StoredIndex takes full-width query vectors and applies the index's own
+    # truncation / precision / rescoring settings (see vectors.py).
+    snap = snap or current_snapshot()
+    with trace_span("index.load", snapshot=snap.id):
+        index = load_stored_index(snap.path(FAISS_INDEX.name), snap.path(INDEX_MANIFEST.name),
+                                  rescore_candidates=RESCORE_CANDIDATES, mmap=INDEX_MMAP)
+        meta  = json.loads(snap.path(FAISS_METADATA.name).read_text())
     return index, meta
 
+@dataclass
+class LoadedIndex:
+    """One opened snapshot: monolithic (index + meta) or sharded (shards load lazily)."""
+    snapshot: str
+    index: Any = None
+    meta: Optional[List[Dict[str, Any]]] = None
+    sharded: Optional[ShardedIndex] = None
+
+def open_snapshot(snap: Snapshot) -> LoadedIndex:
+    shard_manifest = snap.path(SHARD_DIR.name) / Path(SHARD_MANIFEST).name
+    if shard_manifest.exists():
+        return LoadedIndex(snap.id, sharded=ShardedIndex(
+            shard_manifest, max_bytes=SHARD_CACHE_BYTES, rescore_candidates=RESCORE_CANDIDATES,
+            threads=SEARCH_THREADS, mmap=INDEX_MMAP))
+    index, meta = load_index_meta(snap)
+    return LoadedIndex(snap.id, index=index, meta=meta)
+
+# Process-wide warm snapshot. Readers take one reference per query, so a swap to a
+# newer snapshot never changes the index or metadata under a running query.
+_INDEX_LOCK = threading.Lock()
+_ACTIVE: Optional[LoadedIndex] = None
+_LAST_CHECK = 0.0
+_SWAPPING = False
+
+def active_index() -> LoadedIndex:
+    """The warm snapshot, loaded on first use; checks for a newer one every INDEX_POLL_S."""
+    global _ACTIVE, _LAST_CHECK
+    active = _ACTIVE
+    if active is None:
+        with _INDEX_LOCK:
+            if _ACTIVE is None:
+                _ACTIVE = open_snapshot(current_snapshot())
+                _LAST_CHECK = time.monotonic()
+                RESULT_CACHE.use_snapshot(_ACTIVE.snapshot)
+            return _ACTIVE
+    if time.monotonic() - _LAST_CHECK >= INDEX_POLL_S:
+        _LAST_CHECK = time.monotonic()
+        refresh_index(wait=False)
+    return active
+
+def refresh_index(wait: bool = True) -> bool:
+    """
+    Swap to the published snapshot if it differs from the active one. The new snapshot
+    is opened before the swap (in the background unless wait=True), so queries keep
+    running on the old one meanwhile. Returns True if a swap happened (or was started).
+    """
+    global _SWAPPING
+    ptr = snapshots.read_pointer(INDEX_ROOT)
+    active = _ACTIVE
+    if not ptr or active is None or ptr["snapshot"] == active.snapshot:
+        return False
+    with _INDEX_LOCK:
+        if _SWAPPING:
+            return False
+        _SWAPPING = True
+
+    def swap() -> None:
+        global _ACTIVE, _SWAPPING
+        try:
+            with trace_span("index.swap", snapshot=ptr["snapshot"]):
+                loaded = open_snapshot(current_snapshot())
+            with _INDEX_LOCK:
+                _ACTIVE = loaded
+                RESULT_CACHE.use_snapshot(loaded.snapshot)
+        except Exception as e:
+            print(f"Index swap to {ptr['snapshot']} failed, keeping {active.snapshot}: {e}", file=sys.stderr)
+        finally:
+            _SWAPPING = False
+
+    if wait:
+        swap()
+    else:
+        threading.Thread(target=swap, name="agentic-index-swap", daemon=True).start()
+    return True
+
+def get_index_meta():
+    """(index, meta) of the active monolithic snapshot; (None, None) for a sharded one."""
+    a = active_index()
+    return a.index, a.meta
+
+def get_sharded_index() -> Optional[ShardedIndex]:
+    """The active snapshot's shards (index.py --shard-by), else None."""
+    return active_index().sharded
+
+def clear_index_cache() -> None:
+    """Forget the warm snapshot; the next query opens whatever is published then."""
+    global _ACTIVE
+    with _INDEX_LOCK:
+        _ACTIVE = None
+    RESULT_CACHE.clear()
+
+@functools.lru_cache(maxsize=1)
 def _client() -> OpenAI:
+    # One client (and its HTTP connection pool) per process; it is thread-safe.
     return OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
-def embed_query(q: str) -> np.ndarray:
+def embed_queries(queries: Sequence[str]) -> np.ndarray:
+    """Embed several queries with a single API call; rows are L2-normalised."""
     client = _client()
-    r = client.embeddings.create(model=EMBED_MODEL, input=[q])
-    v = np.array(r.data[0].embedding, dtype="float32").reshape(1, -1)
-    faiss.normalize_L2(v)
-    return v
+    with trace_span("embed", n=len(queries)) as span:
+        r = client.embeddings.create(model=EMBED_MODEL, input=list(queries))
+        span.record_usage(r)
+    V = np.array([d.embedding for d in sorted(r.data, key=lambda d: d.index)], dtype="float32")
+    faiss.normalize_L2(V)
+    return V
+
+def embed_query(q: str) -> np.ndarray:
+    return embed_queries([q])
+
+def search_vectors(index, V: np.ndarray, n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """One FAISS search for a whole batch of query vectors."""
+    with trace_span("faiss.search", k=n, nq=int(V.shape[0]), ntotal=int(index.ntotal)):
+        return index.search(V, n)
+
+def search_candidates(V: np.ndarray, n: int,
+                      include: Optional[Dict[str, List[str]]] = None,
+                      active: Optional[LoadedIndex] = None) -> List[Tuple[List[Dict[str, Any]], Sequence[int], Any]]:
+    """
+    Raw hits for each query row as (meta, ids, index) ready for select_candidates.
+    Sharded: only the shards the filter needs (scatter-gather when it doesn't name any).
+    """
+    a = active or active_index()
+    if a.sharded is not None:
+        return [(view.meta, range(len(view.meta)), view) for view in a.sharded.search(V, n, include)]
+    _, I = search_vectors(a.index, V, n)
+    return [(a.meta, I[r], a.index) for r in range(V.shape[0])]
+
+def _meta_matches(m: Dict[str, Any], include: Dict[str, List[str]]) -> bool:
+    for key, vals in include.items():
+        mv = m.get(key)
+        if isinstance(mv, list):
+            if not any(v in mv for v in vals): return False
+        else:
+            if mv not in vals: return False
+    return True
+
+def _matches(c: Dict[str, Any], include: Dict[str, List[str]]) -> bool:
+    m = c.get("meta", {})
+    # Near-duplicates collapsed at ingest (dedup.py) keep their sources under
+    # "provenance"; the chunk matches if any of its sources does.
+    return _meta_matches(m, include) or any(_meta_matches(p, include) for p in m.get("provenance", ()))
 
+def mmr_select(qv: np.ndarray, C: np.ndarray, k: int, lam: float = 0.7) -> List[int]:
+    """
+    Maximal marginal relevance over candidate vectors C (rows, L2-normalised):
+    greedily pick argmax lam*sim(q, c) - (1-lam)*max_{s in picked} sim(c, s).
+    One (n x n) similarity matrix, then O(k*n) vector ops; returns row positions.
+    """
+    n = C.shape[0]
+    if n == 0 or k <= 0:
+        return []
+    rel = C @ qv
+    if lam >= 1.0 or n <= 1:
+        return list(np.argsort(-rel)[:k])
+    S = C @ C.T
+    picked: List[int] = []
+    max_sim = np.full(n, -np.inf, dtype="float32")
+    available = np.ones(n, dtype=bool)
+    for _ in range(min(k, n)):
+        score = lam * rel - (1.0 - lam) * np.where(np.isfinite(max_sim), max_sim, 0.0)
+        score[~available] = -np.inf
+        j = int(np.argmax(score))
+        picked.append(j)
+        available[j] = False
+        max_sim = np.maximum(max_sim, S[:, j])
+    return picked
+
+def select_candidates(meta: List[Dict[str, Any]], ids: Sequence[int], k: int,
+                      include: Optional[Dict[str, List[str]]] = None,
+                      index=None, qv: Optional[np.ndarray] = None,
+                      mmr_lambda: float = MMR_LAMBDA) -> List[Dict[str, Any]]:
+    """
+    Filter raw search hits (in score order), drop repeated chunks, and pick k.
+    With the index and query vector, the pick is MMR over the candidates' stored
+    vectors (reconstruct_batch), so near-identical passages don't crowd the top-k;
+    otherwise it is the top k by similarity.
+    """
+    keep_ids, seen = [], set()
+    for i in ids:
+        if i == -1: continue
+        c = meta[i]
+        if include and not _matches(c, include): continue
+        key = c.get("id") or c.get("text")
+        if key in seen: continue
+        seen.add(key)
+        keep_ids.append(int(i))
+
+    if index is not None and qv is not None and mmr_lambda < 1.0 and len(keep_ids) > k:
+        with trace_span("mmr", n=len(keep_ids), k=k):
+            C = np.asarray(index.reconstruct_batch(np.asarray(keep_ids, dtype="int64")), dtype="float32")
+            C /= np.maximum(np.linalg.norm(C, axis=1, keepdims=True), 1e-12)
+            q = np.asarray(qv, dtype="float32").reshape(-1)[: C.shape[1]]
+            order = mmr_select(q / max(float(np.linalg.norm(q)), 1e-12), C, k, mmr_lambda)
+        keep_ids = [keep_ids[j] for j in order]
+    return [meta[i] for i in keep_ids[:k]]
+
+# Final retrieve() results of the active snapshot; emptied when a new one is swapped in.
+RESULT_CACHE = ResultCache(RETRIEVAL_CACHE_SIZE)
+
+def cached_result(active: LoadedIndex, query: str, k: int,
+                  include: Optional[Dict[str, List[str]]], mmr_lambda: float):
+    """(cache key, cached chunks or None) for a retrieval against `active`."""
+    key = ResultCache.key(query, include, k, mmr_lambda)
+    hit = RESULT_CACHE.get(key, active.snapshot)
+    span = current_span()
+    if span is not None:
+        span.set(cache="hit" if hit is not None else "miss")
+    return key, hit
+
+@traced("retrieve")
 def retrieve(query: str, k: int = TOP_K,
-             include: Optional[Dict[str, List[str]]] = None) -> List[Dict[str, Any]]:
-    index, meta = load_index_meta()
+             include: Optional[Dict[str, List[str]]] = None,
+             mmr_lambda: float = MMR_LAMBDA) -> List[Dict[str, Any]]:
+    active = active_index()
+    key, hit = cached_result(active, query, k, include, mmr_lambda)
+    if hit is not None:
+        return hit
     v = embed_query(query)
-    D, I = index.search(v, k * 8)
-    cands = [meta[i] for i in I[0] if i != -1]
-
-    if include:
-        def keep(c):
-            m = c.get("meta", {})
-            for key, vals in include.items():
-                mv = m.get(key)
-                if isinstance(mv, list):
-                    if not any(v in mv for v in vals): return False
-                else:
-                    if mv not in vals: return False
-            return True
-        cands = [c for c in cands if keep(c)]
-
-    out, seen = [], set()
-    for c in cands:
-        tag = (c["meta"].get("source",""), c["meta"].get("section",""))
-        if tag in seen: continue
-        seen.add(tag)
-        out.append(c)
-        if len(out) >= k: break
+    out = search_and_select(v, k, include, active, mmr_lambda)
+    RESULT_CACHE.put(key, active.snapshot, out)
     return out
 
+def search_and_select(v: np.ndarray, k: int, include: Optional[Dict[str, List[str]]],
+                      active: LoadedIndex, mmr_lambda: float = MMR_LAMBDA) -> List[Dict[str, Any]]:
+    """FAISS search for one query vector, then filtering / MMR (may read mapped vectors from disk)."""
+    meta, ids, index = search_candidates(v, k * 8, include, active=active)[0]
+    return select_candidates(meta, ids, k, include, index=index, qv=v[0], mmr_lambda=mmr_lambda)
+
 def rerank(query: str, chunks: List[Dict[str, Any]], topn: int = RERANK_TOPN) -> List[Dict[str, Any]]:
     client = _client()
     scored: List[Tuple[float, Dict[str, Any]]] = []
@@ -75,11 +287,13 @@ def rerank(query: str, chunks: List[Dict[str, Any]], topn: int = RERANK_TOPN) ->
             f"Chunk:\n{c['text'][:2000]}\n\n"
             "Only output a number from 0-10 for usefulness."
         )
-        r = client.chat.completions.create(
-            model=CHAT_MODEL,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0,
-        )
+        with trace_span("rerank", model=CHAT_MODEL) as span:
+            r = client.chat.completions.create(
+                model=CHAT_MODEL,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0,
+            )
+            span.record_usage(r)
         txt = (r.choices[0].message.content or "").strip()
         try:
             num = float(re.findall(r"[0-9]+(?:\.[0-9]+)?", txt)[0])
@@ -95,37 +309,112 @@ SYSTEM = (
     "Cite sources as [source:pp.start-end] or [session:section]. Be concise."
 )
 
-def build_context(chunks: List[Dict[str, Any]], max_chars: int = MAX_CTX_CHARS) -> str:
-    blocks = []
+def build_context(chunks: List[Dict[str, Any]], max_chars: int = MAX_CTX_CHARS,
+                  query: Optional[str] = None, max_tokens: int = CONTEXT_TOKENS) -> str:
+    """
+    Labelled context for the prompt. With a query and a token budget, the chunks are
+    packed to their most relevant sentences (context_pack.py); otherwise whole chunks
+    are kept until max_chars, never cutting a chunk mid-way.
+    """
+    if query and max_tokens:
+        with trace_span("context.pack", chunks=len(chunks), max_tokens=max_tokens) as span:
+            packed, stats = pack_blocks(query, blocks_from_chunks(chunks), max_tokens=max_tokens)
+            span.set(**stats.to_dict())
+        return render_blocks(packed)
+    blocks, total = [], 0
     for c in chunks:
-        m = c.get("meta", {})
-        label = m.get("source") or m.get("session") or "source"
-        pstart, pend = m.get("page_start"), m.get("page_end")
-        cite = f"{label}"
-        if pstart and pend: cite += f":pp.{pstart}-{pend}"
-        section = m.get("section")
-        if section: cite += f" §{section}"
-        blocks.append(f"[{cite}]\n{c['text']}")
+        block = f"[{citation_label(c.get('meta', {}))}]\n{c['text']}"
+        if blocks and total + len(block) > max_chars:
+            break
+        blocks.append(block)
+        total += len(block) + 7
     return "\n\n---\n\n".join(blocks)[:max_chars]
 
 def answer(query: str,
            filters: Optional[Dict[str, List[str]]] = None,
-           use_rerank: bool = True) -> str:
-    chunks = retrieve(query, k=TOP_K, include=filters)
+           use_rerank: bool = True,
+           retrieve_fn=None,
+           rerank_mode: str = RERANK_MODE,
+           ctx_tokens: int = CONTEXT_TOKENS) -> str:
+    """
+    rerank_mode "mmr" keeps retrieve()'s diversity-aware order and trims to
+    RERANK_TOPN (no extra LLM calls); "llm" scores every chunk with the chat model.
+    ctx_tokens is the packed-context budget (0 pastes whole chunks up to MAX_CTX_CHARS).
+    """
+    chunks = (retrieve_fn or retrieve)(query, k=TOP_K, include=filters)
     if use_rerank and chunks:
-        chunks = rerank(query, chunks, topn=min(RERANK_TOPN, len(chunks)))
-    ctx = build_context(chunks)
+        if rerank_mode == "llm":
+            chunks = rerank(query, chunks, topn=min(RERANK_TOPN, len(chunks)))
+        else:
+            chunks = chunks[:RERANK_TOPN]
+    ctx = build_context(chunks, query=query, max_tokens=ctx_tokens)
     client = _client()
-    r = client.chat.completions.create(
-        model=CHAT_MODEL,
-        messages=[
-            {"role": "system", "content": SYSTEM},
-            {"role": "user", "content": f"Question: {query}\n\nContext:\n{ctx}"}
-        ],
-        temperature=0.2,
-    )
+    with trace_span("answer", model=CHAT_MODEL, ctx_chars=len(ctx)) as span:
+        r = client.chat.completions.create(
+            model=CHAT_MODEL,
+            messages=[
+                {"role": "system", "content": SYSTEM},
+                {"role": "user", "content": f"Question: {query}\n\nContext:\n{ctx}"}
+            ],
+            temperature=0.2,
+        )
+        span.record_usage(r)
     return r.choices[0].message.content
 
+# -----------------
+# Async retrieval (never blocks the event loop)
+# -----------------
+
+# FAISS releases the GIL while searching, so a small dedicated pool gives real
+# parallelism without competing with the loop's default executor.
+_SEARCH_POOL = ThreadPoolExecutor(max_workers=SEARCH_THREADS, thread_name_prefix="agentic-faiss")
+
+# httpx async clients are bound to the loop that created them: one client per loop.
+_ACLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = weakref.WeakKeyDictionary()
+
+def _aclient() -> AsyncOpenAI:
+    loop = asyncio.get_running_loop()
+    client = _ACLIENTS.get(loop)
+    if client is None:
+        client = _ACLIENTS[loop] = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    return client
+
+async def aembed_queries(queries: Sequence[str]) -> np.ndarray:
+    with trace_span("embed", n=len(queries), mode="async") as span:
+        r = await _aclient().embeddings.create(model=EMBED_MODEL, input=list(queries))
+        span.record_usage(r)
+    V = np.array([d.embedding for d in sorted(r.data, key=lambda d: d.index)], dtype="float32")
+    faiss.normalize_L2(V)
+    return V
+
+async def aactive_index() -> LoadedIndex:
+    """active_index() with the first load and the snapshot pointer polls done off the event loop."""
+    active = _ACTIVE
+    if active is not None and time.monotonic() - _LAST_CHECK < INDEX_POLL_S:
+        return active
+    return await asyncio.get_running_loop().run_in_executor(_SEARCH_POOL, active_index)
+
+async def asearch_vectors(index, V: np.ndarray, n: int) -> Tuple[np.ndarray, np.ndarray]:
+    ctx = contextvars.copy_context()  # keep the caller's trace span as parent
+    return await asyncio.get_running_loop().run_in_executor(
+        _SEARCH_POOL, functools.partial(ctx.run, search_vectors, index, V, n))
+
+async def aretrieve(query: str, k: int = TOP_K,
+                    include: Optional[Dict[str, List[str]]] = None,
+                    mmr_lambda: float = MMR_LAMBDA) -> List[Dict[str, Any]]:
+    """Async twin of retrieve(): async embeddings call; search and MMR selection on _SEARCH_POOL."""
+    with trace_span("retrieve", mode="async"):
+        active = await aactive_index()
+        key, hit = cached_result(active, query, k, include, mmr_lambda)
+        if hit is not None:
+            return hit
+        v = await aembed_queries([query])
+        ctx = contextvars.copy_context()   # keep the retrieve span as parent
+        out = await asyncio.get_running_loop().run_in_executor(
+            _SEARCH_POOL, functools.partial(ctx.run, search_and_select, v, k, include, active, mmr_lambda))
+        RESULT_CACHE.put(key, active.snapshot, out)
+        return out
+
 # -----------------
 # Tool factory (no circular import)
 # -----------------
@@ -133,13 +422,14 @@ def make_retrieve_tool(ToolClass):
     """Factory that creates a Tool instance using the provided Tool class."""
     async def _retrieve(query: str, session: Optional[str] = None) -> str:
         filters = {"session": [session]} if session else None
-        chunks = retrieve(query, k=TOP_K, include=filters)
+        chunks = await aretrieve(query, k=TOP_K, include=filters)
         lines = [f"[retrieve] {len(chunks)} matches for: {query}"]
         for c in chunks[:5]:
             m = c.get("meta", {})
             src = m.get("source", "")
             sec = m.get("section", "")
-            lines.append(f"- {src} §{sec}: {c['text'][:160].replace('\\n',' ')}…")
+            snippet = c["text"][:160].replace("\n", " ")
+            lines.append(f"- {src} §{sec}: {snippet}…")
         return "\n".join(lines)
     return ToolClass(
         name="retrieve",
@@ -148,14 +438,69 @@ def make_retrieve_tool(ToolClass):
         func=_retrieve,
     )
 
+# -----------------
+# Worker pool
+# -----------------
+_MODULE = __spec__.name if __spec__ is not None else "agentic_author_ai.query"
+
+def _worker_init() -> None:
+    # Workers come from a clean forkserver (or spawn) process, never a fork of this
+    # one, which may have search / swap / speculation threads running. Each opens the
+    # snapshot itself; with INDEX_MMAP that maps the same files, so all workers share
+    # the pages the parent already brought into the page cache.
+    clear_trace()
+    active_index()
+
+def _worker_answer(job: Tuple[str, Dict[str, Any]]) -> Tuple[str, str, List[Any]]:
+    q, kwargs = job
+    clear_trace()
+    out = answer(q, **kwargs)
+    return q, out, list(TRACE_LOG)
+
+def answer_many(queries: Sequence[str], workers: int = 1, **kwargs: Any) -> List[Tuple[str, str]]:
+    """
+    answer() for many queries on a pool of worker processes. The index is opened in
+    the parent first, so its files are in the page cache and workers (memory-mapping
+    the same files, INDEX_MMAP) start warm without each reading rag.faiss into
+    private memory. kwargs are passed to answer() (must be picklable).
+    """
+    active_index()
+    if workers <= 1:
+        return [(q, answer(q, **kwargs)) for q in queries]
+    import multiprocessing as mp
+    method = "forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn"
+    mctx = mp.get_context(method)
+    if method == "forkserver":
+        # Workers fork from a server that already imported this module (and faiss/numpy). Under
+        # `python -m agentic_author_ai.query` __name__ is "__main__", which the server can't import.
+        mctx.set_forkserver_preload([_MODULE])
+    results = []
+    with mctx.Pool(workers, initializer=_worker_init) as pool:
+        for q, out, events in pool.imap(_worker_answer, [(q, kwargs) for q in queries]):
+            merge_events(events)   # worker spans, moved onto this process's timeline
+            results.append((q, out))
+    return results
+
 # CLI
 def _cli():
     ap = argparse.ArgumentParser()
-    ap.add_argument("--q", required=True, help="User query")
+    ap.add_argument("--q", default=None, help="User query")
+    ap.add_argument("--queries", default=None, help="File with one query per line (answers printed as JSONL)")
+    ap.add_argument("--workers", type=int, default=1, help="Worker processes for --queries (index memory-mapped and shared)")
     ap.add_argument("--filter", nargs=2, metavar=("KEY","VALUE"),
                     action="append", help="Filter like: --filter session 'Lseg Notes'")
-    ap.add_argument("--no-rerank", action="store_true", help="Disable LLM re-ranking")
+    ap.add_argument("--no-rerank", action="store_true", help="Disable re-ranking (pass all TOP_K chunks)")
+    ap.add_argument("--rerank-mode", choices=("mmr", "llm"), default=RERANK_MODE,
+                    help="llm: LLM-score each chunk (default); mmr: keep the diversity order from stored vectors")
+    ap.add_argument("--mmr-lambda", type=float, default=MMR_LAMBDA,
+                    help="Relevance/diversity trade-off for retrieval (1.0 = plain top-k)")
+    ap.add_argument("--ctx-tokens", type=int, default=CONTEXT_TOKENS,
+                    help="Token budget for the packed context (0 = whole chunks)")
+    ap.add_argument("--trace", action="store_true", help="Print per-stage latency summary (p50/p95/p99)")
+    ap.add_argument("--trace-out", default=None, help="Export spans (.jsonl, or Chrome trace .json)")
     args = ap.parse_args()
+    if not args.q and not args.queries:
+        ap.error("one of --q or --queries is required")
 
     filters = None
     if args.filter:
@@ -163,7 +508,20 @@ def _cli():
         for k, v in args.filter:
             filters.setdefault(k, []).append(v)
 
-    print(answer(args.q, filters=filters, use_rerank=not args.no_rerank))
+    retrieve_fn = functools.partial(retrieve, mmr_lambda=args.mmr_lambda)
+    kwargs = dict(filters=filters, use_rerank=not args.no_rerank, retrieve_fn=retrieve_fn,
+                  rerank_mode=args.rerank_mode, ctx_tokens=args.ctx_tokens)
+    if args.queries:
+        qs = [l.strip() for l in Path(args.queries).read_text(encoding="utf-8").splitlines() if l.strip()]
+        for q, out in answer_many(qs, workers=args.workers, **kwargs):
+            print(json.dumps({"query": q, "answer": out}, ensure_ascii=False))
+    else:
+        print(answer(args.q, **kwargs))
+
+    if args.trace:
+        print("\n" + format_summary())
+    if args.trace_out:
+        print(f"[trace written to {export_trace(args.trace_out)}]")
 
 if __name__ == "__main__":
     _cli()
@@ -12,17 +12,25 @@ Central config for your RAG pipeline.
 Edit paths/models here and all modules will stay in sync.
 """
 
+import os
 from pathlib import Path
 
-# Storage locations (default to repo-local "data/" folder if present, else /mnt/data)
-DATA_DIR = Path(__file__).parent / "data"
-DATA_DIR.mkdir(exist_ok=True)
+# Storage locations (default to repo-local "data/" folder; AGENTIC_DATA_DIR overrides,
+# e.g. for benchmarks that work on a scratch corpus)
+DATA_DIR = Path(os.getenv("AGENTIC_DATA_DIR") or Path(__file__).parent / "data")
+DATA_DIR.mkdir(parents=True, exist_ok=True)
 
 # Artifacts
 CHUNKS_JSON     = DATA_DIR / "chunks.json"
 CHUNKS_JSONL    = DATA_DIR / "chunks.jsonl"
 FAISS_INDEX     = DATA_DIR / "rag.faiss"
 FAISS_METADATA  = DATA_DIR / "rag_meta.json"
+INDEX_MANIFEST  = DATA_DIR / "rag_index.json"     # storage format of rag.faiss (see vectors.py)
+FULL_VECTORS    = DATA_DIR / "rag_vectors.npy"    # full float32 vectors for exact rescoring
+SHARD_DIR       = DATA_DIR / "shards"             # per-session (or per-key) shards, see shards.py
+SHARD_MANIFEST  = SHARD_DIR / "manifest.json"
+INDEX_ROOT      = DATA_DIR / "index"              # versioned snapshots + CURRENT pointer (snapshots.py)
+EXTRACT_CACHE_DIR = DATA_DIR / "extract_cache"    # raw PDF page text per (file hash, backend) (extractors.py)
 
 # Models
 EMBED_MODEL = "text-embedding-3-large"   # or "text-embedding-3-small" for speed/cost
@@ -32,3 +40,38 @@ CHAT_MODEL  = "gpt-4.1-mini"             # can swap to your preferred chat model
 TOP_K          = 8
 RERANK_TOPN    = 6
 MAX_CTX_CHARS  = 12000
+SEARCH_THREADS = 4      # dedicated FAISS search threads for the async retrieval path
+MMR_LAMBDA     = 0.7    # relevance vs. diversity when picking TOP_K from the candidates (1.0 = plain top-k)
+RERANK_MODE    = "llm"  # "llm": LLM-score each chunk; "mmr": keep retrieve()'s MMR order, no extra LLM calls
+CONTEXT_TOKENS = 3000   # prompt budget for packed context (context_pack.py); 0 = paste whole chunks
+RETRIEVAL_CACHE_SIZE = 4096  # cached retrieve() results per index snapshot (result_cache.py); 0 = off
+
+# Vector storage (index.py defaults; see vectors.py)
+INDEX_STORAGE       = "float32"   # "float32" | "float16" | "int8"
+INDEX_DIM           = None        # e.g. 1024 to keep only the first 1024 dims (Matryoshka truncation)
+RESCORE_CANDIDATES  = 64          # exact float32 rescoring of this many candidates when full vectors exist
+SHARD_CACHE_BYTES   = 2 << 30     # LRU budget for loaded shards (approx. vectors + metadata)
+INDEX_MMAP          = True        # memory-map indexes so worker processes share the page cache
+INDEX_KEEP_SNAPSHOTS = 3          # snapshots kept after each publish
+INDEX_GC_GRACE_S    = 300.0       # never delete a snapshot younger than this
+INDEX_POLL_S        = 2.0         # how often readers check for a newly published snapshot
+
+# Document extraction (chunking.py; see extractors.py)
+PDF_BACKEND            = "auto"   # "auto" | "pdfium" | "pypdf" | "pypdf2" | "pdfminer" | "raw"
+EXTRACT_WORKERS        = min(8, os.cpu_count() or 1)   # processes for page-parallel PDF extraction
+PDF_PARALLEL_MIN_PAGES = 32       # smaller PDFs are extracted in-process
+DOCX_BACKEND           = "stream" # "stream" (iterparse, constant memory) | "python-docx" | "regex"
+
+# Latency budgets (demo.py --deadline; see deadline.py)
+STAGE_ESTIMATES_S = {   # prior per-stage latency until enough runs have been observed
+    "planner": 1.5, "retrieve": 0.5, "research": 4.0, "author": 8.0, "editor": 5.0,
+}
+MIN_CALL_TIMEOUT_S = 0.5  # never give a model call less than this, even when over budget
+
+# Planner policy (demo.py; see policy.py)
+PLANNER_POLICY     = "auto"   # "auto": local decision when confident, else LLM | "llm": always | "local": never LLM
+POLICY_CONFIDENCE  = 0.9      # local decisions below this go to the LLM planner
+POLICY_MIN_SAMPLES = 30       # logged planner decisions needed before the classifier is trusted
+PLANNER_SPECULATE  = False    # start research alongside an LLM planner call (sends the prompt to search first)
+PLANNER_LOG        = DATA_DIR / "planner_log.jsonl"   # LLM planner decisions (training data)
+POLICY_MODEL       = DATA_DIR / "policy_model.json"   # trained classifier (python -m agentic_author_ai.policy train)
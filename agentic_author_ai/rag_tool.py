@@ -26,5 +26,5 @@ except Exception:
     from tools import Tool  # type: ignore
     from query import make_retrieve_tool  # type: ignore
 
-# Build a Tool instance named "retrieve" that uses the RAG pipeline
-retrieve_tool: Tool = make_retrieve_tool()
+# Build a Tool instance named "retrieve" that uses the async RAG pipeline (query.aretrieve)
+retrieve_tool: Tool = make_retrieve_tool(Tool)
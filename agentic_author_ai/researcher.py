@@ -7,19 +7,55 @@
 # Researcher
 # -------------------------------
 
+"""
+Web search + excerpt extraction for external sources.
+
+Candidate pages are fetched concurrently. Each download is streamed, gated on
+Content-Type (HTML / plain text only) and stops after MAX_PAGE_BYTES. Readability
+and lxml parsing run on a small process pool so they don't hold up the
+downloads. The page text is split into passages, and the excerpt is the passage
+that ranks best against the query (BM25, context_pack.bm25_scores) instead of
+the first EXCERPT_CHARS characters, which are often navigation or boilerplate.
+
+Usage:
+    from .researcher import gather_sources
+    sources = gather_sources("stablecoin regulation 2025", max_sources=4)
+"""
+
 from __future__ import annotations
+import atexit
+import contextvars
+import os
 import re
+import threading
 import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeout
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
+from urllib.parse import urlsplit
 
 import requests
 from ddgs import DDGS
 from readability import Document
-from lxml import html  # noqa: F401
+from lxml import html
+
+from .context_pack import bm25_scores, split_sentences
+from .tracing import trace_span
 
 USER_AGENT = "agentic-author-ai/1.0 (+https://github.com/siegfrkn/agentic-author-ai)"
 DEFAULT_TIMEOUT = 12
+# Optional search endpoint returning a JSON list of {title, href, body} (e.g. the offline
+# stub in stubs.py). When unset, DuckDuckGo is used.
+SEARCH_URL = os.getenv("AGENTIC_SEARCH_URL")
+
+# Page download / excerpt limits
+MAX_PAGE_BYTES = 1_000_000          # stop reading a response after this many bytes
+TEXT_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
+EXCERPT_CHARS = 800
+FETCH_WORKERS = 8                   # max concurrent downloads per gather_sources call
+PARSE_WORKERS = min(4, os.cpu_count() or 1)   # processes for readability/lxml; 0 = parse in-thread
 
 # Prefer reputable domains first; tweak as you like.
 PREFERRED_DOMAINS = [
@@ -40,6 +76,7 @@ class SourceItem:
     title: str
     url: str
     excerpt: str
+    fetched: bool = True   # False: excerpt is the search snippet (page not fetched/parsed)
 
 def _good_url(u: str) -> bool:
     if not u.startswith("http"):
@@ -52,39 +89,215 @@ def _domain_score(u: str) -> int:
             return 1000 - i
     return 0
 
-def search_web(query: str, max_results: int = 8) -> List[Dict[str, Any]]:
+def _search_raw(query: str, max_results: int, timeout: float = DEFAULT_TIMEOUT) -> List[Dict[str, Any]]:
+    if SEARCH_URL:
+        resp = requests.get(SEARCH_URL, params={"q": query, "max_results": max_results},
+                            headers={"User-Agent": USER_AGENT}, timeout=timeout)
+        resp.raise_for_status()
+        return list(resp.json())
+    with DDGS(timeout=max(1, int(timeout))) as ddgs:
+        return list(ddgs.text(query, max_results=max_results, safesearch="moderate"))
+
+def search_web(query: str, max_results: int = 8, timeout: float = DEFAULT_TIMEOUT) -> List[Dict[str, Any]]:
     results: List[Dict[str, Any]] = []
-    with DDGS() as ddgs:
-        for r in ddgs.text(query, max_results=max_results, safesearch="moderate"):
+    with trace_span("research.search", max_results=max_results):
+        for r in _search_raw(query, max_results, timeout):
             if r and "href" in r and _good_url(r["href"]):
                 r["_score"] = _domain_score(r["href"])
                 results.append(r)
     results.sort(key=lambda x: x.get("_score", 0), reverse=True)
     return results
 
-def _fetch_excerpt(url: str, timeout: int = DEFAULT_TIMEOUT) -> Optional[str]:
+def _download(url: str, timeout: float = DEFAULT_TIMEOUT,
+              max_bytes: int = MAX_PAGE_BYTES) -> Optional[Tuple[str, str]]:
+    """(text, content type) of a page, at most max_bytes read; None for non-text responses."""
+    with trace_span("research.fetch", url=url) as span:
+        with requests.get(url, headers={"User-Agent": USER_AGENT}, timeout=timeout, stream=True) as resp:
+            resp.raise_for_status()
+            ctype = (resp.headers.get("Content-Type") or "text/html").split(";")[0].strip().lower()
+            span.set(status=resp.status_code, content_type=ctype)
+            if ctype not in TEXT_TYPES:
+                span.set(skipped="content-type")
+                return None
+            buf = bytearray()
+            for block in resp.iter_content(chunk_size=64 * 1024):
+                buf += block
+                if len(buf) >= max_bytes:
+                    span.set(truncated=True)
+                    break
+            del buf[max_bytes:]
+            span.set(bytes=len(buf))
+            return bytes(buf).decode(resp.encoding or "utf-8", errors="replace"), ctype
+
+def passages(text: str, max_chars: int = EXCERPT_CHARS) -> List[str]:
+    """Runs of whole sentences up to max_chars, each starting halfway into the previous one."""
+    sents = split_sentences(text)
+    out, i = [], 0
+    while i < len(sents):
+        j, size = i, 0
+        while j < len(sents) and (j == i or size + 1 + len(sents[j]) <= max_chars):
+            size += len(sents[j]) + (j > i)
+            j += 1
+        out.append(" ".join(sents[i:j]))
+        if j >= len(sents):
+            break
+        half, k = 0, i
+        while k < j - 1 and half < size // 2:
+            half += len(sents[k]) + 1
+            k += 1
+        i = max(k, i + 1)
+    return out
+
+def best_excerpt(text: str, query: str, max_chars: int = EXCERPT_CHARS) -> str:
+    """The passage of `text` that ranks best for `query` (BM25; earliest on ties), cut to max_chars."""
+    parts = passages(text, max_chars)
+    if not parts:
+        return ""
+    scores = bm25_scores(query, parts)
+    best = parts[max(range(len(parts)), key=lambda i: (scores[i], -i))]
+    return (best[:max_chars] + "...") if len(best) > max_chars else best
+
+_BLOCK_TAGS = ("p", "li", "h1", "h2", "h3", "h4", "h5", "h6", "td", "th", "pre", "blockquote", "div", "br")
+
+def parse_excerpt(body: str, ctype: str, query: str, max_chars: int = EXCERPT_CHARS) -> Optional[str]:
+    """Readable text of a page, reduced to its most relevant passage (runs in the parse pool)."""
+    if ctype == "text/plain":
+        text = body
+    else:
+        tree = html.fromstring(Document(body).summary())
+        for el in tree.iter(*_BLOCK_TAGS):
+            el.tail = "\n" + (el.tail or "")     # keep paragraph boundaries for passage splitting
+        text = tree.text_content()
+    text = re.sub(r"[ \t\r\f\v]+", " ", text)
+    text = re.sub(r"\s*\n\s*", "\n\n", text).strip()
+    return best_excerpt(text, query, max_chars) or None
+
+_PARSE_POOL: Optional[ProcessPoolExecutor] = None
+_PARSE_LOCK = threading.Lock()
+
+def _parse_pool() -> Optional[ProcessPoolExecutor]:
+    global _PARSE_POOL
+    if PARSE_WORKERS <= 0:
+        return None
+    with _PARSE_LOCK:
+        if _PARSE_POOL is None:
+            import multiprocessing as mp
+            # spawn: callers are often threaded (server, concurrent fetches); forking them is unsafe
+            _PARSE_POOL = ProcessPoolExecutor(PARSE_WORKERS, mp_context=mp.get_context("spawn"))
+            atexit.register(_close_parse_pool)
+        return _PARSE_POOL
+
+def _close_parse_pool(disable: bool = False) -> None:
+    global _PARSE_POOL, PARSE_WORKERS
+    with _PARSE_LOCK:
+        if _PARSE_POOL is not None:
+            _PARSE_POOL.shutdown(wait=False, cancel_futures=True)
+            _PARSE_POOL = None
+        if disable:
+            PARSE_WORKERS = 0
+
+def _fetch_excerpt(url: str, timeout: float = DEFAULT_TIMEOUT, query: str = "") -> Optional[str]:
     try:
-        resp = requests.get(url, headers={"User-Agent": USER_AGENT}, timeout=timeout)
-        resp.raise_for_status()
-        doc = Document(resp.text)
-        text = re.sub(r"\s+", " ", html.fromstring(doc.summary()).text_content()).strip()
-        if not text:
+        page = _download(url, timeout=timeout)
+        if page is None:
             return None
-        return (text[:800] + "...") if len(text) > 800 else text
+        with trace_span("research.parse", url=url, chars=len(page[0])) as span:
+            pool = _parse_pool()
+            if pool is not None:
+                try:
+                    return pool.submit(parse_excerpt, page[0], page[1], query).result()
+                except BrokenProcessPool:
+                    # Workers can't start (e.g. __main__ not importable): parse in-thread from now on
+                    _close_parse_pool(disable=True)
+                    span.set(pool="broken")
+            return parse_excerpt(page[0], page[1], query)
     except Exception:
         return None
 
-def gather_sources(query: str, max_sources: int = 4, sleep_sec: float = 0.6) -> List[SourceItem]:
-    raw = search_web(query, max_results=max_sources * 2)
+class _HostThrottle:
+    """Keeps requests to one host at least `interval` seconds apart (politeness across threads)."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.next_at: Dict[str, float] = {}
+
+    def wait(self, url: str) -> None:
+        if self.interval <= 0:
+            return
+        host = urlsplit(url).netloc
+        with self.lock:
+            now = time.monotonic()
+            at = max(now, self.next_at.get(host, 0.0))
+            self.next_at[host] = at + self.interval
+        if at > now:
+            time.sleep(at - now)
+
+def gather_sources(query: str, max_sources: int = 4, sleep_sec: float = 0.6,
+                   budget_s: Optional[float] = None) -> List[SourceItem]:
+    """
+    Top search results with their most relevant excerpt, in search-rank order.
+    Candidates are fetched concurrently (sleep_sec apart per host); a result whose
+    page can't be fetched or parsed falls back to its search snippet.
+
+    With budget_s, the call returns within about that many seconds: request
+    timeouts are capped to it, and pages still downloading when it runs out are
+    abandoned in favour of their snippets (SourceItem.fetched is False).
+    """
+    end = None if budget_s is None else time.monotonic() + budget_s
+
+    def left() -> Optional[float]:
+        return None if end is None else max(0.0, end - time.monotonic())
+
+    timeout = DEFAULT_TIMEOUT if end is None else max(0.5, min(DEFAULT_TIMEOUT, budget_s))
+    raw = search_web(query, max_results=max_sources * 2, timeout=timeout)
+    throttle = _HostThrottle(sleep_sec)
+
+    def fetch(url: str) -> Optional[str]:
+        throttle.wait(url)
+        return _fetch_excerpt(url, timeout=max(0.5, min(timeout, left() or timeout)), query=query)
+
     items: List[SourceItem] = []
-    for r in raw:
-        if len(items) >= max_sources:
-            break
-        url = r.get("href") or r.get("url") or ""
-        title = r.get("title") or r.get("body") or url
-        excerpt = _fetch_excerpt(url) or (r.get("body") or "")
-        if not excerpt:
-            continue
-        items.append(SourceItem(title=title, url=url, excerpt=excerpt))
-        time.sleep(sleep_sec)
+    urls = [r.get("href") or r.get("url") or "" for r in raw]
+    futures: List[Optional[Future]] = [None] * len(raw)
+    pool = ThreadPoolExecutor(max_workers=max(1, min(FETCH_WORKERS, max_sources, len(raw))),
+                              thread_name_prefix="agentic-fetch")
+
+    def launch(i: int) -> None:
+        if i < len(raw) and futures[i] is None and urls[i]:
+            # copy_context: fetch/parse spans stay children of the caller's span
+            futures[i] = pool.submit(contextvars.copy_context().run, fetch, urls[i])
+
+    def result(fut: Optional[Future]) -> Optional[str]:
+        if fut is None:
+            return None
+        if end is not None and not fut.done():
+            try:
+                return fut.result(timeout=left())
+            except FuturesTimeout:
+                return None
+        return fut.result()
+
+    try:
+        # The top max_sources candidates start at once; the next one only when a
+        # candidate yields nothing, so no more pages are downloaded than before.
+        for i in range(max_sources):
+            launch(i)
+        backup = max_sources
+        for i, r in enumerate(raw):
+            if len(items) >= max_sources:
+                break
+            if end is None or left():
+                launch(i)
+            title = r.get("title") or r.get("body") or urls[i]
+            page = result(futures[i])
+            excerpt = page or (r.get("body") or "")
+            if not excerpt:
+                launch(backup)
+                backup += 1
+                continue
+            items.append(SourceItem(title=title, url=urls[i], excerpt=excerpt, fetched=bool(page)))
+    finally:
+        # Over budget: don't wait for downloads nobody will read
+        pool.shutdown(wait=end is None or bool(left()), cancel_futures=True)
     return items
@@ -0,0 +1,119 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+# -------------------------------
+# Retrieval Result Cache
+# -------------------------------
+
+"""
+LRU cache of final retrieve() results.
+
+Keyed by (normalised query, include filters, k, MMR lambda, index snapshot id).
+A hit returns the cached chunk list without embedding, searching or filtering.
+Entries refer to chunks of one snapshot only. The owner of the index calls
+use_snapshot() when it swaps to a new one (query.py does on load and swap),
+which drops the whole cache, so stale results are never served and old
+snapshots are not kept alive by the cache. Lookups and inserts for any other
+snapshot, e.g. from a query still running on the old one, miss or are ignored;
+they never flush the current entries.
+
+Usage:
+    cache.use_snapshot(snapshot_id)
+    key = cache.key(query, include, k, mmr_lambda)
+    hit = cache.get(key, snapshot_id)
+    if hit is None:
+        cache.put(key, snapshot_id, chunks)
+"""
+
+from __future__ import annotations
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+def normalize_filters(include: Optional[Dict[str, List[str]]]) -> Tuple:
+    if not include:
+        return ()
+    return tuple(sorted((k, tuple(sorted(map(str, v if isinstance(v, (list, tuple, set)) else [v]))))
+                        for k, v in include.items()))
+
+class ResultCache:
+    """Thread-safe LRU of chunk lists for one index snapshot at a time."""
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._lru: "OrderedDict[Hashable, Tuple[Dict[str, Any], ...]]" = OrderedDict()
+        self._snapshot: Optional[str] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.stale_puts = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @staticmethod
+    def key(query: str, include: Optional[Dict[str, List[str]]], k: int, mmr_lambda: float) -> Hashable:
+        return (normalize_query(query), normalize_filters(include), int(k), round(float(mmr_lambda), 4))
+
+    def use_snapshot(self, snapshot: str) -> None:
+        """Serve `snapshot` from now on; entries of the previous one are dropped."""
+        with self._lock:
+            if snapshot != self._snapshot:
+                if self._lru:
+                    self.invalidations += 1
+                self._lru.clear()
+                self._snapshot = snapshot
+
+    def get(self, key: Hashable, snapshot: str) -> Optional[List[Dict[str, Any]]]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            if self._snapshot is None:   # no owner has named one yet: adopt the first seen
+                self._snapshot = snapshot
+            chunks = self._lru.get(key) if snapshot == self._snapshot else None
+            if chunks is None:
+                self.misses += 1
+                return None
+            self._lru.move_to_end(key)
+            self.hits += 1
+            return list(chunks)
+
+    def put(self, key: Hashable, snapshot: str, chunks: List[Dict[str, Any]]) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            if snapshot != self._snapshot:
+                self.stale_puts += 1   # computed on another snapshot than the one served now
+                return
+            self._lru[key] = tuple(chunks)
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._lru.clear()
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._lru), "hits": self.hits, "misses": self.misses,
+                    "hit_rate": round(self.hit_rate, 4), "evictions": self.evictions,
+                    "invalidations": self.invalidations, "stale_puts": self.stale_puts,
+                    "snapshot": self._snapshot}
@@ -0,0 +1,426 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+# -------------------------------
+# Server
+# -------------------------------
+
+"""
+Long-running local HTTP service for retrieval and authoring (stdlib-only).
+
+Keeps the FAISS index, metadata and OpenAI clients warm across requests, and
+micro-batches concurrent queries: requests arriving within a few milliseconds of
+each other share a single embeddings call and a single FAISS search.
+
+    POST /retrieve  {"query": "...", "k": 8, "session": "...", "filters": {"key": ["v"]}}
+    POST /answer    {"query": "...", "filters": {...}, "rerank": true}
+    POST /author    {"prompt": "...", "session": "...", "tone": ..., "length": ..., "format": ..., "deadline_s": ...}
+    GET  /metrics   Prometheus text format
+    GET  /healthz
+
+When more than --max-inflight requests are running, new ones get HTTP 503 with
+Retry-After instead of queueing without bound. Request bodies are checked against
+the fields above before any work starts: a malformed body gets HTTP 400, and any
+error past that point is a server fault (HTTP 500).
+
+Usage:
+    python -m agentic_author_ai.server --port 8000 --max-batch 32 --max-wait-ms 5
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import asdict, dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from . import query as rag_query
+from .rag_config import MMR_LAMBDA, TOP_K
+from .tracing import percentile, trace_span
+
+
+class Overloaded(RuntimeError):
+    """Raised when the service is at capacity; mapped to HTTP 503."""
+
+class BadRequest(ValueError):
+    """Raised for a malformed request body; the only error mapped to HTTP 400."""
+
+# Accepted body fields per endpoint (name -> type); the first one is required
+_FIELDS: Dict[str, Dict[str, Any]] = {
+    "retrieve": {"query": str, "k": int, "session": str, "filters": dict},
+    "answer": {"query": str, "session": str, "filters": dict, "rerank": bool},
+    "author": {"prompt": str, "session": str, "tone": str, "length": str, "format": str,
+               "max_sources": int, "deadline_s": (int, float), "force_external": bool, "no_external": bool},
+}
+
+def validate_body(endpoint: str, body: Any) -> Dict[str, Any]:
+    """The request body if it is well-formed for endpoint, else BadRequest."""
+    if not isinstance(body, dict):
+        raise BadRequest("body must be a JSON object")
+    fields = _FIELDS[endpoint]
+    required = next(iter(fields))
+    if not isinstance(body.get(required), str) or not body[required].strip():
+        raise BadRequest(f"'{required}' must be a non-empty string")
+    for name, typ in fields.items():
+        val = body.get(name)
+        if val is None:
+            continue
+        if not isinstance(val, typ) or (isinstance(val, bool) and typ is not bool):
+            names = " or ".join(t.__name__ for t in (typ if isinstance(typ, tuple) else (typ,)))
+            raise BadRequest(f"'{name}' must be {names}")
+    for name in ("k", "max_sources", "deadline_s"):
+        if body.get(name) is not None and body[name] <= 0:
+            raise BadRequest(f"'{name}' must be positive")
+    for key, vals in (body.get("filters") or {}).items():
+        if not all(isinstance(v, str) for v in (vals if isinstance(vals, list) else [vals])):
+            raise BadRequest(f"filter '{key}' must be a string or a list of strings")
+    return body
+
+
+# -------------------------------
+# Metrics
+# -------------------------------
+
+class Metrics:
+    """Thread-safe counters, gauges and windowed latency quantiles."""
+
+    def __init__(self, window: int = 2048):
+        self.lock = threading.Lock()
+        self.window = window
+        self.counters: Dict[Tuple[str, str], float] = {}
+        self.gauges: Dict[str, float] = {}
+        self.latency: Dict[str, Deque[float]] = {}
+        self.batch_sizes: Deque[int] = deque(maxlen=window)
+        self.started = time.time()
+
+    def inc(self, name: str, endpoint: str = "", n: float = 1) -> None:
+        with self.lock:
+            self.counters[(name, endpoint)] = self.counters.get((name, endpoint), 0) + n
+
+    def gauge(self, name: str, value: float) -> None:
+        with self.lock:
+            self.gauges[name] = value
+
+    def observe(self, endpoint: str, seconds: float) -> None:
+        with self.lock:
+            self.latency.setdefault(endpoint, deque(maxlen=self.window)).append(seconds)
+
+    def observe_batch(self, size: int) -> None:
+        with self.lock:
+            self.batch_sizes.append(size)
+            self.counters[("agentic_batches_total", "")] = self.counters.get(("agentic_batches_total", ""), 0) + 1
+            self.counters[("agentic_batched_queries_total", "")] = (
+                self.counters.get(("agentic_batched_queries_total", ""), 0) + size)
+
+    def render(self) -> str:
+        with self.lock:
+            lines = [f"agentic_uptime_seconds {time.time() - self.started:.3f}"]
+            for (name, ep), v in sorted(self.counters.items()):
+                label = f'{{endpoint="{ep}"}}' if ep else ""
+                lines.append(f"{name}{label} {v:g}")
+            for name, v in sorted(self.gauges.items()):
+                lines.append(f"{name} {v:g}")
+            if self.batch_sizes:
+                lines.append(f"agentic_batch_size_avg {sum(self.batch_sizes) / len(self.batch_sizes):.3f}")
+                lines.append(f"agentic_batch_size_max {max(self.batch_sizes)}")
+            for ep, xs in sorted(self.latency.items()):
+                for q in (0.5, 0.95, 0.99):
+                    lines.append(f'agentic_request_latency_seconds{{endpoint="{ep}",quantile="{q}"}} '
+                                 f"{percentile(xs, q * 100):.6f}")
+        return "\n".join(lines) + "\n"
+
+
+# -------------------------------
+# Micro-batching retriever
+# -------------------------------
+
+@dataclass
+class _Pending:
+    query: str
+    n: int
+    future: Future = field(default_factory=Future)
+
+class QueryBatcher:
+    """
+    Collects concurrent queries for up to max_wait_ms (or max_batch items) and runs
+    one embeddings call + one FAISS search for the whole batch.
+    """
+
+    def __init__(self, max_batch: int = 32, max_wait_ms: float = 5.0, max_queue: int = 1024,
+                 workers: int = 1, metrics: Optional[Metrics] = None):
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.metrics = metrics or Metrics()
+        self._q: "queue.Queue[_Pending]" = queue.Queue(maxsize=max_queue)
+        self._threads = [threading.Thread(target=self._loop, name=f"agentic-batcher-{i}", daemon=True)
+                         for i in range(max(1, workers))]
+        for t in self._threads:
+            t.start()
+
+    def submit(self, query: str, n: int) -> Future:
+        item = _Pending(query=query, n=n)
+        try:
+            self._q.put_nowait(item)
+        except queue.Full:
+            raise Overloaded("retrieval queue is full")
+        self.metrics.gauge("agentic_batch_queue_depth", self._q.qsize())
+        return item.future
+
+    def retrieve(self, query: str, k: int = TOP_K, include: Optional[Dict[str, List[str]]] = None,
+                 timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Drop-in for query.retrieve() that goes through the batcher."""
+        with trace_span("retrieve", batched=True):
+            key, hit = rag_query.cached_result(rag_query.active_index(), query, k, include, MMR_LAMBDA)
+            if hit is not None:
+                return hit
+            qv, ids, active = self.submit(query, k * 8).result(timeout=timeout)
+            if ids is None:  # sharded index: the batch shared the embeddings call, search per filter
+                meta, ids, index = rag_query.search_candidates(qv[None, :], k * 8, include, active=active)[0]
+            else:
+                index, meta = active.index, active.meta
+            out = rag_query.select_candidates(meta, ids, k, include, index=index, qv=qv)
+            rag_query.RESULT_CACHE.put(key, active.snapshot, out)
+            return out
+
+    def _loop(self) -> None:
+        while True:
+            batch = [self._q.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._q.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self.metrics.gauge("agentic_batch_queue_depth", self._q.qsize())
+            self._run(batch)
+
+    def _run(self, batch: List[_Pending]) -> None:
+        self.metrics.observe_batch(len(batch))
+        try:
+            # One snapshot for the whole batch; results carry it so ids resolve against
+            # the same metadata even if a newer snapshot is swapped in meanwhile.
+            active = rag_query.active_index()
+            index = active.index if active.sharded is None else None
+            # Identical queries in one batch share a row.
+            texts = list(dict.fromkeys(p.query for p in batch))
+            row = {t: i for i, t in enumerate(texts)}
+            with trace_span("batch", size=len(batch), unique=len(texts)):
+                V = rag_query.embed_queries(texts)
+                if index is not None:
+                    _, I = rag_query.search_vectors(index, V, max(p.n for p in batch))
+            for p in batch:
+                r = row[p.query]
+                p.future.set_result((V[r], None if index is None else I[r][: p.n], active))
+        except Exception as e:
+            for p in batch:
+                if not p.future.done():
+                    p.future.set_exception(e)
+
+
+# -------------------------------
+# Service
+# -------------------------------
+
+class AuthorService:
+    def __init__(self, max_inflight: int = 64, max_batch: int = 32, max_wait_ms: float = 5.0,
+                 batch_workers: int = 2, request_timeout: float = 120.0, enable_author: bool = True):
+        self.metrics = Metrics()
+        self.batcher = QueryBatcher(max_batch=max_batch, max_wait_ms=max_wait_ms,
+                                    max_queue=max(max_inflight * 2, max_batch),
+                                    workers=batch_workers, metrics=self.metrics)
+        self.slots = threading.BoundedSemaphore(max_inflight)
+        self.inflight = 0
+        self.request_timeout = request_timeout
+        self.demo = None
+        if enable_author:
+            from . import demo  # heavy: builds its own client; import once at startup
+            self.demo = demo
+
+    def warm(self) -> None:
+        """Load the index and open the API client before the first request."""
+        rag_query.active_index()
+        rag_query._client()
+
+    def render_metrics(self) -> str:
+        """Prometheus text, including the retrieval result cache (query.RESULT_CACHE)."""
+        st = rag_query.RESULT_CACHE.stats()
+        with self.metrics.lock:
+            for name in ("hits", "misses", "evictions", "invalidations", "stale_puts"):
+                self.metrics.counters[(f"agentic_retrieval_cache_{name}_total", "")] = st[name]
+            self.metrics.gauges["agentic_retrieval_cache_entries"] = st["entries"]
+            self.metrics.gauges["agentic_retrieval_cache_hit_ratio"] = st["hit_rate"]
+        return self.metrics.render()
+
+    def _track(self, delta: int) -> None:
+        with self.metrics.lock:
+            self.inflight += delta
+            self.metrics.gauges["agentic_inflight"] = self.inflight
+
+    def handle(self, endpoint: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        if not self.slots.acquire(blocking=False):
+            self.metrics.inc("agentic_requests_rejected_total", endpoint)
+            raise Overloaded("too many requests in flight")
+        self._track(+1)
+        t0 = time.perf_counter()
+        try:
+            out = getattr(self, "_" + endpoint)(validate_body(endpoint, body))
+            self.metrics.inc("agentic_requests_total", endpoint)
+            return out
+        except Overloaded:
+            self.metrics.inc("agentic_requests_rejected_total", endpoint)
+            raise
+        except BadRequest:
+            self.metrics.inc("agentic_requests_bad_total", endpoint)
+            raise
+        except Exception:
+            self.metrics.inc("agentic_request_errors_total", endpoint)
+            raise
+        finally:
+            self.metrics.observe(endpoint, time.perf_counter() - t0)
+            self._track(-1)
+            self.slots.release()
+
+    @staticmethod
+    def _filters(body: Dict[str, Any]) -> Optional[Dict[str, List[str]]]:
+        filters = {k: (v if isinstance(v, list) else [v]) for k, v in (body.get("filters") or {}).items()}
+        if body.get("session"):
+            filters.setdefault("session", []).append(body["session"])
+        return filters or None
+
+    def _retrieve(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        chunks = self.batcher.retrieve(body["query"], k=int(body.get("k") or TOP_K),
+                                       include=self._filters(body), timeout=self.request_timeout)
+        return {"query": body["query"], "chunks": chunks}
+
+    def _answer(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        text = rag_query.answer(body["query"], filters=self._filters(body),
+                                use_rerank=bool(body.get("rerank", False)),
+                                retrieve_fn=self.batcher.retrieve)
+        return {"query": body["query"], "answer": text}
+
+    def _author(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        if self.demo is None:
+            raise BadRequest("author endpoint disabled (--no-author)")
+        res = self.demo.run_pipeline(
+            body["prompt"], body.get("session"),
+            force_external=bool(body.get("force_external")), no_external=bool(body.get("no_external")),
+            max_sources=int(body.get("max_sources") or 4),
+            tone=body.get("tone"), length=body.get("length"), fmt=body.get("format"),
+            retrieve_fn=self.batcher.retrieve,
+            deadline_s=float(body["deadline_s"]) if body.get("deadline_s") else None,
+        )
+        return {
+            "plan": res["plan"],
+            "final_text": res["final_text"],
+            "rag_chunk_ids": [c.get("id") for c in res["rag_chunks"] or []],
+            "web_sources": [asdict(s) for s in res["web_sources"] or []],
+            "degradations": res["degradations"],
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "agentic-author/1.0"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt: str, *args: Any) -> None:
+        if self.server.verbose:  # type: ignore[attr-defined]
+            super().log_message(fmt, *args)
+
+    def _send(self, body: bytes, ctype: str, status: int = 200, headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, obj: Any, status: int = 200, headers: Optional[Dict[str, str]] = None) -> None:
+        self._send(json.dumps(obj, ensure_ascii=False).encode("utf-8"), "application/json", status, headers)
+
+    def do_GET(self) -> None:
+        svc: AuthorService = self.server.service  # type: ignore[attr-defined]
+        if self.path == "/metrics":
+            self._send(svc.render_metrics().encode("utf-8"), "text/plain; version=0.0.4")
+        elif self.path == "/healthz":
+            self._send_json({"ok": True})
+        else:
+            self._send_json({"error": "not found"}, status=404)
+
+    def do_POST(self) -> None:
+        svc: AuthorService = self.server.service  # type: ignore[attr-defined]
+        endpoint = self.path.strip("/")
+        if endpoint not in ("retrieve", "answer", "author"):
+            self._send_json({"error": "not found"}, status=404)
+            return
+        try:
+            try:
+                n = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(n) or b"{}")
+            except ValueError as e:   # also json.JSONDecodeError / UnicodeDecodeError
+                raise BadRequest(f"invalid JSON body: {e}") from e
+            self._send_json(svc.handle(endpoint, body))
+        except Overloaded as e:
+            self._send_json({"error": str(e)}, status=503, headers={"Retry-After": "1"})
+        except BadRequest as e:
+            self._send_json({"error": f"bad request: {e}"}, status=400)
+        except Exception as e:
+            self._send_json({"error": f"{type(e).__name__}: {e}"}, status=500)
+
+
+class AuthorServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256  # default of 5 drops SYNs under concurrent load
+
+    def __init__(self, addr: Tuple[str, int], service: AuthorService, verbose: bool = False):
+        super().__init__(addr, _Handler)
+        self.service = service
+        self.verbose = verbose
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+def start_server(service: AuthorService, host: str = "127.0.0.1", port: int = 0) -> AuthorServer:
+    """Serve on a background thread (port=0 picks a free port)."""
+    srv = AuthorServer((host, port), service)
+    threading.Thread(target=srv.serve_forever, name="agentic-server", daemon=True).start()
+    return srv
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Persistent retrieval/authoring service with query micro-batching")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8000)
+    ap.add_argument("--max-inflight", type=int, default=64, help="Requests beyond this get HTTP 503")
+    ap.add_argument("--max-batch", type=int, default=32, help="Max queries per embeddings/FAISS call")
+    ap.add_argument("--max-wait-ms", type=float, default=5.0, help="How long a batch waits to fill")
+    ap.add_argument("--batch-workers", type=int, default=2, help="Batches that may run concurrently")
+    ap.add_argument("--no-author", action="store_true", help="Disable /author (no planner/editor clients)")
+    ap.add_argument("--verbose", action="store_true", help="Log every request")
+    args = ap.parse_args()
+
+    service = AuthorService(max_inflight=args.max_inflight, max_batch=args.max_batch,
+                            max_wait_ms=args.max_wait_ms, batch_workers=args.batch_workers,
+                            enable_author=not args.no_author)
+    service.warm()
+    srv = AuthorServer((args.host, args.port), service, verbose=args.verbose)
+    print(f"Serving on {srv.base_url} (retrieve, answer{'' if args.no_author else ', author'}; /metrics)")
+    try:
+        srv.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
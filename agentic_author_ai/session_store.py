@@ -0,0 +1,216 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+# -------------------------------
+# Session Store
+# -------------------------------
+
+"""
+Append-only message log with an offset index and compacted snapshots (stdlib only).
+
+Files for a session at PATH:
+  PATH            JSONL, one message per line (same format Memory always wrote)
+  PATH.idx        little-endian uint64 byte offset of every line in PATH
+  PATH.snap.json  snapshot every `snapshot_every` appends: message count, log and
+                  index sizes at that point and the last `window` messages
+
+The message count is the index size / 8. tail(n) reads n offsets from the end of
+the index, seeks the log there and parses n lines, so reopening a session costs
+O(window), not O(history). read(start, stop) pages through older history the
+same way.
+
+On open, the log is reconciled with the index: lines appended after the last
+indexed one (a crash between the two writes) are indexed, and a torn last line
+is cut off. If the index points past the end of the log, it is cut back to the
+last snapshot and only the lines written after it are re-indexed. A log without
+a usable index (e.g. written by an older Memory) is scanned in full, once.
+
+The resume window (tail() right after opening) is served from the snapshot plus
+the few lines appended after it, as long as the log still matches the snapshot.
+
+Usage:
+    store = SessionStore("data/sessions/abc.jsonl", window=50)
+    store.append({"role": "user", "content": "hi", "meta": {}})
+    store.tail(50)          # last 50 messages, oldest first
+    len(store)              # total messages
+"""
+
+from __future__ import annotations
+import json
+import os
+import struct
+import threading
+from array import array
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+_OFF = struct.Struct("<Q")
+
+class SessionStore:
+    def __init__(self, path: Union[str, Path], window: int = 50, snapshot_every: int = 1000,
+                 fsync: bool = False):
+        self.path = Path(path)
+        self.idx_path = self.path.with_name(self.path.name + ".idx")
+        self.snap_path = self.path.with_name(self.path.name + ".snap.json")
+        self.window = window
+        self.snapshot_every = snapshot_every
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._log = None
+        self._idx = None
+        self._count = 0
+        self._size = 0
+        self._since_snapshot = 0
+        self._recent: List[Dict[str, Any]] = []   # last `window` appended/loaded messages, for snapshots
+
+    # -------- open / reconcile --------
+    def _open(self) -> None:
+        if self._log is not None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._log = open(self.path, "a+b")
+        self._idx = open(self.idx_path, "a+b")
+        self._size = self._log.seek(0, os.SEEK_END)
+        n_idx = self._idx.seek(0, os.SEEK_END) // _OFF.size
+        snap = self._read_snapshot()
+        if n_idx and self._offset(n_idx - 1) < self._size and (snap is None or n_idx >= snap["count"]):
+            self._count = n_idx
+            self._reindex_from(self._offset(n_idx - 1), skip_first=True)
+        elif (snap is not None and snap["log_size"] <= self._size and n_idx >= snap["count"]
+              and (not snap["count"] or self._offset(snap["count"] - 1) < snap["log_size"])):
+            # Index ahead of the log (e.g. lost log writes): cut back to the snapshot, re-index the rest
+            self._idx.truncate(snap["count"] * _OFF.size)
+            self._idx.seek(0, os.SEEK_END)
+            self._count = snap["count"]
+            self._reindex_from(snap["log_size"], skip_first=False)
+        else:
+            self._idx.truncate(0)
+            self._count = 0
+            self._reindex_from(0, skip_first=False)
+        self._since_snapshot = self._count - (snap["count"] if snap else 0)
+        self._seed_recent(snap)
+
+    def _seed_recent(self, snap: Optional[Dict[str, Any]]) -> None:
+        """Resume window from the snapshot (+ the few messages after it) instead of the log."""
+        if snap is None or not snap["window"] or not 0 <= self._since_snapshot < self.window:
+            return
+        count, size = snap["count"], snap["log_size"]
+        # Only if the log still holds exactly what the snapshot saw
+        if count > self._count or (self._offset(count) if count < self._count else self._size) != size:
+            return
+        self._recent = (list(snap["window"]) + self._read(count, self._count))[-self.window:]
+
+    def _reindex_from(self, offset: int, skip_first: bool) -> None:
+        """Index complete lines from `offset` on; cut off a torn last line."""
+        self._log.seek(offset)
+        pos = offset
+        new = array("Q")
+        first = skip_first
+        for line in iter(self._log.readline, b""):
+            if not line.endswith(b"\n"):
+                self._log.truncate(pos)
+                break
+            if not first:
+                new.append(pos)
+            first = False
+            pos += len(line)
+        self._size = self._log.seek(0, os.SEEK_END)
+        if new:
+            self._idx.write(struct.pack(f"<{len(new)}Q", *new))
+            self._idx.flush()
+            self._count += len(new)
+
+    def _offset(self, i: int) -> int:
+        self._idx.seek(i * _OFF.size)
+        return _OFF.unpack(self._idx.read(_OFF.size))[0]
+
+    def _read_snapshot(self) -> Optional[Dict[str, Any]]:
+        try:
+            snap = json.loads(self.snap_path.read_text(encoding="utf-8"))
+            return snap if {"count", "log_size", "window"} <= set(snap) else None
+        except (OSError, ValueError):
+            return None
+
+    # -------- writes --------
+    def append(self, message: Dict[str, Any]) -> int:
+        """Append one message; returns its position in the session."""
+        line = (json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._lock:
+            self._open()
+            offset = self._size
+            self._log.write(line)
+            self._log.flush()
+            self._idx.write(_OFF.pack(offset))   # log first: a crash in between is repaired on open
+            self._idx.flush()
+            if self.fsync:
+                os.fsync(self._log.fileno())
+                os.fsync(self._idx.fileno())
+            self._size += len(line)
+            self._count += 1
+            self._recent.append(message)
+            if len(self._recent) > self.window:
+                del self._recent[: len(self._recent) - self.window]
+            self._since_snapshot += 1
+            if self.snapshot_every and self._since_snapshot >= self.snapshot_every:
+                self._snapshot()
+            return self._count - 1
+
+    def snapshot(self) -> None:
+        with self._lock:
+            self._open()
+            self._snapshot()
+
+    def _snapshot(self) -> None:
+        if len(self._recent) < min(self.window, self._count):
+            self._recent = self._read(max(0, self._count - self.window), self._count)
+        snap = {"count": self._count, "log_size": self._size, "window": self._recent[-self.window:]}
+        tmp = self.snap_path.with_name(self.snap_path.name + ".tmp")
+        tmp.write_text(json.dumps(snap, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self.snap_path)
+        self._since_snapshot = 0
+
+    # -------- reads --------
+    def __len__(self) -> int:
+        with self._lock:
+            self._open()
+            return self._count
+
+    def tail(self, n: Optional[int] = None) -> List[Dict[str, Any]]:
+        """The last n (default: window) messages, oldest first."""
+        n = self.window if n is None else n
+        with self._lock:
+            self._open()
+            if len(self._recent) >= min(n, self._count):
+                return list(self._recent[-n:]) if n else []
+            return self._read(max(0, self._count - n), self._count)
+
+    def read(self, start: int = 0, stop: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Messages start..stop-1 (Python slice semantics for non-negative bounds)."""
+        with self._lock:
+            self._open()
+            stop = self._count if stop is None else min(stop, self._count)
+            return self._read(max(0, start), stop)
+
+    def _read(self, start: int, stop: int) -> List[Dict[str, Any]]:
+        if start >= stop:
+            return []
+        begin = self._offset(start)
+        end = self._offset(stop) if stop < self._count else self._size
+        self._log.seek(begin)
+        data = self._log.read(end - begin)
+        return [json.loads(line) for line in data.splitlines() if line.strip()]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+                self._idx.close()
+                self._log = self._idx = None
+
+    def __enter__(self) -> "SessionStore":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
@@ -0,0 +1,251 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+# -------------------------------
+# Index Shards
+# -------------------------------
+
+"""
+Metadata-partitioned FAISS shards (e.g. one per session), loaded lazily.
+
+index.py --shard-by KEY writes one index + metadata file per value of meta[KEY]
+under shards/ in a new index snapshot (snapshots.py), plus manifest.json
+describing them. Chunks that absorbed
+near-duplicates from other values (meta["provenance"], see dedup.py) are also
+placed in those values' shards, so a filter still finds them.
+
+At query time ShardedIndex opens only the shards a filter on KEY names; queries
+without such a filter search every shard in parallel and merge the hits. Loaded
+shards live in an LRU bounded by SHARD_CACHE_BYTES (approximate resident size
+of vectors + metadata), so memory follows the working set rather than the corpus.
+
+Usage:
+    python -m agentic_author_ai.index --shard-by session
+    python -m agentic_author_ai.shards            # list shards of the published snapshot
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .tracing import trace_span
+from .vectors import StoredIndex, build_index, read_index, save_vectors, write_index
+
+NO_VALUE = "_none"   # shard for chunks without the key
+
+def shard_values(chunk: Dict[str, Any], key: str) -> List[str]:
+    """Every value of meta[key] the chunk should be found under (incl. collapsed duplicates)."""
+    m = chunk.get("meta", {})
+    vals: List[str] = []
+    for src in [m] + list(m.get("provenance", ())):
+        v = src.get(key)
+        for x in (v if isinstance(v, list) else [v]):
+            x = NO_VALUE if x in (None, "") else str(x)
+            if x not in vals:
+                vals.append(x)
+    return vals
+
+def shard_name(value: str) -> str:
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", value).strip("-").lower()[:40] or "shard"
+    return f"{slug}-{zlib.crc32(value.encode('utf-8')):08x}"
+
+def write_shards(chunks: List[Dict[str, Any]], X: np.ndarray, key: str, out_dir: Path,
+                 storage: str = "float32", dim: Optional[int] = None, keep_full: bool = False,
+                 embed_model: str = "") -> Dict[str, Any]:
+    """Build and write one index per shard value; returns the manifest that was written."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    groups: "OrderedDict[str, List[int]]" = OrderedDict()
+    for i, c in enumerate(chunks):
+        for v in shard_values(c, key):
+            groups.setdefault(v, []).append(i)
+
+    shards: Dict[str, Dict[str, Any]] = {}
+    for value, rows in groups.items():
+        name = shard_name(value)
+        Xs = X[rows]
+        with trace_span("index.build", shard=value, n=len(rows), storage=storage):
+            index = build_index(Xs, storage=storage, dim=dim)
+        write_index(index, out_dir / f"{name}.faiss")
+        (out_dir / f"{name}.meta.json").write_text(
+            json.dumps([chunks[i] for i in rows], ensure_ascii=False), encoding="utf-8")
+        if keep_full:
+            save_vectors(out_dir / f"{name}.npy", Xs)
+        shards[value] = {"name": name, "ntotal": len(rows), "full_vectors": keep_full}
+
+    # Drop files of shards that no longer exist
+    live = {s["name"] for s in shards.values()}
+    for p in out_dir.glob("*.faiss"):
+        if p.stem not in live:
+            for suffix in (".faiss", ".meta.json", ".npy"):
+                (out_dir / f"{p.stem}{suffix}").unlink(missing_ok=True)
+
+    manifest = {
+        "key": key, "storage": storage, "dim": int(index.d) if shards else dim,
+        "full_dim": int(X.shape[1]), "ntotal": int(sum(len(r) for r in groups.values())),
+        "chunks": len(chunks), "embed_model": embed_model, "shards": shards,
+    }
+    (out_dir / "manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return manifest
+
+
+@dataclass
+class Shard:
+    value: str
+    index: StoredIndex
+    meta: List[Dict[str, Any]]
+    nbytes: int
+
+class CandidateView:
+    """
+    Merged scatter-gather hits presented like (index, meta): meta[i] is the i-th hit
+    and reconstruct_batch(ids) reads the vectors back from the owning shards, so
+    query.select_candidates (filters, MMR) works unchanged.
+    """
+
+    def __init__(self, hits: List[Tuple[Shard, int]]):
+        self.hits = hits
+        self.meta = [s.meta[i] for s, i in hits]
+
+    def reconstruct_batch(self, ids: Sequence[int]) -> np.ndarray:
+        rows = [self.hits[int(j)] for j in ids]
+        if not rows:
+            return np.zeros((0, 1), dtype="float32")
+        return np.vstack([s.index.reconstruct_batch(np.asarray([i], dtype="int64")) for s, i in rows])
+
+class ShardedIndex:
+    """Lazy, LRU-cached access to the shards described by a manifest."""
+
+    def __init__(self, manifest_path: Path, max_bytes: int = 2 << 30,
+                 rescore_candidates: int = 0, threads: int = 4, mmap: bool = False):
+        self.dir = Path(manifest_path).parent
+        self.manifest = json.loads(Path(manifest_path).read_text(encoding="utf-8"))
+        self.key: str = self.manifest["key"]
+        self.max_bytes = max_bytes
+        self.rescore_candidates = rescore_candidates
+        self.mmap = mmap
+        self._lru: "OrderedDict[str, Shard]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading: Dict[str, threading.Lock] = {}
+        self._pool = ThreadPoolExecutor(max_workers=max(1, threads), thread_name_prefix="agentic-shard")
+        self.loads = 0
+        self.evictions = 0
+
+    @property
+    def values(self) -> List[str]:
+        return list(self.manifest["shards"])
+
+    @property
+    def ntotal(self) -> int:
+        return int(self.manifest.get("chunks") or self.manifest.get("ntotal", 0))
+
+    def resident_bytes(self) -> int:
+        with self._lock:
+            return sum(s.nbytes for s in self._lru.values())
+
+    def loaded(self) -> List[str]:
+        with self._lock:
+            return list(self._lru)
+
+    def shards_for(self, include: Optional[Dict[str, List[str]]] = None) -> List[str]:
+        """Shards a filter can match: only the named ones if it filters on the shard key."""
+        if include and self.key in include:
+            return [v for v in map(str, include[self.key]) if v in self.manifest["shards"]]
+        return self.values
+
+    def _load(self, value: str) -> Shard:
+        info = self.manifest["shards"][value]
+        name = info["name"]
+        with trace_span("shard.load", shard=value, n=info["ntotal"]):
+            index = read_index(self.dir / f"{name}.faiss", mmap=self.mmap)
+            meta_path = self.dir / f"{name}.meta.json"
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            full = None
+            if info.get("full_vectors") and self.rescore_candidates:
+                full = np.load(self.dir / f"{name}.npy", mmap_mode="r")
+        stored = StoredIndex(index, storage=self.manifest.get("storage", "float32"),
+                             dim=self.manifest.get("dim"), full=full,
+                             rescore_candidates=self.rescore_candidates)
+        code_size = int(getattr(index, "code_size", 0) or index.d * 4)
+        return Shard(value, stored, meta, code_size * int(index.ntotal) + meta_path.stat().st_size)
+
+    def get(self, value: str) -> Shard:
+        with self._lock:
+            shard = self._lru.get(value)
+            if shard is not None:
+                self._lru.move_to_end(value)
+                return shard
+            gate = self._loading.setdefault(value, threading.Lock())
+        with gate:  # one loader per shard; concurrent callers wait for it
+            with self._lock:
+                shard = self._lru.get(value)
+            if shard is None:
+                shard = self._load(value)
+                with self._lock:
+                    self._lru[value] = shard
+                    self.loads += 1
+                    self._evict(keep=value)
+        return shard
+
+    def _evict(self, keep: str) -> None:
+        total = sum(s.nbytes for s in self._lru.values())
+        while total > self.max_bytes and len(self._lru) > 1:
+            victim = next(v for v in self._lru if v != keep)
+            total -= self._lru.pop(victim).nbytes
+            self.evictions += 1
+
+    def search(self, V: np.ndarray, n: int,
+               include: Optional[Dict[str, List[str]]] = None) -> List[CandidateView]:
+        """Top-n hits per query row across the relevant shards, best first."""
+        values = self.shards_for(include)
+        if not values:
+            return [CandidateView([]) for _ in range(V.shape[0])]
+
+        def one(value: str):
+            shard = self.get(value)
+            with trace_span("faiss.search", shard=value, k=n, nq=int(V.shape[0])):
+                D, I = shard.index.search(V, min(n, shard.index.ntotal))
+            return shard, D, I
+
+        with trace_span("shards.search", shards=len(values)):
+            if len(values) == 1:
+                parts = [one(values[0])]
+            else:
+                parts = list(self._pool.map(one, values))
+        views = []
+        for r in range(V.shape[0]):
+            scored = [(float(D[r, j]), shard, int(I[r, j]))
+                      for shard, D, I in parts for j in range(I.shape[1]) if I[r, j] >= 0]
+            scored.sort(key=lambda t: -t[0])
+            views.append(CandidateView([(s, i) for _, s, i in scored[:n]]))
+        return views
+
+
+def main():
+    from .rag_config import DATA_DIR, INDEX_ROOT, SHARD_DIR, SHARD_MANIFEST
+    from .snapshots import current
+    ap = argparse.ArgumentParser(description="List the shards of a sharded index")
+    ap.add_argument("--manifest", default=None, help="Default: the published snapshot's shard manifest")
+    args = ap.parse_args()
+    if args.manifest is None:
+        snap = current(INDEX_ROOT, legacy_dir=DATA_DIR)
+        args.manifest = str(snap.path(SHARD_DIR.name) / SHARD_MANIFEST.name)
+    m = json.loads(Path(args.manifest).read_text(encoding="utf-8"))
+    print(f"key={m['key']} storage={m['storage']} dim={m['dim']} chunks={m.get('chunks')} shards={len(m['shards'])}")
+    for value, info in m["shards"].items():
+        print(f"  {value:<40} {info['ntotal']:>8}  {info['name']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+# -------------------------------
+# Index Snapshots
+# -------------------------------
+
+"""
+Versioned, immutable index snapshots published by an atomic pointer swap.
+
+Layout under INDEX_ROOT (data/index/):
+
+    snapshots/<id>/rag.faiss, rag_meta.json, rag_index.json[, rag_vectors.npy]
+    snapshots/<id>/shards/...        (sharded layout, see shards.py)
+    CURRENT                          {"snapshot": "<id>", ...}
+
+index.py builds into snapshots/<id>.tmp/, renames the directory into place, then
+replaces CURRENT with os.replace, so a reader sees either the old or the new
+snapshot, never a mix of index and metadata. Snapshots are never modified after
+publishing. Readers (query.py) poll CURRENT and swap to a new snapshot once it
+has loaded; queries already running keep the objects they started with.
+
+Old snapshots are garbage-collected after each publish: the newest `keep` stay,
+as does anything younger than `grace_s`, so slow readers can finish opening a
+snapshot they just resolved. Memory-mapped files that are still open stay valid
+after their directory is removed.
+
+Usage:
+    python -m agentic_author_ai.snapshots              # list snapshots
+    python -m agentic_author_ai.snapshots --gc --keep 2
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import os
+import shutil
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+POINTER = "CURRENT"
+SNAPSHOT_DIR = "snapshots"
+TMP_SUFFIX = ".tmp"
+LEGACY = "legacy"        # id used for an index written straight into DATA_DIR (before snapshots)
+
+@dataclass(frozen=True)
+class Snapshot:
+    """A directory holding one complete index build (file names as in rag_config)."""
+    id: str
+    dir: Path
+
+    def path(self, name: str) -> Path:
+        return self.dir / name
+
+def new_snapshot_id() -> str:
+    # Sortable by creation time; nanoseconds keep back-to-back builds distinct.
+    return f"{time.strftime('%Y%m%d-%H%M%S', time.gmtime())}-{time.time_ns() % 10**9:09d}"
+
+def begin(root: Path) -> Tuple[str, Path]:
+    """Fresh build directory for a new snapshot: (id, tmp_dir)."""
+    sid = new_snapshot_id()
+    tmp = Path(root) / SNAPSHOT_DIR / f"{sid}{TMP_SUFFIX}"
+    tmp.mkdir(parents=True)
+    return sid, tmp
+
+def _fsync_dir(path: Path) -> None:
+    try:
+        fd = os.open(str(path), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+def publish(root: Path, sid: str, tmp_dir: Path, **info: Any) -> Snapshot:
+    """Move a finished build into place and point CURRENT at it (atomic for readers)."""
+    root = Path(root)
+    final = root / SNAPSHOT_DIR / sid
+    for p in Path(tmp_dir).rglob("*"):
+        if p.is_file():
+            with open(p, "rb") as f:
+                os.fsync(f.fileno())
+    os.replace(tmp_dir, final)
+    _fsync_dir(final.parent)
+    ptr_tmp = root / f"{POINTER}{TMP_SUFFIX}"
+    ptr_tmp.write_text(json.dumps({"snapshot": sid, "published": time.time(), **info}, indent=2),
+                       encoding="utf-8")
+    os.replace(ptr_tmp, root / POINTER)
+    _fsync_dir(root)
+    return Snapshot(sid, final)
+
+def read_pointer(root: Path) -> Optional[Dict[str, Any]]:
+    try:
+        return json.loads((Path(root) / POINTER).read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def current(root: Path, legacy_dir: Optional[Path] = None) -> Optional[Snapshot]:
+    """The published snapshot, else the pre-snapshot files in legacy_dir (if given)."""
+    ptr = read_pointer(root)
+    if ptr and (Path(root) / SNAPSHOT_DIR / ptr["snapshot"]).is_dir():
+        return Snapshot(ptr["snapshot"], Path(root) / SNAPSHOT_DIR / ptr["snapshot"])
+    return Snapshot(LEGACY, Path(legacy_dir)) if legacy_dir is not None else None
+
+def list_snapshots(root: Path) -> List[Snapshot]:
+    base = Path(root) / SNAPSHOT_DIR
+    if not base.is_dir():
+        return []
+    return [Snapshot(p.name, p) for p in sorted(base.iterdir())
+            if p.is_dir() and not p.name.endswith(TMP_SUFFIX)]
+
+def gc(root: Path, keep: int = 3, grace_s: float = 300.0) -> List[str]:
+    """Delete all but the newest `keep` snapshots (never CURRENT or recent ones); returns removed ids."""
+    root = Path(root)
+    ptr = read_pointer(root) or {}
+    now = time.time()
+    removed = []
+    snaps = list_snapshots(root)
+    for snap in snaps[: max(0, len(snaps) - keep)]:
+        if snap.id == ptr.get("snapshot") or now - snap.dir.stat().st_mtime < grace_s:
+            continue
+        shutil.rmtree(snap.dir, ignore_errors=True)
+        removed.append(snap.id)
+    # Builds that crashed before publish
+    base = root / SNAPSHOT_DIR
+    if base.is_dir():
+        for p in base.glob(f"*{TMP_SUFFIX}"):
+            if now - p.stat().st_mtime >= grace_s:
+                shutil.rmtree(p, ignore_errors=True)
+    return removed
+
+
+def main():
+    from .rag_config import INDEX_ROOT, INDEX_KEEP_SNAPSHOTS, INDEX_GC_GRACE_S
+    ap = argparse.ArgumentParser(description="List or garbage-collect index snapshots")
+    ap.add_argument("--gc", action="store_true", help="Remove old snapshots")
+    ap.add_argument("--keep", type=int, default=INDEX_KEEP_SNAPSHOTS)
+    ap.add_argument("--grace-s", type=float, default=INDEX_GC_GRACE_S)
+    args = ap.parse_args()
+
+    if args.gc:
+        removed = gc(INDEX_ROOT, keep=args.keep, grace_s=args.grace_s)
+        print(f"Removed {len(removed)} snapshot(s): {', '.join(removed) or '-'}")
+    cur = (read_pointer(INDEX_ROOT) or {}).get("snapshot")
+    for snap in list_snapshots(INDEX_ROOT):
+        size = sum(p.stat().st_size for p in snap.dir.rglob("*") if p.is_file())
+        print(f"{'*' if snap.id == cur else ' '} {snap.id}  {size / 1e6:8.2f} MB")
+
+if __name__ == "__main__":
+    main()
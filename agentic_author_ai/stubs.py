@@ -0,0 +1,370 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+# -------------------------------
+# Stub Servers
+# -------------------------------
+
+"""
+Local, offline stand-ins for the services the pipeline talks to:
+
+    POST /v1/chat/completions   OpenAI-compatible chat (incl. stream=true)
+    POST /v1/embeddings         OpenAI-compatible embeddings (float or base64)
+    GET  /search?q=...          search results (JSON list of {title, href, body})
+    GET  /page/<n>?q=...        synthetic HTML article
+
+Embeddings are deterministic hashed bag-of-words vectors, so similar texts get
+similar vectors and retrieval behaves sensibly. Every endpoint has configurable
+latency, jitter, tail latency (slow_rate / slow_ms) and error injection.
+
+Point the pipeline at it with:
+    export OPENAI_BASE_URL=http://127.0.0.1:8765/v1
+    export OPENAI_API_KEY=stub
+    export AGENTIC_SEARCH_URL=http://127.0.0.1:8765/search
+
+Usage:
+    python -m agentic_author_ai.stubs --port 8765 --chat-latency-ms 300 --error-rate 0.02
+"""
+
+from __future__ import annotations
+import argparse
+import base64
+import json
+import random
+import re
+import sys
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, quote_plus, urlparse
+
+import numpy as np
+
+from .tokens import estimate_tokens
+
+_WORD = re.compile(r"[A-Za-z0-9']+")
+
+@dataclass
+class StubConfig:
+    embed_dim: int = 3072
+    # Latency model: base + per-token (ms); jitter is a +/- fraction of the total
+    chat_latency_ms: float = 50.0
+    chat_ms_per_prompt_token: float = 0.0
+    chat_ms_per_output_token: float = 0.0
+    embed_latency_ms: float = 20.0
+    embed_ms_per_input: float = 0.0
+    search_latency_ms: float = 30.0
+    page_latency_ms: float = 40.0
+    jitter: float = 0.1
+    # Tail latency: this fraction of chat/page requests takes slow_ms longer
+    slow_rate: float = 0.0
+    slow_ms: float = 0.0
+    # Probability that any request fails with HTTP 500
+    error_rate: float = 0.0
+    # Approximate length of generated chat answers
+    completion_tokens: int = 200
+    page_paragraphs: int = 12
+    seed: int = 7
+    counters: Dict[str, int] = field(default_factory=dict)
+
+
+# -------------------------------
+# Deterministic fake models
+# -------------------------------
+
+def _tokens(text: str) -> List[str]:
+    return [w.lower() for w in _WORD.findall(text)]
+
+def count_tokens(text: str) -> int:
+    """Rough token estimate, good enough for latency models."""
+    return max(1, estimate_tokens(text))
+
+def hashed_embedding(text: str, dim: int) -> np.ndarray:
+    """Signed feature-hashing of unigrams + bigrams, L2-normalised."""
+    v = np.zeros(dim, dtype="float32")
+    toks = _tokens(text)
+    feats = toks + [a + "_" + b for a, b in zip(toks, toks[1:])]
+    for f in feats:
+        h = zlib.crc32(f.encode("utf-8"))
+        v[h % dim] += 1.0 if (h >> 31) & 1 else -1.0
+    n = float(np.linalg.norm(v))
+    if n == 0.0:
+        v[0] = 1.0
+        return v
+    return v / n
+
+def _chat_reply(messages: List[Dict[str, Any]], cfg: StubConfig) -> str:
+    text = "\n".join(str(m.get("content") or "") for m in messages)
+    last = str(messages[-1].get("content") or "") if messages else ""
+    if "Return JSON ONLY" in text or "Return STRICT JSON" in text:
+        wants_web = bool(re.search(r"research|source|cite|market|policy", last, re.I))
+        return json.dumps({
+            "allow_external": wants_web,
+            "rationale": "Stub planner decision.",
+            "research_focus": ["stub topic"] if wants_web else [],
+            "steps": ["Outline", "Draft", "Revise"],
+        })
+    if "Only output a number" in text:
+        return str(zlib.crc32(text.encode("utf-8")) % 11)
+    words = _tokens(last) or ["stub"]
+    rng = random.Random(zlib.crc32(last.encode("utf-8")))
+    n_words = max(1, int(cfg.completion_tokens * 0.75))
+    body = " ".join(rng.choice(words) for _ in range(n_words))
+    return f"Stub response.\n\n{body}."
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "agentic-stub/1.0"
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def cfg(self) -> StubConfig:
+        return self.server.cfg  # type: ignore[attr-defined]
+
+    def log_message(self, fmt: str, *args: Any) -> None:  # keep benchmarks quiet
+        return
+
+    # ---- helpers ----
+    def _count(self, key: str) -> None:
+        with self.server.lock:  # type: ignore[attr-defined]
+            self.cfg.counters[key] = self.cfg.counters.get(key, 0) + 1
+
+    def _sleep(self, ms: float) -> None:
+        if ms <= 0:
+            return
+        j = self.cfg.jitter
+        rng = self.server.rng  # type: ignore[attr-defined]
+        time.sleep(max(0.0, ms * (1.0 + rng.uniform(-j, j))) / 1000.0)
+
+    def _maybe_slow(self, key: str) -> None:
+        if self.cfg.slow_rate > 0 and self.server.rng.random() < self.cfg.slow_rate:  # type: ignore[attr-defined]
+            self._count(key + ":slow")
+            self._sleep(self.cfg.slow_ms)
+
+    def _maybe_fail(self, key: str) -> bool:
+        if self.cfg.error_rate > 0 and self.server.rng.random() < self.cfg.error_rate:  # type: ignore[attr-defined]
+            self._count(key + ":error")
+            self._send_json({"error": {"message": "injected failure", "type": "server_error"}}, status=500)
+            return True
+        return False
+
+    def _send(self, body: bytes, ctype: str, status: int = 200) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, obj: Any, status: int = 200) -> None:
+        self._send(json.dumps(obj).encode("utf-8"), "application/json", status)
+
+    def _read_json(self) -> Dict[str, Any]:
+        n = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(n) or b"{}")
+
+    # ---- routes ----
+    def do_POST(self) -> None:
+        path = urlparse(self.path).path
+        body = self._read_json()
+        if path.endswith("/embeddings"):
+            self._embeddings(body)
+        elif path.endswith("/chat/completions"):
+            self._chat(body)
+        else:
+            self._send_json({"error": {"message": f"no route {path}"}}, status=404)
+
+    def do_GET(self) -> None:
+        u = urlparse(self.path)
+        q = parse_qs(u.query)
+        if u.path == "/search":
+            self._search(q.get("q", [""])[0], int(q.get("max_results", ["8"])[0]))
+        elif u.path.startswith("/page/"):
+            self._page(u.path.rsplit("/", 1)[-1], q.get("q", [""])[0])
+        elif u.path == "/stats":
+            self._send_json(self.cfg.counters)
+        else:
+            self._send_json({"error": {"message": f"no route {u.path}"}}, status=404)
+
+    def _embeddings(self, body: Dict[str, Any]) -> None:
+        self._count("embeddings")
+        inputs = body.get("input") or []
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        self._sleep(self.cfg.embed_latency_ms + self.cfg.embed_ms_per_input * len(inputs))
+        if self._maybe_fail("embeddings"):
+            return
+        dim = int(body.get("dimensions") or self.cfg.embed_dim)
+        as_b64 = body.get("encoding_format") == "base64"
+        data, ntok = [], 0
+        for i, text in enumerate(inputs):
+            text = str(text)
+            ntok += count_tokens(text)
+            v = hashed_embedding(text, dim)
+            emb: Any = base64.b64encode(v.astype("<f4").tobytes()).decode("ascii") if as_b64 else v.tolist()
+            data.append({"object": "embedding", "index": i, "embedding": emb})
+        self._send_json({
+            "object": "list", "data": data, "model": body.get("model", "stub-embed"),
+            "usage": {"prompt_tokens": ntok, "total_tokens": ntok},
+        })
+
+    def _chat(self, body: Dict[str, Any]) -> None:
+        self._count("chat")
+        messages = body.get("messages") or []
+        prompt_tokens = sum(count_tokens(str(m.get("content") or "")) for m in messages)
+        reply = _chat_reply(messages, self.cfg)
+        out_tokens = count_tokens(reply)
+        # Time to first token scales with prompt size; the rest with output size.
+        self._sleep(self.cfg.chat_latency_ms + self.cfg.chat_ms_per_prompt_token * prompt_tokens)
+        self._maybe_slow("chat")
+        if self._maybe_fail("chat"):
+            return
+        model = body.get("model", "stub-chat")
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": out_tokens,
+                 "total_tokens": prompt_tokens + out_tokens}
+        if body.get("stream"):
+            self._stream_chat(reply, model, out_tokens)
+            return
+        self._sleep(self.cfg.chat_ms_per_output_token * out_tokens)
+        self._send_json({
+            "id": "chatcmpl-stub", "object": "chat.completion", "created": int(time.time()), "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": reply}, "finish_reason": "stop"}],
+            "usage": usage,
+        })
+
+    def _stream_chat(self, reply: str, model: str, out_tokens: int) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        pieces = re.findall(r"\S+\s*", reply) or [reply]
+        per_piece_ms = self.cfg.chat_ms_per_output_token * out_tokens / max(1, len(pieces))
+        for i, piece in enumerate(pieces):
+            if i:
+                self._sleep(per_piece_ms)
+            chunk = {
+                "id": "chatcmpl-stub", "object": "chat.completion.chunk", "created": int(time.time()),
+                "model": model, "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+        done = {"id": "chatcmpl-stub", "object": "chat.completion.chunk", "created": int(time.time()),
+                "model": model, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+        self.wfile.write(f"data: {json.dumps(done)}\n\ndata: [DONE]\n\n".encode("utf-8"))
+        self.wfile.flush()
+        self.close_connection = True
+
+    def _search(self, q: str, max_results: int) -> None:
+        self._count("search")
+        self._sleep(self.cfg.search_latency_ms)
+        if self._maybe_fail("search"):
+            return
+        host = f"http://{self.server.server_address[0]}:{self.server.server_address[1]}"  # type: ignore[attr-defined]
+        results = [{
+            "title": f"Stub source {i}: {q[:40]}",
+            "href": f"{host}/page/{i}?q={quote_plus(q)}",
+            "body": f"Search snippet {i} about {q[:80]}",
+        } for i in range(max_results)]
+        self._send_json(results)
+
+    def _page(self, page_id: str, q: str) -> None:
+        self._count("page")
+        self._sleep(self.cfg.page_latency_ms)
+        self._maybe_slow("page")
+        if self._maybe_fail("page"):
+            return
+        rng = random.Random(zlib.crc32(f"{page_id}:{q}".encode("utf-8")))
+        vocab = (_tokens(q) or ["topic"]) + ["market", "policy", "growth", "risk", "model", "data",
+                                               "report", "analysis", "industry", "regulation"]
+        paras = []
+        for _ in range(self.cfg.page_paragraphs):
+            sent = " ".join(rng.choice(vocab) for _ in range(60))
+            paras.append(f"<p>{sent.capitalize()}.</p>")
+        html = (
+            f"<html><head><title>Stub page {page_id}</title></head><body>"
+            f"<nav>Home | About | Contact</nav><article><h1>Stub page {page_id}</h1>"
+            + "".join(paras) + "</article><footer>Copyright stub</footer></body></html>"
+        )
+        self._send(html.encode("utf-8"), "text/html; charset=utf-8")
+
+
+# -------------------------------
+# Server lifecycle
+# -------------------------------
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256  # default of 5 drops SYNs under concurrent load
+
+    def __init__(self, addr: Tuple[str, int], cfg: StubConfig):
+        super().__init__(addr, _Handler)
+        self.cfg = cfg
+        self.lock = threading.Lock()
+        self.rng = random.Random(cfg.seed)
+
+    def handle_error(self, request: Any, client_address: Any) -> None:
+        # Clients that give up on a request (deadline, timeout) are expected; keep stderr clean
+        if isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            return
+        super().handle_error(request, client_address)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def env(self) -> Dict[str, str]:
+        """Environment variables that point the pipeline at this server."""
+        return {
+            "OPENAI_BASE_URL": self.base_url + "/v1",
+            "OPENAI_API_KEY": "stub",
+            "AGENTIC_SEARCH_URL": self.base_url + "/search",
+        }
+
+def start_stub_server(cfg: Optional[StubConfig] = None, host: str = "127.0.0.1", port: int = 0) -> StubServer:
+    """Start a stub server on a background thread (port=0 picks a free port)."""
+    srv = StubServer((host, port), cfg or StubConfig())
+    threading.Thread(target=srv.serve_forever, name="agentic-stub", daemon=True).start()
+    return srv
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Offline stub for OpenAI chat/embeddings and web search/fetch")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--embed-dim", type=int, default=3072)
+    ap.add_argument("--chat-latency-ms", type=float, default=50.0)
+    ap.add_argument("--chat-ms-per-prompt-token", type=float, default=0.0)
+    ap.add_argument("--chat-ms-per-output-token", type=float, default=0.0)
+    ap.add_argument("--embed-latency-ms", type=float, default=20.0)
+    ap.add_argument("--search-latency-ms", type=float, default=30.0)
+    ap.add_argument("--page-latency-ms", type=float, default=40.0)
+    ap.add_argument("--jitter", type=float, default=0.1)
+    ap.add_argument("--slow-rate", type=float, default=0.0, help="Fraction of chat/page requests that are slow")
+    ap.add_argument("--slow-ms", type=float, default=0.0, help="Extra latency of a slow request")
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    args = ap.parse_args()
+
+    cfg = StubConfig(
+        embed_dim=args.embed_dim, chat_latency_ms=args.chat_latency_ms,
+        chat_ms_per_prompt_token=args.chat_ms_per_prompt_token,
+        chat_ms_per_output_token=args.chat_ms_per_output_token,
+        embed_latency_ms=args.embed_latency_ms, search_latency_ms=args.search_latency_ms,
+        page_latency_ms=args.page_latency_ms, jitter=args.jitter, error_rate=args.error_rate,
+        slow_rate=args.slow_rate, slow_ms=args.slow_ms,
+    )
+    srv = StubServer((args.host, args.port), cfg)
+    print(f"Stub server on {srv.base_url}")
+    for k, v in srv.env().items():
+        print(f"  export {k}={v}")
+    try:
+        srv.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+# -------------------------------
+# Token Estimates
+# -------------------------------
+
+"""
+Tokenizer-free token estimate shared by context packing (context_pack.py),
+ingest dedup savings (dedup.py) and the stub server (stubs.py).
+
+Usage:
+    from .tokens import estimate_tokens
+    estimate_tokens("four words of text")   # -> 5
+"""
+
+def estimate_tokens(text: str) -> int:
+    """~0.75 words per token (English); good enough for budgets and cost estimates."""
+    return int(len(text.split()) * 4 / 3)
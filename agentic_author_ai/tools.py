@@ -30,7 +30,7 @@ def tool(*args, **kwargs):
         return Tool(*args, func=func, **kwargs)
     return decorator
 
-# Build RAG-backed retriever here
+# Build RAG-backed retriever here (async: embeddings + FAISS search never block the loop)
 retrieve_tool = make_retrieve_tool(Tool)
 
 # You can keep defining other tools below as before...
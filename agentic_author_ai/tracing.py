@@ -7,29 +7,284 @@
 # Tracing
 # -------------------------------
 
+"""
+Lightweight structured tracing for the pipeline (stdlib-only).
+
+Spans nest through contextvars, so they follow both threads of plain calls and
+asyncio tasks. Durations use the monotonic perf counter; finished spans land in
+a bounded ring buffer (TRACE_LOG) that can be exported as JSONL or as a
+Chrome/Perfetto trace (chrome://tracing), and summarised per stage. Events
+collected in worker processes are added with merge_events(), which moves them
+onto this process's timeline and keeps them apart by pid.
+
+Usage:
+    with trace_span("embed", n=len(texts)) as span:
+        r = client.embeddings.create(...)
+        span.record_usage(r)
+
+    @traced("author")
+    async def compose(...): ...
+
+    print(format_summary())
+    export_trace("data/trace.json")
+"""
+
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import Dict, List
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple, Union
 import contextlib
+import contextvars
+import functools
+import inspect
+import itertools
+import json
+import os
+import threading
 import time
 
+# Max finished spans kept in memory (oldest are dropped first)
+TRACE_BUFFER_SIZE = int(os.getenv("AGENTIC_TRACE_BUFFER", "10000"))
+
+# Reference points so perf-counter timestamps can be mapped to wall-clock time
+_T0_NS = time.perf_counter_ns()
+_T0_WALL = time.time()
+
 @dataclass
 class TraceEvent:
-    ts: float
+    ts: float                      # wall-clock time the span finished (epoch seconds)
     name: str
-    meta: Dict[str, float]
+    meta: Dict[str, Any]           # user attributes + duration_s
+    span_id: int = 0
+    parent_id: Optional[int] = None
+    start_ns: int = 0              # perf_counter_ns relative to process trace origin
+    dur_ns: int = 0
+    tid: int = 0
+    error: Optional[str] = None
+    pid: int = 0                   # process that recorded the span
+
+    @property
+    def duration_s(self) -> float:
+        return self.dur_ns / 1e9
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "ts": self.ts,
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_us": self.start_ns / 1e3,
+            "dur_us": self.dur_ns / 1e3,
+            "pid": self.pid,
+            "tid": self.tid,
+            "error": self.error,
+            "meta": self.meta,
+        }
+
+TRACE_LOG: Deque[TraceEvent] = deque(maxlen=TRACE_BUFFER_SIZE)
 
-TRACE_LOG: List[TraceEvent] = []
+_ids = itertools.count(1)
+_current: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("agentic_trace_span", default=None)
+
+
+@dataclass
+class Span:
+    """Handle for an open span; attributes set here are exported with the event."""
+    name: str
+    span_id: int
+    parent_id: Optional[int]
+    start_ns: int
+    attrs: Dict[str, Any] = field(default_factory=dict)
+
+    def set(self, **attrs: Any) -> "Span":
+        self.attrs.update(attrs)
+        return self
+
+    def record_usage(self, resp: Any) -> "Span":
+        """Copy token counts from an OpenAI-style response (``resp.usage``) if present."""
+        usage = getattr(resp, "usage", None)
+        if usage is None:
+            return self
+        for key in ("prompt_tokens", "completion_tokens", "total_tokens"):
+            val = getattr(usage, key, None)
+            if val is not None:
+                self.attrs[key] = self.attrs.get(key, 0) + int(val)
+        return self
+
+
+def current_span() -> Optional[Span]:
+    return _current.get()
 
 @contextlib.contextmanager
-def trace_span(name: str, **meta):
-    start = time.time()
+def trace_span(name: str, **meta: Any):
+    parent = _current.get()
+    span = Span(name=name, span_id=next(_ids),
+                parent_id=parent.span_id if parent else None,
+                start_ns=time.perf_counter_ns(), attrs=dict(meta))
+    token = _current.set(span)
+    error = None
     try:
-        yield
+        yield span
+    except BaseException as e:
+        error = f"{type(e).__name__}: {e}"
+        raise
     finally:
-        dur = time.time() - start
-        TRACE_LOG.append(TraceEvent(time.time(), name, {**meta, "duration_s": round(dur, 4)}))
+        end = time.perf_counter_ns()
+        _current.reset(token)
+        dur = end - span.start_ns
+        TRACE_LOG.append(TraceEvent(
+            ts=_T0_WALL + (end - _T0_NS) / 1e9,
+            name=name,
+            meta={**span.attrs, "duration_s": round(dur / 1e9, 4)},
+            span_id=span.span_id,
+            parent_id=span.parent_id,
+            start_ns=span.start_ns - _T0_NS,
+            dur_ns=dur,
+            tid=threading.get_ident(),
+            error=error,
+            pid=os.getpid(),
+        ))
+
+def traced(name: Optional[str] = None, **meta: Any) -> Callable:
+    """Decorator form of trace_span for sync and async functions."""
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def awrapper(*args, **kwargs):
+                with trace_span(span_name, **meta):
+                    return await func(*args, **kwargs)
+            return awrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with trace_span(span_name, **meta):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def clear_trace() -> None:
+    TRACE_LOG.clear()
+
+def merge_events(events: Iterable[TraceEvent]) -> None:
+    """
+    Add events recorded in another process (e.g. a pool worker) to TRACE_LOG. Their
+    start_ns counts from that process's own origin, so it is recomputed from the
+    wall-clock end time minus the duration, on this process's timeline.
+    """
+    pid = os.getpid()
+    for e in events:
+        if e.pid != pid:
+            e.start_ns = int((e.ts - _T0_WALL) * 1e9) - e.dur_ns
+        TRACE_LOG.append(e)
+
+
+# -------------------------------
+# Summaries
+# -------------------------------
+
+def percentile(values: Iterable[float], p: float) -> float:
+    """Linear-interpolated percentile (p in 0..100); 0.0 for empty input."""
+    xs = sorted(values)
+    if not xs:
+        return 0.0
+    if len(xs) == 1:
+        return float(xs[0])
+    pos = (len(xs) - 1) * (p / 100.0)
+    lo = int(pos)
+    hi = min(lo + 1, len(xs) - 1)
+    return float(xs[lo] + (xs[hi] - xs[lo]) * (pos - lo))
+
+def stage_summary(events: Optional[Iterable[TraceEvent]] = None) -> Dict[str, Dict[str, float]]:
+    """Per-stage latency stats (ms) and summed token counts, keyed by span name."""
+    by_name: Dict[str, List[TraceEvent]] = {}
+    for e in (TRACE_LOG if events is None else events):
+        by_name.setdefault(e.name, []).append(e)
+    out: Dict[str, Dict[str, float]] = {}
+    for name, evs in by_name.items():
+        ms = [e.dur_ns / 1e6 for e in evs]
+        row = {
+            "count": len(evs),
+            "errors": sum(1 for e in evs if e.error),
+            "total_ms": round(sum(ms), 3),
+            "p50_ms": round(percentile(ms, 50), 3),
+            "p95_ms": round(percentile(ms, 95), 3),
+            "p99_ms": round(percentile(ms, 99), 3),
+            "max_ms": round(max(ms), 3),
+        }
+        for key in ("prompt_tokens", "completion_tokens", "total_tokens"):
+            tok = sum(int(e.meta.get(key, 0) or 0) for e in evs)
+            if tok:
+                row[key] = tok
+        out[name] = row
+    return out
+
+def format_summary(events: Optional[Iterable[TraceEvent]] = None) -> str:
+    summary = stage_summary(events)
+    if not summary:
+        return "Trace summary: (no spans)"
+    width = max(len(n) for n in summary)
+    header = f"{'stage':<{width}}  {'n':>5} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'total ms':>11} {'tokens':>8}"
+    rows = [header, "-" * len(header)]
+    for name, s in sorted(summary.items(), key=lambda kv: kv[1]["total_ms"], reverse=True):
+        rows.append(
+            f"{name:<{width}}  {s['count']:>5} {s['p50_ms']:>10.1f} {s['p95_ms']:>10.1f} "
+            f"{s['p99_ms']:>10.1f} {s['total_ms']:>11.1f} {int(s.get('total_tokens', 0)):>8}"
+        )
+    return "Trace summary:\n" + "\n".join(rows)
 
 def dump_trace() -> str:
-    rows = [f"- {e.name} ({e.meta.get('duration_s','?')}s)" for e in TRACE_LOG]
-    return "Trace:\n" + "\n".join(rows)
\ No newline at end of file
+    """Indented span tree of the buffered events (children under their parents)."""
+    events = sorted(TRACE_LOG, key=lambda e: e.start_ns)
+    known = {(e.pid, e.span_id) for e in events}     # span ids are only unique per process
+    children: Dict[Optional[Tuple[int, Optional[int]]], List[TraceEvent]] = {}
+    for e in events:
+        parent = (e.pid, e.parent_id) if (e.pid, e.parent_id) in known else None
+        children.setdefault(parent, []).append(e)
+
+    rows: List[str] = []
+    def walk(parent: Optional[Tuple[int, Optional[int]]], depth: int) -> None:
+        for e in children.get(parent, []):
+            flag = " !" if e.error else ""
+            rows.append(f"{'  ' * depth}- {e.name} ({e.meta.get('duration_s', '?')}s){flag}")
+            walk((e.pid, e.span_id), depth + 1)
+    walk(None, 0)
+    return "Trace:\n" + "\n".join(rows)
+
+
+# -------------------------------
+# Export
+# -------------------------------
+
+def export_jsonl(path: Union[str, Path]) -> Path:
+    p = Path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    with open(p, "w", encoding="utf-8") as f:
+        for e in list(TRACE_LOG):
+            f.write(json.dumps(e.to_dict(), ensure_ascii=False, default=str) + "\n")
+    return p
+
+def export_chrome(path: Union[str, Path]) -> Path:
+    """Write complete ('X') events in Chrome trace format (one track per process and thread)."""
+    pid = os.getpid()
+    events = [{
+        "name": e.name,
+        "cat": e.name.split(":", 1)[0].split(".", 1)[0],
+        "ph": "X",
+        "ts": e.start_ns / 1e3,
+        "dur": e.dur_ns / 1e3,
+        "pid": e.pid or pid,
+        "tid": e.tid,
+        "args": {**e.meta, **({"error": e.error} if e.error else {})},
+    } for e in list(TRACE_LOG)]
+    p = Path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}, default=str), encoding="utf-8")
+    return p
+
+def export_trace(path: Union[str, Path]) -> Path:
+    """Export by extension: .jsonl → one event per line, anything else → Chrome trace JSON."""
+    if str(path).endswith(".jsonl"):
+        return export_jsonl(path)
+    return export_chrome(path)
@@ -0,0 +1,268 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+# -------------------------------
+# Vector Storage
+# -------------------------------
+
+"""
+Storage formats for the FAISS index.
+
+    float32   IndexFlatIP, 4 bytes/dim (the original layout)
+    float16   IndexScalarQuantizer(QT_fp16), 2 bytes/dim
+    int8      IndexScalarQuantizer(QT_8bit), 1 byte/dim, per-dimension ranges trained on the corpus
+
+Any format can also keep only the first `dim` components of each vector
+(Matryoshka-style truncation; text-embedding-3 vectors are trained so that a
+prefix is still a good embedding) and re-normalise them.
+
+If index.py also saved the full float32 vectors (rag_vectors.npy), StoredIndex can
+rescore the top candidates exactly. The file is memory-mapped, so only the
+candidate rows are read.
+
+Indexes can be opened memory-mapped as well (read_index(..., mmap=True)): the codes
+stay in the OS page cache instead of private memory, so several worker processes
+on one host share a single copy.
+
+Benchmark the options on the current index:
+    python -m agentic_author_ai.vectors --k 8
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import faiss
+import numpy as np
+
+STORAGE_TYPES = ("float32", "float16", "int8")
+
+def truncate_dims(X: np.ndarray, dim: Optional[int]) -> np.ndarray:
+    """Keep the first `dim` components and re-normalise (no-op when dim is None or >= width)."""
+    X = np.ascontiguousarray(X, dtype="float32")
+    if not dim or dim >= X.shape[1]:
+        return X
+    Y = np.ascontiguousarray(X[:, :dim])
+    faiss.normalize_L2(Y)
+    return Y
+
+def build_index(X: np.ndarray, storage: str = "float32", dim: Optional[int] = None) -> faiss.Index:
+    """Inner-product index over (optionally truncated) vectors in the requested precision."""
+    if storage not in STORAGE_TYPES:
+        raise ValueError(f"storage must be one of {STORAGE_TYPES}, got {storage!r}")
+    Xs = truncate_dims(X, dim)
+    d = Xs.shape[1]
+    if storage == "float32":
+        index = faiss.IndexFlatIP(d)
+    else:
+        qtype = faiss.ScalarQuantizer.QT_fp16 if storage == "float16" else faiss.ScalarQuantizer.QT_8bit
+        index = faiss.IndexScalarQuantizer(d, qtype, faiss.METRIC_INNER_PRODUCT)
+        index.train(Xs)
+    index.add(Xs)
+    return index
+
+def rescore(full: np.ndarray, V: np.ndarray, I: np.ndarray, n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Exact float32 inner products for each row's candidates, keep the best n per row."""
+    nq = V.shape[0]
+    D_out = np.full((nq, n), -np.inf, dtype="float32")
+    I_out = np.full((nq, n), -1, dtype="int64")
+    for r in range(nq):
+        ids = I[r][I[r] >= 0]
+        if ids.size == 0:
+            continue
+        order = np.argsort(ids)            # sequential reads from the memmap
+        rows = np.asarray(full[ids[order]], dtype="float32")
+        scores = np.empty(ids.size, dtype="float32")
+        scores[order] = rows @ V[r]
+        top = np.argsort(-scores)[:n]
+        D_out[r, : top.size] = scores[top]
+        I_out[r, : top.size] = ids[top]
+    return D_out, I_out
+
+
+class StoredIndex:
+    """
+    Wraps a FAISS index with the storage settings it was built with, so callers can
+    search with full-width query vectors (.search / .ntotal / .d like a FAISS index).
+    """
+
+    def __init__(self, index: faiss.Index, storage: str = "float32", dim: Optional[int] = None,
+                 full: Optional[np.ndarray] = None, rescore_candidates: int = 0):
+        self.index = index
+        self.storage = storage
+        self.dim = dim
+        self.full = full
+        self.rescore_candidates = rescore_candidates
+
+    @property
+    def ntotal(self) -> int:
+        return int(self.index.ntotal)
+
+    @property
+    def d(self) -> int:
+        return int(self.full.shape[1]) if self.full is not None else int(self.index.d)
+
+    @property
+    def rescoring(self) -> bool:
+        return self.full is not None and self.rescore_candidates > 0
+
+    def search(self, V: np.ndarray, n: int) -> Tuple[np.ndarray, np.ndarray]:
+        Vq = truncate_dims(V, self.dim)
+        if not self.rescoring:
+            return self.index.search(Vq, n)
+        _, I = self.index.search(Vq, max(n, self.rescore_candidates))
+        return rescore(self.full, np.ascontiguousarray(V, dtype="float32"), I, n)
+
+    def reconstruct_batch(self, ids: np.ndarray) -> np.ndarray:
+        """Stored vectors for ids (full float32 when available, else decoded index codes)."""
+        ids = np.asarray(ids, dtype="int64")
+        if self.full is not None:
+            return np.asarray(self.full[ids], dtype="float32")
+        return self.index.reconstruct_batch(ids)
+
+    def nbytes(self) -> int:
+        """Resident size of the searchable index (excludes the memory-mapped full vectors)."""
+        return int(faiss.serialize_index(self.index).nbytes)
+
+
+def read_index(path: Path, mmap: bool = False) -> faiss.Index:
+    """faiss.read_index, optionally zero-copy memory-mapped (falls back to a private copy)."""
+    if mmap:
+        flag = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+        try:
+            return faiss.read_index(str(path), flag)
+        except RuntimeError:
+            pass  # index type without mmap support
+    return faiss.read_index(str(path))
+
+def write_index(index: faiss.Index, path: Path) -> None:
+    """Write via a temp file + rename, so processes that mmap the old file keep a valid copy."""
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    faiss.write_index(index, str(tmp))
+    os.replace(tmp, path)
+
+def save_vectors(path: Path, X: np.ndarray) -> None:
+    """np.save with the same temp file + rename as write_index (the .npy is memory-mapped by readers)."""
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        np.save(f, X)
+    os.replace(tmp, path)
+
+def write_manifest(path: Path, **fields: Any) -> None:
+    Path(path).write_text(json.dumps(fields, indent=2), encoding="utf-8")
+
+def read_manifest(path: Path) -> Dict[str, Any]:
+    p = Path(path)
+    return json.loads(p.read_text(encoding="utf-8")) if p.exists() else {}
+
+def load_stored_index(index_path: Path, manifest_path: Path, rescore_candidates: int = 0,
+                      mmap: bool = False) -> StoredIndex:
+    """Open an index written by index.py; older indexes without a manifest load as plain float32."""
+    manifest = read_manifest(manifest_path)
+    index = read_index(index_path, mmap=mmap)
+    full = None
+    vec_name = manifest.get("full_vectors")
+    if vec_name and rescore_candidates:
+        vec_path = Path(index_path).parent / vec_name
+        if vec_path.exists():
+            full = np.load(vec_path, mmap_mode="r")
+    return StoredIndex(index, storage=manifest.get("storage", "float32"), dim=manifest.get("dim"),
+                       full=full, rescore_candidates=rescore_candidates)
+
+
+# -------------------------------
+# Benchmark: memory / build time / latency / recall@k
+# -------------------------------
+
+def _recall(I_approx: np.ndarray, I_exact: np.ndarray, k: int) -> float:
+    hits = [len(set(a[:k]) & set(e[:k])) / k for a, e in zip(I_approx, I_exact)]
+    return float(np.mean(hits)) if hits else 0.0
+
+def storage_report(X: np.ndarray, Q: np.ndarray, k: int = 8,
+                   options: Optional[List[Tuple[str, Optional[int]]]] = None,
+                   rescore_candidates: int = 64) -> List[Dict[str, Any]]:
+    """Compare storage options against exact float32 full-width search on the same data."""
+    X = np.ascontiguousarray(X, dtype="float32")
+    Q = np.ascontiguousarray(Q, dtype="float32")
+    full_dim = X.shape[1]
+    if options is None:
+        options = [("float32", None), ("float16", None), ("int8", None)]
+        for d in (1024, 512, 256):
+            if d < full_dim:
+                options += [("float32", d), ("int8", d)]
+    k = min(k, X.shape[0])
+    exact = faiss.IndexFlatIP(full_dim)
+    exact.add(X)
+    _, I_exact = exact.search(Q, k)
+
+    rows = []
+    for storage, dim in options:
+        t0 = time.perf_counter()
+        idx = build_index(X, storage=storage, dim=dim)
+        build_s = time.perf_counter() - t0
+        for rescore_k in ((0, rescore_candidates) if (storage != "float32" or dim) else (0,)):
+            si = StoredIndex(idx, storage=storage, dim=dim, full=X if rescore_k else None,
+                             rescore_candidates=rescore_k)
+            t0 = time.perf_counter()
+            for i in range(Q.shape[0]):
+                si.search(Q[i:i + 1], k)
+            lat_ms = (time.perf_counter() - t0) / max(1, Q.shape[0]) * 1000.0
+            _, I = si.search(Q, k)
+            index_bytes = si.nbytes()
+            rows.append({
+                "storage": storage,
+                "dim": dim or full_dim,
+                "rescore": rescore_k,
+                "index_bytes": index_bytes,
+                "bytes_per_vector": round(index_bytes / max(1, X.shape[0]), 1),
+                "build_ms": round(build_s * 1000.0, 2),
+                "query_ms": round(lat_ms, 4),
+                f"recall@{k}": round(_recall(I, I_exact, k), 4),
+            })
+    return rows
+
+def format_report(rows: List[Dict[str, Any]]) -> str:
+    if not rows:
+        return "(no rows)"
+    rkey = next(k for k in rows[0] if k.startswith("recall@"))
+    out = [f"{'storage':<8} {'dim':>5} {'rescore':>7} {'bytes/vec':>10} {'index MB':>9} "
+           f"{'build ms':>9} {'query ms':>9} {rkey:>9}"]
+    for r in rows:
+        out.append(f"{r['storage']:<8} {r['dim']:>5} {r['rescore']:>7} {r['bytes_per_vector']:>10.0f} "
+                   f"{r['index_bytes'] / 1e6:>9.2f} {r['build_ms']:>9.1f} {r['query_ms']:>9.3f} {r[rkey]:>9.3f}")
+    return "\n".join(out)
+
+def main():
+    from .rag_config import DATA_DIR, FAISS_INDEX, FULL_VECTORS, INDEX_ROOT
+    from .snapshots import current
+    ap = argparse.ArgumentParser(description="Compare vector storage options on the current index")
+    ap.add_argument("--k", type=int, default=8)
+    ap.add_argument("--queries", type=int, default=200, help="Noisy copies of corpus vectors used as queries")
+    ap.add_argument("--noise", type=float, default=0.02, help="Gaussian noise added to query vectors")
+    ap.add_argument("--json", action="store_true")
+    args = ap.parse_args()
+
+    snap = current(INDEX_ROOT, legacy_dir=DATA_DIR)
+    if snap.path(FULL_VECTORS.name).exists():
+        X = np.load(snap.path(FULL_VECTORS.name))
+    else:
+        index = faiss.read_index(str(snap.path(FAISS_INDEX.name)))
+        X = index.reconstruct_n(0, index.ntotal)
+    rng = np.random.default_rng(7)
+    Q = X[rng.integers(0, X.shape[0], size=args.queries)]
+    Q = Q + rng.normal(0, args.noise, size=Q.shape).astype("float32")
+    faiss.normalize_L2(Q)
+
+    rows = storage_report(X, Q, k=args.k)
+    print(json.dumps(rows, indent=2) if args.json else format_report(rows))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+"""
+Shared test setup: point the package at a scratch data dir before anything
+imports rag_config, so tests never read or write agentic_author_ai/data.
+
+Usage:
+    python -m pytest -q
+"""
+
+import os
+import tempfile
+
+os.environ["AGENTIC_DATA_DIR"] = tempfile.mkdtemp(prefix="agentic-tests-")
@@ -0,0 +1,100 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+"""Topic sharing and resume of batch authoring (batch.py)."""
+
+import json
+import threading
+import time
+
+from agentic_author_ai import query as rag_query
+from agentic_author_ai import researcher
+from agentic_author_ai.batch import TopicMemo, completed_ids, run_batch
+
+
+def test_memo_shares_similar_topics_within_a_scope():
+    memo = TopicMemo(0.6)
+    calls = []
+    compute = lambda: calls.append(1) or len(calls)
+    assert memo.get("a", "payments fraud in card networks", compute) == 1
+    assert memo.get("a", "card networks payments fraud", compute) == 1      # same terms
+    assert memo.get("b", "card networks payments fraud", compute) == 2      # other scope
+    assert memo.get("a", "capital rules for banks", compute) == 3           # other topic
+    assert memo.stats() == {"hits": 1, "misses": 3, "hit_rate": 0.25}
+
+
+def test_memo_idf_ignores_boilerplate():
+    prompts = [f"Write a short brief on {t}" for t in ("payments", "capital", "inference")]
+    memo = TopicMemo(0.6, prompts)
+    assert memo.get(0, prompts[0], lambda: "p") == "p"
+    assert memo.get(0, prompts[1], lambda: "c") == "c"    # only "write a short brief" in common
+
+
+def test_memo_runs_concurrent_lookups_once_and_does_not_share_failures():
+    memo = TopicMemo(0.6)
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.05)
+        return "ok"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(memo.get(0, "ledger audit", slow))) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == ["ok"] * 4 and len(calls) == 1
+
+    def boom():
+        raise RuntimeError("down")
+
+    memo2 = TopicMemo(0.6)
+    try:
+        memo2.get(0, "ledger audit", boom)
+    except RuntimeError:
+        pass
+    assert memo2.get(0, "ledger audit", lambda: "retry") == "retry"
+
+
+def fake_pipeline(plan):
+    """run_pipeline stand-in: makes the retrieve/research calls listed in plan[prompt]."""
+    def pipeline(prompt, session, retrieve_fn=None, research_fn=None, **_):
+        for kind, kwargs in plan[prompt]:
+            (retrieve_fn if kind == "rag" else research_fn)(prompt, **kwargs)
+        return {"final_text": prompt.upper(), "plan": {}, "rag_chunks": [], "web_sources": []}
+    return pipeline
+
+
+def test_shared_results_respect_arguments_and_budgets(tmp_path, monkeypatch):
+    rag_calls, web_calls = [], []
+    monkeypatch.setattr(rag_query, "retrieve", lambda q, **kw: rag_calls.append(kw) or [])
+    monkeypatch.setattr(researcher, "gather_sources", lambda q, **kw: web_calls.append(kw) or [])
+    # Same topic (same terms), so only the call arguments decide what is shared
+    a, b, c, d = "card fraud payments", "payments card fraud", "fraud payments card", "card payments fraud"
+    plan = {
+        a: [("rag", {"k": 8}), ("web", {"max_sources": 2, "budget_s": None})],
+        b: [("rag", {"k": 8}), ("web", {"max_sources": 2, "budget_s": None})],     # shares both
+        c: [("rag", {"k": 8, "mmr_lambda": 1.0}), ("web", {"max_sources": 2, "budget_s": 0.2})],
+        d: [("web", {"max_sources": 2})],                                            # shares a's
+        "capital rules for banks": [],
+    }
+    items = [{"id": str(i), "prompt": p} for i, p in enumerate(plan)]
+    stats = run_batch(items, tmp_path / "out.jsonl", concurrency=1, pipeline=fake_pipeline(plan))
+    assert stats.done == 5
+    assert [kw.get("mmr_lambda") for kw in rag_calls] == [None, 1.0]     # other mmr_lambda: not shared
+    assert web_calls == [{"max_sources": 2}, {"max_sources": 2, "budget_s": 0.2}]
+    assert (stats.retrieval_shared, stats.research_shared) == (1, 2)
+
+
+def test_rerun_skips_completed_prompts(tmp_path):
+    plan = {"alpha": [], "beta": []}
+    items = [{"id": "a", "prompt": "alpha"}, {"id": "b", "prompt": "beta"}]
+    out = tmp_path / "out.jsonl"
+    out.write_text(json.dumps({"id": "a", "final_text": "x"}) + "\n" + json.dumps({"id": "b", "error": "x"}) + "\n")
+    stats = run_batch(items, out, pipeline=fake_pipeline(plan), share=False)
+    assert (stats.skipped, stats.done) == (1, 1)
+    assert completed_ids(out) == {"a", "b"}
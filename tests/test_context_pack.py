@@ -0,0 +1,67 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+"""Overlap merging and query-focused sentence packing (context_pack.py)."""
+
+from agentic_author_ai.context_pack import (Block, blocks_from_chunks, citation_label, merge_overlapping,
+                                            pack_blocks, render_blocks)
+from agentic_author_ai.tokens import estimate_tokens
+
+WORDS = [f"w{i}" for i in range(30)]
+
+
+def test_citation_label_and_blocks_from_chunks():
+    meta = {"source": "book.pdf", "page_start": 3, "page_end": 4, "section": "Intro"}
+    assert citation_label(meta) == "book.pdf:pp.3-4 §Intro"
+    assert citation_label({"session": "s1"}) == "s1"
+    blocks = blocks_from_chunks([{"text": "  ", "meta": meta}, {"content": "Body.", "meta": meta}])
+    assert [(b.label, b.text, b.rank) for b in blocks] == [("[book.pdf:pp.3-4 §Intro]", "Body.", 1)]
+
+
+def test_merge_overlapping_windows_of_same_source():
+    a = Block("[doc]", " ".join(WORDS[:20]), rank=2)
+    b = Block("[doc]", " ".join(WORDS[10:30]), rank=0)
+    contained = Block("[doc]", " ".join(WORDS[12:18]), rank=5)
+    other = Block("[other]", " ".join(WORDS[10:30]), rank=1)
+    merged, n = merge_overlapping([a, b, contained, other])
+    assert n == 2
+    assert [blk.label for blk in merged] == ["[doc]", "[other]"]
+    assert merged[0].text == " ".join(WORDS) and merged[0].rank == 0
+    assert a.text == " ".join(WORDS[:20])   # inputs are not modified
+
+
+def test_short_overlap_is_not_merged():
+    a = Block("[doc]", " ".join(WORDS[:10]))
+    b = Block("[doc]", " ".join(WORDS[5:15]))
+    merged, n = merge_overlapping([a, b])
+    assert n == 0 and len(merged) == 2
+
+
+def test_pack_blocks_keeps_relevant_sentences_within_budget():
+    filler = " ".join(f"Filler sentence number {i} talks about nothing in particular." for i in range(20))
+    blocks = [
+        Block("[a]", filler + " The reactor coolant pump failed at noon. " + filler, rank=0),
+        Block("[b]", filler, rank=1),
+        Block("[c]", "Coolant pump maintenance was skipped in spring.", rank=2),
+    ]
+    out, stats = pack_blocks("why did the coolant pump fail", blocks, max_tokens=40)
+    assert [b.label for b in out] == ["[a]", "[c]"]
+    assert "The reactor coolant pump failed at noon." in out[0].sentences
+    assert out[0].truncated and len(out[0].sentences) < 5
+    assert not out[1].truncated and out[1].gaps == [False]
+    assert stats.tokens_out <= 40 < stats.tokens_in and stats.reduction > 0.5
+    text = render_blocks(out)
+    assert text.startswith("[a]\n") and "The reactor coolant pump failed at noon. …" in text
+    assert text.endswith("[c]\nCoolant pump maintenance was skipped in spring.")
+
+
+def test_pack_blocks_drops_repeated_sentences_and_fits_everything_when_room():
+    s = "Repeated sentence about pumps."
+    blocks = [Block("[a]", s + " Unique one."), Block("[b]", s)]
+    out, stats = pack_blocks("pumps", blocks, max_tokens=1000)
+    assert stats.sentences_in == 2 and stats.sentences_out == 2
+    assert [b.label for b in out] == ["[a]"]
+    assert render_blocks(out) == "[a]\n" + s + " Unique one."
+    assert stats.tokens_out <= sum(estimate_tokens(b.label) + estimate_tokens(b.text) for b in blocks)
@@ -0,0 +1,97 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+"""Deadline budgets, stage reserves and the latency model (deadline.py)."""
+
+import pytest
+
+from agentic_author_ai.deadline import Deadline, LatencyModel, timed_client
+from agentic_author_ai.rag_config import MIN_CALL_TIMEOUT_S
+
+PRIORS = {"planner": 1.0, "retrieve": 0.5, "research": 2.0, "author": 3.0, "editor": 1.0}
+
+
+class Clock:
+    def __init__(self):
+        self.t = 100.0
+
+    def __call__(self):
+        return self.t
+
+
+def make(budget, model=None):
+    clock = Clock()
+    return Deadline(budget, model=model or LatencyModel(PRIORS), clock=clock), clock
+
+
+def test_latency_model_uses_priors_then_p90_of_window():
+    m = LatencyModel({"author": 3.0}, window=10, min_samples=5)
+    for _ in range(4):
+        m.observe("author", 1.0)
+    assert m.estimate("author") == 3.0 and m.estimate("unknown") == 0.0
+    m.observe("author", 1.0)
+    assert m.estimate("author") == 1.0
+    for i in range(10):
+        m.observe("author", float(i + 1))          # older observations fall out of the window
+    assert m.estimate("author") == pytest.approx(9.1)
+
+
+def test_slack_reserves_required_later_stages():
+    dl, clock = make(10.0)
+    clock.t += 2.0
+    assert dl.remaining() == 8.0
+    assert dl.reserve("planner") == 3.5                 # retrieve + author
+    assert dl.reserve("research") == 3.0                # author only
+    assert dl.reserve("editor") == 0.0
+    assert dl.slack("research") == 5.0
+    assert dl.slack("research", after=("planner", "retrieve")) == 3.5
+
+
+def test_fits_and_timeout():
+    dl, clock = make(10.0)
+    assert dl.fits("research")
+    clock.t += 4.5                                      # slack(research) = 2.5
+    assert dl.fits("research") and not dl.fits("research", 1.5)
+    assert dl.timeout("research") == 2.5
+    clock.t += 5.45                                     # 0.05 s left
+    assert not dl.fits("editor", 0.1)
+    assert dl.timeout("author") == MIN_CALL_TIMEOUT_S   # never below the floor
+
+
+def test_unlimited_never_sheds():
+    dl, clock = make(None)
+    clock.t += 1e6
+    assert dl.unlimited and dl.fits("editor") and dl.timeout("author") is None
+    assert dl.report()["met"] is True
+
+
+def test_stages_feed_the_model_even_when_cut_short():
+    model = LatencyModel(PRIORS, min_samples=1)
+    dl, clock = make(10.0, model)
+    with dl.stage("retrieve"):
+        clock.t += 0.25
+    with pytest.raises(TimeoutError):
+        with dl.stage("author"):
+            clock.t += 4.0
+            raise TimeoutError
+    assert model.estimate("retrieve") == 0.25
+    assert model.estimate("author") == 4.0              # censored: the time it ran
+    dl.degrade("author", "timeout", "notes draft")
+    rep = dl.report()
+    assert rep["stages"] == {"retrieve": 0.25, "author": 4.0}
+    assert rep["degradations"] == [{"stage": "author", "action": "timeout", "detail": "notes draft", "at_s": 4.25}]
+    assert rep["met"] is True
+    clock.t += 6.0
+    assert dl.report()["met"] is False
+
+
+def test_timed_client():
+    class Client:
+        def with_options(self, **kw):
+            return kw
+
+    c = Client()
+    assert timed_client(c, None) is c
+    assert timed_client(c, 2.0) == {"timeout": 2.0, "max_retries": 0}
@@ -0,0 +1,77 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+"""Near-duplicate detection and provenance folding (dedup.py)."""
+
+import json
+
+from agentic_author_ai.dedup import NearDuplicateIndex, dedup_chunks, dedup_file, vector_bytes
+
+BASE = ("The lighthouse keeper climbed the spiral stairs every evening at dusk, trimming the wick "
+        "and polishing the great lens until it threw a clean white beam across the harbour mouth.")
+OTHER = ("Quarterly revenue rose on stronger subscription renewals, while operating costs fell after "
+         "the data centre migration finished two months ahead of the original schedule.")
+
+
+def chunk(cid, text, **meta):
+    return {"id": cid, "text": text, "meta": meta}
+
+
+def corpus():
+    return [
+        chunk("a", BASE, source="book.pdf", page_start=1),
+        chunk("b", OTHER, source="report.pdf"),
+        chunk("c", BASE + " Every night.", source="book-v2.pdf", page_start=3),
+        chunk("d", BASE, session="s1"),
+    ]
+
+
+def test_near_duplicates_fold_into_first_representative():
+    kept, stats = dedup_chunks(corpus(), threshold=0.8)
+    assert [c["id"] for c in kept] == ["a", "b"]
+    prov = kept[0]["meta"]["provenance"]
+    assert prov == [{"id": "c", "source": "book-v2.pdf", "page_start": 3}, {"id": "d", "session": "s1"}]
+    assert "provenance" not in kept[1]["meta"]
+    assert (stats.chunks_in, stats.chunks_out, stats.duplicates, stats.groups) == (4, 2, 2, 1)
+    assert stats.tokens_saved > 0 and stats.meta_bytes_saved > 0
+
+
+def test_distinct_texts_are_all_kept():
+    kept, stats = dedup_chunks([chunk("a", BASE), chunk("b", OTHER)])
+    assert len(kept) == 2 and stats.duplicates == 0 and stats.groups == 0
+
+
+def test_index_evicts_oldest_representative_beyond_max_reps():
+    idx = NearDuplicateIndex(threshold=0.8, max_reps=1)
+    s1, s2 = idx.signature(BASE), idx.signature(OTHER)
+    idx.insert("a", s1)
+    assert idx.query(s1) == "a"
+    idx.insert("b", s2)
+    assert "a" not in idx and "b" in idx and len(idx) == 1 and idx.evicted == 1
+    assert idx.query(s1) is None
+    assert idx.query(s2) == "b"
+
+
+def test_dedup_file_matches_in_memory(tmp_path):
+    inp = tmp_path / "chunks.jsonl"
+    inp.write_text("".join(json.dumps(c) + "\n" for c in corpus()), encoding="utf-8")
+    for out in (tmp_path / "out.json", tmp_path / "out.jsonl"):
+        stats = dedup_file(inp, out, threshold=0.8)
+        text = out.read_text(encoding="utf-8")
+        got = json.loads(text) if out.suffix == ".json" else [json.loads(l) for l in text.splitlines()]
+        assert got == dedup_chunks(corpus(), threshold=0.8)[0]
+        assert stats.duplicates == 2
+        assert not (tmp_path / (out.name + ".reps.tmp")).exists()
+
+
+def test_json_array_input_and_vector_bytes(tmp_path):
+    inp = tmp_path / "chunks.json"
+    inp.write_text(json.dumps(corpus(), indent=1), encoding="utf-8")
+    stats = dedup_file(inp, tmp_path / "out.json")
+    assert (stats.chunks_in, stats.chunks_out) == (4, 2)
+    assert vector_bytes(1536) == 6144
+    assert vector_bytes(1536, "int8") < vector_bytes(1536, "float16") < vector_bytes(1536)
+    stats.bytes_per_vector = vector_bytes(1536, "float16")
+    assert stats.index_bytes_saved == 2 * stats.bytes_per_vector
@@ -0,0 +1,150 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+"""Admission order, cancellation and cross-loop use of the shared LLM engine (llm_engine.py)."""
+
+import asyncio
+import threading
+
+import pytest
+
+from agentic_author_ai.llm import LatencyLLM, LLM
+from agentic_author_ai.llm_engine import BACKGROUND, INTERACTIVE, NORMAL, LLMEngine
+
+
+class GateLLM(LLM):
+    """Records the order calls start in; prompts named "hold" wait until the gate opens."""
+    def __init__(self):
+        self.started = []
+        self.gate = None
+
+    async def acomplete(self, prompt, **kwargs):
+        self.started.append(prompt)
+        if prompt == "hold":
+            await self.gate.wait()
+        return prompt.upper()
+
+    def complete(self, prompt, **kwargs):
+        raise AssertionError("engine should use acomplete")
+
+
+async def until(cond):
+    for _ in range(1000):
+        if cond():
+            return
+        await asyncio.sleep(0)
+    raise AssertionError("condition not reached")
+
+
+def run(coro):
+    """asyncio.run with a timeout, so a lost slot fails the test instead of hanging it."""
+    return asyncio.run(asyncio.wait_for(coro, 10))
+
+
+def idle(engine):
+    return engine.in_flight == 0 and engine.queue_depth == 0
+
+
+def test_waiting_calls_are_admitted_by_priority():
+    engine, llm = LLMEngine(concurrency=1, coalesce=False), GateLLM()
+
+    async def main():
+        llm.gate = asyncio.Event()
+        hold = asyncio.create_task(engine.complete(llm, "hold"))
+        await until(lambda: engine.in_flight == 1)
+        order = [("bg1", BACKGROUND), ("n1", NORMAL), ("i1", INTERACTIVE), ("bg2", BACKGROUND),
+                 ("i2", INTERACTIVE)]
+        tasks = []
+        for prompt, prio in order:
+            tasks.append(asyncio.create_task(engine.complete(llm, prompt, priority=prio)))
+            await until(lambda: engine.queue_depth == len(tasks))
+        llm.gate.set()
+        await asyncio.gather(hold, *tasks)
+
+    run(main())
+    assert llm.started == ["hold", "i1", "i2", "n1", "bg1", "bg2"]
+    assert idle(engine)
+    assert engine.stats()["max_queue_depth"] == 5
+
+
+def test_cancelled_waiter_gives_up_its_place():
+    engine, llm = LLMEngine(concurrency=1, coalesce=False), GateLLM()
+
+    async def main():
+        llm.gate = asyncio.Event()
+        hold = asyncio.create_task(engine.complete(llm, "hold"))
+        await until(lambda: engine.in_flight == 1)
+        a = asyncio.create_task(engine.complete(llm, "a", priority=INTERACTIVE))
+        b = asyncio.create_task(engine.complete(llm, "b", priority=BACKGROUND))
+        await until(lambda: engine.queue_depth == 2)
+        a.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await a
+        assert engine.queue_depth == 1
+        llm.gate.set()
+        return await asyncio.gather(hold, b)
+
+    assert run(main()) == ["HOLD", "B"]
+    assert llm.started == ["hold", "b"]
+    assert idle(engine)
+
+
+def test_cancel_after_slot_was_handed_over_passes_it_on():
+    engine, llm = LLMEngine(concurrency=1, coalesce=False), GateLLM()
+
+    async def main():
+        llm.gate = asyncio.Event()
+        hold = asyncio.create_task(engine.complete(llm, "hold"))
+        await until(lambda: engine.in_flight == 1)
+        a = asyncio.create_task(engine.complete(llm, "a"))
+        b = asyncio.create_task(engine.complete(llm, "b"))
+        await until(lambda: engine.queue_depth == 2)
+        llm.gate.set()
+        await until(lambda: engine.queue_depth == 1)   # slot handed to a, which has not run yet
+        a.cancel()
+        results = await asyncio.gather(hold, a, b, return_exceptions=True)
+        assert isinstance(results[1], asyncio.CancelledError)
+        return results[2]
+
+    assert run(main()) == "B"
+    assert "a" not in llm.started
+    assert idle(engine)
+
+
+def test_identical_concurrent_calls_are_coalesced():
+    engine, llm = LLMEngine(concurrency=4), LatencyLLM(latency_s=0.02, jitter=0.0)
+
+    async def main():
+        return await asyncio.gather(*(engine.complete(llm, "same prompt") for _ in range(5)))
+
+    results = run(main())
+    assert len(set(results)) == 1
+    assert llm.calls == 1
+    assert engine.stats()["coalesced"] == 4
+    assert idle(engine)
+
+
+def test_engine_is_shared_across_threads_and_loops():
+    engine = LLMEngine(concurrency=2)
+    llm = LatencyLLM(latency_s=0.005, jitter=0.0, native_async=False)
+    errors = []
+
+    def worker(t):
+        async def main():
+            await asyncio.gather(*(engine.complete(llm, f"t{t} p{i}", priority=i % 3 * 5) for i in range(10)))
+        try:
+            run(main())
+        except Exception as e:   # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(t,)) for t in range(4)]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join(timeout=30)
+    assert not errors
+    assert engine.calls == 40
+    assert idle(engine)
+    assert engine.stats()["max_queue_depth"] > 0
@@ -0,0 +1,53 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+"""MMR diversity selection over stored vectors (query.mmr_select / select_candidates)."""
+
+import numpy as np
+
+from agentic_author_ai.query import mmr_select, select_candidates
+
+
+def unit(*rows):
+    C = np.asarray(rows, dtype="float32")
+    return C / np.linalg.norm(C, axis=1, keepdims=True)
+
+
+Q = unit([1.0, 0.0, 0.0])[0]
+# Rows 0 and 1 are near-identical and closest to the query; row 2 is less relevant but different.
+C = unit([1.0, 0.10, 0.0], [1.0, 0.11, 0.0], [0.7, 0.0, 0.7], [0.0, 1.0, 0.0])
+
+
+class FakeIndex:
+    def __init__(self, vectors):
+        self.vectors = vectors
+
+    def reconstruct_batch(self, ids):
+        return self.vectors[np.asarray(ids, dtype="int64")]
+
+
+def test_mmr_skips_near_duplicate_of_first_pick():
+    assert mmr_select(Q, C, 2, lam=0.5) == [0, 2]
+
+
+def test_lambda_one_is_plain_similarity_order():
+    assert [int(j) for j in mmr_select(Q, C, 3, lam=1.0)] == [0, 1, 2]
+
+
+def test_edge_cases():
+    assert mmr_select(Q, C[:0], 3) == []
+    assert mmr_select(Q, C, 0) == []
+    assert sorted(mmr_select(Q, C, 10, lam=0.5)) == [0, 1, 2, 3]
+
+
+def test_select_candidates_uses_index_vectors_and_drops_repeats():
+    meta = [{"id": f"c{i}", "text": f"t{i}", "meta": {}} for i in range(4)] + [{"id": "c0", "text": "t0", "meta": {}}]
+    vectors = np.vstack([C, C[:1]])
+    ids = [0, 1, 4, -1, 2, 3]
+    got = select_candidates(meta, ids, 2, index=FakeIndex(vectors), qv=Q, mmr_lambda=0.5)
+    assert [c["id"] for c in got] == ["c0", "c2"]
+    plain = select_candidates(meta, ids, 2, index=FakeIndex(vectors), qv=Q, mmr_lambda=1.0)
+    assert [c["id"] for c in plain] == ["c0", "c1"]
+    assert [c["id"] for c in select_candidates(meta, ids, 2)] == ["c0", "c1"]
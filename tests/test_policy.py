@@ -0,0 +1,71 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+"""Rule layer and speculation guard of the local planner policy (policy.py)."""
+
+import pytest
+
+from agentic_author_ai.policy import PolicyModel, decide, may_speculate
+from agentic_author_ai.rag_config import POLICY_CONFIDENCE
+
+# A model that knows none of the test prompts' terms, so rule-free prompts stay undecided
+MODEL = PolicyModel.fit(["quarterly market outlook", "summarize meeting"], [True, False])
+
+
+@pytest.mark.parametrize("prompt", [
+    "Write a brief on payments. Do not use the web.",
+    "Draft a memo without any external sources.",
+    "Don't look anything up, just draft from the session notes.",
+    "Write an offline summary of ledger risk.",
+    "Use only my notes, but cite sources.",          # internal-only wins over external
+    "Summarize the session notes only.",
+    "Web research is not allowed for this one.",
+])
+def test_internal_rules(prompt):
+    d = decide(prompt, model=MODEL)
+    assert (d.allow_external, d.source) == (False, "rule")
+    assert d.confidence >= POLICY_CONFIDENCE
+    assert not may_speculate(prompt)
+
+
+@pytest.mark.parametrize("prompt", [
+    "Write a memo with your own research on settlement.",
+    "Draft a paper on AI safety and cite sources.",
+    "Write a brief on card fraud with sources.",
+])
+def test_external_rules(prompt):
+    d = decide(prompt, model=MODEL)
+    assert (d.allow_external, d.source) == (True, "rule")
+    assert d.confidence >= POLICY_CONFIDENCE
+
+
+@pytest.mark.parametrize("prompt", [
+    "Summarize my notes from 2024 on capital rules.",
+    "Write the current outlook for card fraud.",
+    "Summarize the references in the session notes.",
+])
+def test_hints_are_not_rules(prompt):
+    d = decide(prompt, model=MODEL)
+    assert d.source != "rule"
+    assert d.confidence < POLICY_CONFIDENCE
+
+
+@pytest.mark.parametrize("prompt, ok", [
+    ("Write the current outlook for card fraud.", True),
+    ("Summarize my notes from 2024 on capital rules.", False),
+    ("Draft a confidential memo on our capital plan.", False),
+    ("Write about the internal audit findings.", False),
+    ("Explain settlement risk. No internet please.", False),
+])
+def test_may_speculate(prompt, ok):
+    assert may_speculate(prompt) is ok
+
+
+def test_model_decides_when_no_rule_matches():
+    model = PolicyModel.fit(["market outlook for payments"] * 5 + ["recap of our meeting"] * 5,
+                            [True] * 5 + [False] * 5)
+    assert decide("payments market outlook", model=model).allow_external is True
+    assert decide("meeting recap", model=model).allow_external is False
+    assert decide("payments market outlook", model=model).source == "model"
@@ -0,0 +1,61 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+"""Snapshot-scoped LRU of retrieve() results (result_cache.py)."""
+
+from agentic_author_ai.result_cache import ResultCache
+
+CHUNKS = [{"id": "c1", "text": "one"}, {"id": "c2", "text": "two"}]
+
+
+def test_key_normalises_query_and_filters():
+    a = ResultCache.key("  What   is RAG? ", {"session": ["b", "a"], "type": "pdf"}, 8, 0.7)
+    b = ResultCache.key("what is rag?", {"type": ["pdf"], "session": ["a", "b"]}, 8, 0.70000001)
+    assert a == b
+    assert ResultCache.key("what is rag?", None, 8, 0.7) != a
+    assert ResultCache.key("what is rag?", None, 8, 0.7) == ResultCache.key("what is rag?", {}, 8, 0.7)
+
+
+def test_hits_misses_and_lru_eviction():
+    cache = ResultCache(max_entries=2)
+    cache.use_snapshot("s1")
+    assert cache.get("q1", "s1") is None
+    cache.put("q1", "s1", CHUNKS)
+    cache.put("q2", "s1", CHUNKS[:1])
+    got = cache.get("q1", "s1")
+    assert got == CHUNKS
+    got.append({"id": "x"})           # callers get a copy
+    assert cache.get("q1", "s1") == CHUNKS
+    cache.put("q3", "s1", [])         # q2 is least recently used
+    assert cache.get("q2", "s1") is None
+    assert len(cache) == 2 and cache.evictions == 1
+    assert (cache.hits, cache.misses) == (2, 2) and cache.hit_rate == 0.5
+
+
+def test_new_snapshot_invalidates_and_stale_puts_are_ignored():
+    cache = ResultCache()
+    cache.use_snapshot("s1")
+    cache.put("q", "s1", CHUNKS)
+    cache.use_snapshot("s2")
+    assert len(cache) == 0 and cache.invalidations == 1
+    cache.put("q", "s1", CHUNKS)      # a query that was still running on s1
+    assert len(cache) == 0 and cache.stale_puts == 1
+    cache.put("q", "s2", CHUNKS)
+    assert cache.get("q", "s1") is None   # lookups for s1 miss without flushing s2
+    assert cache.get("q", "s2") == CHUNKS
+    cache.use_snapshot("s2")
+    assert len(cache) == 1 and cache.invalidations == 1
+    assert cache.stats()["snapshot"] == "s2"
+
+
+def test_first_lookup_adopts_snapshot_and_zero_size_disables():
+    cache = ResultCache()
+    assert cache.get("q", "s1") is None
+    cache.put("q", "s1", CHUNKS)
+    assert cache.get("q", "s1") == CHUNKS
+    off = ResultCache(max_entries=0)
+    off.use_snapshot("s1")
+    off.put("q", "s1", CHUNKS)
+    assert not off.enabled and off.get("q", "s1") is None and len(off) == 0
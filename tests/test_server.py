@@ -0,0 +1,78 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+"""Request validation and error mapping of the HTTP service (server.py)."""
+
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from agentic_author_ai.server import AuthorService, BadRequest, start_server, validate_body
+
+
+@pytest.fixture
+def served():
+    service = AuthorService(enable_author=False)
+    srv = start_server(service)
+    yield service, srv
+    srv.shutdown()
+
+
+def post(srv, endpoint, data):
+    raw = data if isinstance(data, bytes) else json.dumps(data).encode("utf-8")
+    req = urllib.request.Request(f"{srv.base_url}/{endpoint}", data=raw, method="POST")
+    try:
+        with urllib.request.urlopen(req, timeout=10) as r:
+            return r.status, json.loads(r.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def metric(srv, name):
+    with urllib.request.urlopen(srv.base_url + "/metrics", timeout=10) as r:
+        rows = dict(line.rsplit(" ", 1) for line in r.read().decode("utf-8").splitlines())
+    return float(rows.get(name, 0))
+
+
+@pytest.mark.parametrize("body", [
+    [], {}, {"query": ""}, {"query": 3}, {"query": "q", "k": "8"}, {"query": "q", "k": 0},
+    {"query": "q", "k": True}, {"query": "q", "filters": ["session"]},
+    {"query": "q", "filters": {"session": [1]}}, {"query": "q", "session": ["a"]},
+])
+def test_malformed_bodies_are_rejected(body):
+    with pytest.raises(BadRequest):
+        validate_body("retrieve", body)
+
+
+def test_valid_bodies_pass():
+    assert validate_body("retrieve", {"query": "q", "k": 4, "filters": {"session": ["a", "b"], "type": "pdf"}})
+    assert validate_body("author", {"prompt": "p", "deadline_s": 1.5, "max_sources": 2, "no_external": True})
+
+
+def test_client_errors_are_400(served):
+    service, srv = served
+    service.batcher.retrieve = lambda *a, **kw: []
+    assert post(srv, "retrieve", {"query": "q", "k": "many"})[0] == 400
+    assert post(srv, "retrieve", b"{not json")[0] == 400
+    assert post(srv, "author", {"prompt": "p"})[0] == 400          # --no-author
+    assert post(srv, "retrieve", {"query": "q"}) == (200, {"query": "q", "chunks": []})
+    assert metric(srv, 'agentic_requests_bad_total{endpoint="retrieve"}') == 1
+    assert metric(srv, 'agentic_request_errors_total{endpoint="retrieve"}') == 0
+
+
+@pytest.mark.parametrize("exc", [KeyError("id"), ValueError("bad vector"), TypeError("NoneType")])
+def test_server_faults_are_500(served, exc):
+    service, srv = served
+
+    def broken(*a, **kw):
+        raise exc
+
+    service.batcher.retrieve = broken
+    status, body = post(srv, "retrieve", {"query": "q"})
+    assert status == 500 and type(exc).__name__ in body["error"]
+    assert metric(srv, 'agentic_request_errors_total{endpoint="retrieve"}') == 1
+    assert metric(srv, 'agentic_requests_bad_total{endpoint="retrieve"}') == 0
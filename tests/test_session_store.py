@@ -0,0 +1,119 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+"""Crash recovery and resume of the append-only session log (session_store.py)."""
+
+import json
+
+from agentic_author_ai.session_store import SessionStore
+
+
+def msg(i, text="m"):
+    return {"role": "user", "content": f"{text}{i}", "meta": {}}
+
+
+def write(path, n, **kw):
+    with SessionStore(path, **kw) as store:
+        for i in range(n):
+            store.append(msg(i))
+
+
+def contents(messages):
+    return [m["content"] for m in messages]
+
+
+def test_append_tail_read(tmp_path):
+    path = tmp_path / "s.jsonl"
+    write(path, 5, window=3)
+    with SessionStore(path, window=3) as store:
+        assert len(store) == 5
+        assert contents(store.tail()) == ["m2", "m3", "m4"]
+        assert contents(store.read(1, 3)) == ["m1", "m2"]
+        assert contents(store.read()) == [f"m{i}" for i in range(5)]
+
+
+def test_torn_last_line_is_cut_off(tmp_path):
+    path = tmp_path / "s.jsonl"
+    write(path, 3)
+    size = path.stat().st_size
+    with open(path, "ab") as f:
+        f.write(b'{"role": "user", "cont')        # crash in the middle of a write
+    with SessionStore(path) as store:
+        assert len(store) == 3
+        assert path.stat().st_size == size
+        assert store.append(msg(3)) == 3
+    with SessionStore(path) as store:
+        assert contents(store.read()) == ["m0", "m1", "m2", "m3"]
+
+
+def test_log_line_without_index_entry_is_indexed(tmp_path):
+    path = tmp_path / "s.jsonl"
+    write(path, 3)
+    with open(path, "ab") as f:                   # crash between the log and index writes
+        f.write((json.dumps(msg(3)) + "\n").encode("utf-8"))
+    with SessionStore(path) as store:
+        assert len(store) == 4
+        assert contents(store.tail(2)) == ["m2", "m3"]
+
+
+def test_index_ahead_of_log_is_cut_back_to_snapshot(tmp_path):
+    path = tmp_path / "s.jsonl"
+    with SessionStore(path, window=2, snapshot_every=4) as store:
+        for i in range(4):
+            store.append(msg(i))
+        size = path.stat().st_size
+        store.append(msg(4))
+    with open(path, "r+b") as f:                  # the last log write was lost, its index entry was not
+        f.truncate(size)
+    with SessionStore(path, window=2, snapshot_every=4) as store:
+        assert len(store) == 4
+        assert contents(store.read()) == ["m0", "m1", "m2", "m3"]
+        store.append(msg(4, "new"))
+        assert contents(store.tail()) == ["m3", "new4"]
+
+
+def test_missing_index_is_rebuilt(tmp_path):
+    path = tmp_path / "s.jsonl"
+    write(path, 4)
+    path.with_name(path.name + ".idx").unlink()
+    with SessionStore(path) as store:
+        assert len(store) == 4
+        assert contents(store.read(2)) == ["m2", "m3"]
+
+
+def test_resume_window_comes_from_snapshot(tmp_path):
+    path = tmp_path / "s.jsonl"
+    write(path, 12, window=5, snapshot_every=10)
+    with SessionStore(path, window=5, snapshot_every=10) as store:
+        assert len(store) == 12
+        assert contents(store._recent) == ["m7", "m8", "m9", "m10", "m11"]
+        assert contents(store.tail()) == ["m7", "m8", "m9", "m10", "m11"]
+
+
+def test_stale_snapshot_window_is_not_served(tmp_path):
+    path = tmp_path / "s.jsonl"
+    write(path, 12, window=5, snapshot_every=10)
+    # Log replaced behind the store's back: same message count, different content
+    path.write_text("".join(json.dumps(msg(i, "other-")) + "\n" for i in range(12)), encoding="utf-8")
+    path.with_name(path.name + ".idx").unlink()
+    with SessionStore(path, window=5, snapshot_every=10) as store:
+        assert contents(store.tail()) == [f"other-{i}" for i in range(7, 12)]
+
+
+def test_memory_resumes_persisted_session(tmp_path):
+    from agentic_author_ai.memory import Memory
+    from agentic_author_ai.messages import Message
+    path = tmp_path / "mem.jsonl"
+    mem = Memory(path, max_scratch=3, snapshot_every=4)
+    for i in range(10):
+        mem.add(Message(role="user", content=f"m{i}"))
+    mem.close()
+    mem = Memory(path, max_scratch=3, snapshot_every=4)
+    assert len(mem) == 10
+    assert [m.content for m in mem.last(3)] == ["m7", "m8", "m9"]
+    assert [m.content for m in mem.history(2, 4)] == ["m2", "m3"]
+    mem.add(Message(role="assistant", content="m10"))
+    assert [m.content for m in mem.all()] == ["m8", "m9", "m10"]
+    mem.close()
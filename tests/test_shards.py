@@ -0,0 +1,74 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+"""Shard layout, filter routing and LRU eviction of loaded shards (shards.py)."""
+
+import numpy as np
+
+from agentic_author_ai.shards import NO_VALUE, ShardedIndex, shard_values, write_shards
+
+DIM = 16
+
+
+def corpus(per_shard=20):
+    chunks = []
+    for s in ("s1", "s2", "s3"):
+        chunks += [{"id": f"{s}-{i}", "text": f"{s} {i}", "meta": {"session": s}} for i in range(per_shard)]
+    chunks.append({"id": "dup", "text": "shared", "meta": {"session": "s1", "provenance": [{"session": "s3"}]}})
+    chunks.append({"id": "loose", "text": "no session", "meta": {}})
+    X = np.random.default_rng(0).standard_normal((len(chunks), DIM)).astype("float32")
+    X /= np.linalg.norm(X, axis=1, keepdims=True)
+    return chunks, X
+
+
+def build(tmp_path, **kwargs):
+    chunks, X = corpus()
+    manifest = write_shards(chunks, X, "session", tmp_path / "shards")
+    return ShardedIndex(tmp_path / "shards" / "manifest.json", **kwargs), manifest, chunks, X
+
+
+def test_shard_values_follow_provenance():
+    chunks, _ = corpus()
+    assert shard_values(chunks[-2], "session") == ["s1", "s3"]
+    assert shard_values(chunks[-1], "session") == [NO_VALUE]
+
+
+def test_manifest_and_filter_routing(tmp_path):
+    idx, manifest, chunks, X = build(tmp_path)
+    assert set(manifest["shards"]) == {"s1", "s2", "s3", NO_VALUE}
+    assert manifest["shards"]["s3"]["ntotal"] == 21 and manifest["chunks"] == len(chunks)
+    assert idx.shards_for({"session": ["s2", "missing"]}) == ["s2"]
+    assert idx.shards_for({"type": ["x"]}) == idx.values
+
+    view = idx.search(X[-2:-1], 5, include={"session": ["s3"]})[0]
+    assert idx.loaded() == ["s3"]
+    assert view.meta[0]["id"] == "dup"
+    assert np.allclose(view.reconstruct_batch([0])[0], X[-2], atol=1e-5)
+
+    view = idx.search(X[:1], 3)[0]
+    assert view.meta[0]["id"] == "s1-0" and len(view.meta) == 3
+    assert sorted(idx.loaded()) == sorted(idx.values)
+
+
+def test_lru_evicts_least_recently_used_shard(tmp_path):
+    probe, _, _, _ = build(tmp_path)
+    sizes = {v: probe.get(v).nbytes for v in ("s1", "s2", "s3")}
+    idx = ShardedIndex(tmp_path / "shards" / "manifest.json", max_bytes=sizes["s1"] + sizes["s3"])
+    idx.get("s1")
+    idx.get("s2")
+    idx.get("s1")            # s2 is now least recently used
+    idx.get("s3")            # s1 + s3 fit the budget, s1 + s2 + s3 do not
+    assert idx.loaded() == ["s1", "s3"]
+    assert idx.evictions == 1 and idx.loads == 3
+    assert idx.resident_bytes() <= idx.max_bytes
+    idx.get("s1")
+    assert idx.loads == 3    # still cached
+
+
+def test_oversized_shard_stays_loaded_alone(tmp_path):
+    idx, _, _, _ = build(tmp_path, max_bytes=1)
+    idx.get("s1")
+    idx.get("s2")
+    assert idx.loaded() == ["s2"] and idx.evictions == 1
@@ -0,0 +1,80 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+"""Index snapshot publish, pointer resolution and garbage collection (snapshots.py)."""
+
+import os
+import time
+
+from agentic_author_ai import snapshots
+
+
+def build(root, payload="x", **info):
+    sid, tmp = snapshots.begin(root)
+    (tmp / "rag.faiss").write_text(payload)
+    (tmp / "rag_meta.json").write_text("[]")
+    return snapshots.publish(root, sid, tmp, **info)
+
+
+def age(snap, seconds):
+    t = time.time() - seconds
+    os.utime(snap.dir, (t, t))
+
+
+def test_publish_moves_build_into_place_and_points_current(tmp_path):
+    snap = build(tmp_path, "v1", chunks=3)
+    assert snap.path("rag.faiss").read_text() == "v1"
+    assert not list((tmp_path / snapshots.SNAPSHOT_DIR).glob(f"*{snapshots.TMP_SUFFIX}"))
+    ptr = snapshots.read_pointer(tmp_path)
+    assert ptr["snapshot"] == snap.id and ptr["chunks"] == 3
+    assert snapshots.current(tmp_path) == snap
+
+
+def test_unpublished_build_is_invisible(tmp_path):
+    first = build(tmp_path, "v1")
+    sid, tmp = snapshots.begin(tmp_path)
+    (tmp / "rag.faiss").write_text("half-written")
+    assert snapshots.current(tmp_path) == first
+    assert [s.id for s in snapshots.list_snapshots(tmp_path)] == [first.id]
+
+
+def test_current_falls_back_to_legacy_dir(tmp_path):
+    legacy = tmp_path / "data"
+    assert snapshots.current(tmp_path / "index") is None
+    assert snapshots.current(tmp_path / "index", legacy_dir=legacy) == snapshots.Snapshot(snapshots.LEGACY, legacy)
+    # A pointer to a snapshot that is gone is ignored too
+    root = tmp_path / "index"
+    snap = build(root)
+    os.rename(snap.dir, snap.dir.with_name("moved"))
+    assert snapshots.current(root, legacy_dir=legacy).id == snapshots.LEGACY
+
+
+def test_gc_keeps_newest_and_current(tmp_path):
+    snaps = [build(tmp_path, f"v{i}") for i in range(4)]
+    for s in snaps:
+        age(s, 3600)
+    removed = snapshots.gc(tmp_path, keep=2, grace_s=60)
+    assert removed == [snaps[0].id, snaps[1].id]
+    assert [s.id for s in snapshots.list_snapshots(tmp_path)] == [snaps[2].id, snaps[3].id]
+    assert snapshots.gc(tmp_path, keep=0, grace_s=60) == [snaps[2].id]     # CURRENT stays
+    assert snapshots.current(tmp_path) == snaps[3]
+
+
+def test_gc_grace_period(tmp_path):
+    snaps = [build(tmp_path, f"v{i}") for i in range(3)]
+    assert snapshots.gc(tmp_path, keep=1, grace_s=300) == []    # all too young
+    age(snaps[0], 600)
+    assert snapshots.gc(tmp_path, keep=1, grace_s=300) == [snaps[0].id]
+
+
+def test_gc_removes_crashed_builds_after_grace(tmp_path):
+    build(tmp_path)
+    _, tmp = snapshots.begin(tmp_path)
+    snapshots.gc(tmp_path, keep=1, grace_s=300)
+    assert tmp.exists()
+    t = time.time() - 600
+    os.utime(tmp, (t, t))
+    snapshots.gc(tmp_path, keep=1, grace_s=300)
+    assert not tmp.exists()
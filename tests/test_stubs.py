@@ -0,0 +1,46 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+"""Offline stub server used by the benchmarks (stubs.py)."""
+
+import json
+import urllib.request
+
+import pytest
+
+from agentic_author_ai.stubs import StubConfig, start_stub_server
+
+
+@pytest.fixture
+def stub():
+    srv = start_stub_server(StubConfig(chat_latency_ms=0, embed_latency_ms=0, embed_dim=16))
+    yield srv
+    srv.shutdown()
+
+
+def test_serves_embeddings(stub):
+    req = urllib.request.Request(stub.base_url + "/v1/embeddings", method="POST",
+                                 data=json.dumps({"model": "m", "input": ["a", "b"]}).encode("utf-8"),
+                                 headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=10) as r:
+        data = json.loads(r.read())["data"]
+    assert len(data) == 2 and len(data[0]["embedding"]) == 16
+
+
+@pytest.mark.parametrize("exc", [BrokenPipeError, ConnectionResetError])
+def test_abandoned_requests_are_not_logged(stub, capsys, exc):
+    try:
+        raise exc()
+    except exc:
+        stub.handle_error(None, ("127.0.0.1", 1))
+    assert capsys.readouterr().err == ""
+
+
+def test_other_handler_errors_are_logged(stub, capsys):
+    try:
+        raise RuntimeError("stub bug")
+    except RuntimeError:
+        stub.handle_error(None, ("127.0.0.1", 1))
+    assert "RuntimeError: stub bug" in capsys.readouterr().err
@@ -0,0 +1,130 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+"""Span recording, summaries and the Chrome trace export (tracing.py)."""
+
+import json
+import multiprocessing as mp
+import os
+import time
+
+import pytest
+
+from agentic_author_ai import tracing
+from agentic_author_ai.tracing import TRACE_LOG, clear_trace, merge_events, trace_span
+
+
+@pytest.fixture(autouse=True)
+def fresh_trace():
+    clear_trace()
+    yield
+    clear_trace()
+
+
+def _worker_spans(_):
+    """Runs in a spawned process: one parent span with a child, as a pool worker would."""
+    time.sleep(0.05)            # its trace origin is later than the parent's
+    clear_trace()
+    with trace_span("answer"):
+        with trace_span("retrieve"):
+            time.sleep(0.01)
+    return list(TRACE_LOG)
+
+
+def test_worker_events_are_merged_onto_one_timeline(tmp_path):
+    t0 = time.time()
+    with mp.get_context("spawn").Pool(2) as pool:
+        batches = pool.map(_worker_spans, range(2))
+    t1 = time.time()
+    for events in batches:
+        merge_events(events)
+
+    events = list(TRACE_LOG)
+    assert len(events) == 4
+    assert len({e.pid for e in events}) == 2 and os.getpid() not in {e.pid for e in events}
+    for e in events:   # start times are on this process's timeline, inside the pool's lifetime
+        start_wall = tracing._T0_WALL + e.start_ns / 1e9
+        assert t0 - 0.01 <= start_wall <= t1
+
+    # Each worker's span ids restart at 1: the tree must not nest one worker under another
+    tree = tracing.dump_trace().splitlines()[1:]
+    assert sum(1 for r in tree if r.startswith("- answer")) == 2
+    assert sum(1 for r in tree if r.startswith("  - retrieve")) == 2
+
+    trace = json.loads(tracing.export_chrome(tmp_path / "t.json").read_text())["traceEvents"]
+    assert {ev["pid"] for ev in trace} == {e.pid for e in events}
+    for pid in {e.pid for e in events}:
+        mine = sorted((ev for ev in trace if ev["pid"] == pid), key=lambda ev: ev["ts"])
+        outer, inner = (mine[0], mine[1]) if mine[0]["name"] == "answer" else (mine[1], mine[0])
+        assert outer["ts"] <= inner["ts"] and inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"] + 1.0
+
+
+def test_local_events_keep_their_start():
+    with trace_span("local"):
+        pass
+    e = TRACE_LOG[0]
+    start = e.start_ns
+    clear_trace()
+    merge_events([e])
+    assert TRACE_LOG[0].start_ns == start and e.pid == os.getpid()
+
+
+def test_spans_nest_and_record_errors():
+    with trace_span("outer", n=2) as outer:
+        with trace_span("inner") as inner:
+            inner.record_usage(type("R", (), {"usage": type("U", (), {"prompt_tokens": 5, "total_tokens": 7})()})())
+        with pytest.raises(ValueError):
+            with trace_span("failing"):
+                raise ValueError("boom")
+    by_name = {e.name: e for e in TRACE_LOG}
+    assert by_name["inner"].parent_id == outer.span_id == by_name["failing"].parent_id
+    assert by_name["outer"].parent_id is None and by_name["outer"].meta["n"] == 2
+    assert by_name["inner"].meta["total_tokens"] == 7
+    assert by_name["failing"].error == "ValueError: boom"
+    assert by_name["outer"].dur_ns >= by_name["inner"].dur_ns + by_name["failing"].dur_ns
+    assert tracing.dump_trace().splitlines()[1:] == [
+        f"- outer ({by_name['outer'].meta['duration_s']}s)",
+        f"  - inner ({by_name['inner'].meta['duration_s']}s)",
+        f"  - failing ({by_name['failing'].meta['duration_s']}s) !",
+    ]
+
+
+def test_traced_follows_async_tasks():
+    import asyncio
+
+    @tracing.traced("child")
+    async def child():
+        await asyncio.sleep(0)
+
+    @tracing.traced("root")
+    async def root():
+        await asyncio.gather(child(), child())
+
+    asyncio.run(root())
+    root_id = next(e.span_id for e in TRACE_LOG if e.name == "root")
+    assert [e.parent_id for e in TRACE_LOG if e.name == "child"] == [root_id, root_id]
+
+
+@pytest.mark.parametrize("values, p, expected", [
+    ([], 50, 0.0), ([3.0], 99, 3.0), ([1, 2, 3, 4], 50, 2.5), ([1, 2, 3, 4], 100, 4.0),
+    ([10, 0, 5], 0, 0.0), (range(101), 95, 95.0),
+])
+def test_percentile(values, p, expected):
+    assert tracing.percentile(values, p) == pytest.approx(expected)
+
+
+def test_stage_summary_and_exports(tmp_path):
+    for ms in (1, 2, 3):
+        TRACE_LOG.append(tracing.TraceEvent(ts=0.0, name="embed", meta={"total_tokens": 10},
+                                            dur_ns=ms * 1_000_000, pid=os.getpid()))
+    TRACE_LOG.append(tracing.TraceEvent(ts=0.0, name="author", meta={}, dur_ns=5_000_000, error="Timeout"))
+    s = tracing.stage_summary()
+    assert s["embed"]["count"] == 3 and s["embed"]["p50_ms"] == 2.0 and s["embed"]["total_tokens"] == 30
+    assert s["author"]["errors"] == 1 and "total_tokens" not in s["author"]
+    assert tracing.format_summary().splitlines()[3].startswith("embed")   # sorted by total time
+    lines = tracing.export_trace(tmp_path / "t.jsonl").read_text().splitlines()
+    assert [json.loads(l)["name"] for l in lines] == ["embed", "embed", "embed", "author"]
+    chrome = json.loads(tracing.export_trace(tmp_path / "t.json").read_text())["traceEvents"]
+    assert chrome[-1]["args"]["error"] == "Timeout" and chrome[-1]["pid"] == os.getpid()
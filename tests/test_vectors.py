@@ -0,0 +1,92 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Katrina Nicole Siegfried
+# Author: Katrina Nicole Siegfried
+# Note: Portions of this file were drafted/edited with AI assistance and reviewed by the author.
+
+"""Reduced-precision index storage, truncation and exact rescoring (vectors.py)."""
+
+import numpy as np
+import pytest
+
+from agentic_author_ai import vectors
+from agentic_author_ai.vectors import StoredIndex, build_index, load_stored_index, rescore, truncate_dims
+
+
+def unit(rng, n, d):
+    X = rng.standard_normal((n, d)).astype("float32")
+    return X / np.linalg.norm(X, axis=1, keepdims=True)
+
+
+@pytest.fixture(scope="module")
+def data():
+    rng = np.random.default_rng(3)
+    X = unit(rng, 2000, 64)
+    Q = unit(rng, 20, 64)
+    exact = np.argsort(-(Q @ X.T), axis=1)[:, :8]
+    return X, Q, exact
+
+
+def recall(I, exact):
+    return np.mean([len(set(a) & set(b)) / len(b) for a, b in zip(I, exact)])
+
+
+@pytest.mark.parametrize("storage, bytes_per_dim, min_recall", [
+    ("float32", 4, 1.0), ("float16", 2, 0.99), ("int8", 1, 0.8),
+])
+def test_storage_types(data, storage, bytes_per_dim, min_recall):
+    X, Q, exact = data
+    index = build_index(X, storage)
+    assert index.ntotal == len(X)
+    assert getattr(index, "code_size", 4 * X.shape[1]) == bytes_per_dim * X.shape[1]
+    _, I = index.search(Q, 8)
+    assert recall(I, exact) >= min_recall
+
+
+def test_unknown_storage_is_rejected(data):
+    with pytest.raises(ValueError):
+        build_index(data[0], "int4")
+
+
+def test_truncate_dims_renormalises(data):
+    X = data[0]
+    Y = truncate_dims(X, 16)
+    assert Y.shape == (len(X), 16)
+    assert np.allclose(np.linalg.norm(Y, axis=1), 1.0, atol=1e-5)
+    assert truncate_dims(X, None).shape == truncate_dims(X, 128).shape == X.shape
+
+
+def test_rescore_matches_exact_ranking(data):
+    X, Q, exact = data
+    I = np.hstack([exact[:, ::-1], np.full((len(Q), 2), -1)])       # shuffled candidates + padding
+    D, top = rescore(X, Q, I, 5)
+    assert (top == exact[:, :5]).all()
+    assert np.allclose(D, np.take_along_axis(Q @ X.T, top, axis=1), atol=1e-5)
+
+
+def test_int8_with_rescoring_recovers_exact_top_k(data):
+    X, Q, exact = data
+    index = build_index(X, "int8")
+    plain = StoredIndex(index, "int8")
+    rescored = StoredIndex(index, "int8", full=X, rescore_candidates=32)
+    _, I_plain = plain.search(Q, 8)
+    D, I = rescored.search(Q, 8)
+    assert (I_plain != exact).any()                       # int8 codes alone misorder close neighbours
+    assert (I == exact).all()
+    assert np.allclose(D, np.take_along_axis(Q @ X.T, I, axis=1), atol=1e-5)
+    truncated = StoredIndex(build_index(X, "int8", dim=32), "int8", dim=32, full=X, rescore_candidates=32)
+    assert truncated.d == 64 and truncated.search(Q, 8)[1].shape == (len(Q), 8)   # full-width queries
+    assert np.allclose(rescored.reconstruct_batch(np.array([3, 1])), X[[3, 1]])
+
+
+def test_round_trip_through_manifest(tmp_path, data):
+    X, Q, exact = data
+    vectors.write_index(build_index(X, "float16"), tmp_path / "rag.faiss")
+    vectors.save_vectors(tmp_path / "rag_vectors.npy", X)
+    vectors.write_manifest(tmp_path / "rag_index.json", storage="float16", dim=None,
+                           full_vectors="rag_vectors.npy")
+    idx = load_stored_index(tmp_path / "rag.faiss", tmp_path / "rag_index.json", rescore_candidates=32, mmap=True)
+    assert idx.storage == "float16" and idx.rescoring
+    _, I = idx.search(Q, 8)
+    assert recall(I, exact) == 1.0
+    legacy = load_stored_index(tmp_path / "rag.faiss", tmp_path / "missing.json")
+    assert legacy.storage == "float32" and not legacy.rescoring